@@ -12,7 +12,10 @@ setup(
     ],
     entry_points={
         "console_scripts": [
-            "con-duct-gallery=src.gallery_render:main",
+            "con-duct-gallery=src.cli:main",
+            "con-duct-gallery-index=src.run_index:main",
+            "con-duct-gallery-worker=src.remote:worker_main",
+            "con-duct-gallery-perf=src.perf:main",
         ],
     },
 )
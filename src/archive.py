@@ -0,0 +1,97 @@
+"""Validation of archived duct runs (skip-execution entries)."""
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Optional, Tuple
+
+from src.models.gallery_entry import GalleryEntry
+
+logger = logging.getLogger(__name__)
+
+# Oldest info.json schema whose layout (output_paths, usage records) the gallery can read
+MINIMUM_SCHEMA_VERSION = "0.1.0"
+
+
+def parse_schema_version(version: str) -> Optional[Tuple[int, int, int]]:
+    """(major, minor, patch) of a schema_version such as "0.2.2", or None if it is not one."""
+    match = re.match(r"(\d+)\.(\d+)(?:\.(\d+))?", version)
+    if match is None:
+        return None
+    return int(match.group(1)), int(match.group(2)), int(match.group(3) or 0)
+
+
+def validate_run_info(info: dict) -> Optional[str]:
+    """
+    Check that a parsed info.json has a layout the gallery can read.
+
+    Runs at or above MINIMUM_SCHEMA_VERSION are accepted, as are runs of duct
+    versions that did not record a schema_version yet; what matters is that
+    info.json points at the usage file. The execution summary is optional.
+
+    Args:
+        info: Parsed duct info.json
+
+    Returns:
+        Description of the problem, or None if the run can be rendered
+    """
+    if not isinstance(info, dict):
+        return "info.json is not a JSON object"
+    version = info.get("schema_version")
+    if version is not None:
+        parsed = parse_schema_version(version) if isinstance(version, str) else None
+        if parsed is None:
+            return f"invalid schema_version {version!r} in info.json"
+        if parsed < parse_schema_version(MINIMUM_SCHEMA_VERSION):
+            return f"schema_version {version} is older than the minimum supported {MINIMUM_SCHEMA_VERSION}"
+    if not (info.get("output_paths") or {}).get("usage"):
+        return "usage path not in info.json"
+    return None
+
+
+def _read_json(path: Path) -> dict:
+    return json.loads(path.read_text())
+
+
+async def load_archived_run(entry: GalleryEntry) -> bool:
+    """
+    Locate and validate the existing logs of a skip-execution entry.
+
+    info.json is read in a helper thread, so many archived entries processed
+    concurrently do not wait on each other's (possibly network) file reads.
+    On success sets entry.info_json, entry.run_info and entry.usage_json.
+
+    Args:
+        entry: Entry without command.sh
+
+    Returns:
+        True if the logs are present and valid, False (with a warning) otherwise
+    """
+    import asyncio
+
+    info_files = entry.info_files()
+    if not info_files:
+        logger.warning(f"Warning: Entry '{entry.name}' skipped - command.sh absent but info.json missing")
+        return False
+
+    try:
+        info = await asyncio.to_thread(_read_json, info_files[0])
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Warning: Entry '{entry.name}' skipped - command.sh absent but failed to parse info.json: {e}")
+        return False
+
+    problem = validate_run_info(info)
+    if problem:
+        logger.warning(f"Warning: Entry '{entry.name}' skipped - command.sh absent but {problem} ({info_files[0]})")
+        return False
+
+    usage_json = entry.path / info["output_paths"]["usage"]
+    usage_known = entry.scan is not None and usage_json in entry.scan.usage_candidates()
+    if not usage_known and not usage_json.exists():
+        logger.warning(f"Warning: Entry '{entry.name}' skipped - command.sh absent but usage.json missing at {usage_json}")
+        return False
+
+    entry.info_json = info_files[0]
+    entry.run_info = info
+    entry.usage_json = usage_json
+    return True
@@ -0,0 +1,185 @@
+"""Repeated-run benchmarking of gallery entries."""
+import json
+import logging
+import math
+import shutil
+import statistics
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.executor import execute_script_async
+from src.models.entry_scan import DUCT_DIR
+from src.models.gallery_entry import GalleryEntry
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK_METRICS = ("wall_clock_time", "peak_rss", "average_pcpu")
+REPEATS_DIR = "repeats"
+# Environment variable duct takes its default --output-prefix from
+PREFIX_ENV = "DUCT_OUTPUT_PREFIX"
+
+# Two-sided 95% Student t critical values by degrees of freedom
+_T_95 = {
+    1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365, 8: 2.306, 9: 2.262,
+    10: 2.228, 11: 2.201, 12: 2.179, 13: 2.160, 14: 2.145, 15: 2.131, 16: 2.120, 17: 2.110,
+    18: 2.101, 19: 2.093, 20: 2.086, 25: 2.060, 30: 2.042, 40: 2.021, 60: 2.000, 120: 1.980,
+}
+
+
+def _t_critical(df: int) -> float:
+    """95% t critical value, rounding df down to the nearest tabulated value."""
+    if df > 120:
+        return 1.960
+    return _T_95[max(k for k in _T_95 if k <= df)]
+
+
+@dataclass
+class MetricStats:
+    """Summary statistics of one metric over the measured repeats."""
+
+    mean: float
+    median: float
+    stdev: float
+    ci_low: float
+    ci_high: float
+    n: int
+
+    @classmethod
+    def from_samples(cls, samples: List[float]) -> "MetricStats":
+        n = len(samples)
+        mean = statistics.fmean(samples)
+        stdev = statistics.stdev(samples) if n > 1 else 0.0
+        half_width = _t_critical(n - 1) * stdev / math.sqrt(n) if n > 1 else 0.0
+        return cls(mean, statistics.median(samples), stdev, mean - half_width, mean + half_width, n)
+
+
+@dataclass
+class BenchmarkResult:
+    """Aggregated measurements of an entry's repeated runs."""
+
+    stats: Dict[str, MetricStats]
+    run_dirs: List[Path]
+    run_infos: List[dict] = field(default_factory=list)
+    # info.json of every measured repeat, in run order
+    info_paths: List[Path] = field(default_factory=list)
+    overlay_path: Optional[Path] = None
+
+    def usage_files(self) -> List[Path]:
+        """Usage file of every measured repeat, in run order."""
+        files = []
+        for run_dir, info in zip(self.run_dirs, self.run_infos):
+            usage = info.get("output_paths", {}).get("usage")
+            if usage:
+                files.append(run_dir / Path(usage).name)
+        return files
+
+
+def aggregate(run_infos: List[dict]) -> Dict[str, MetricStats]:
+    """Compute statistics for every benchmark metric present in all runs."""
+    stats = {}
+    for metric in BENCHMARK_METRICS:
+        samples = [info.get("execution_summary", {}).get(metric) for info in run_infos]
+        if samples and all(isinstance(s, (int, float)) for s in samples):
+            stats[metric] = MetricStats.from_samples(samples)
+    return stats
+
+
+def _find_info(entry: GalleryEntry, run_dir: Path) -> Tuple[Optional[Path], bool]:
+    """
+    info.json of the run just finished.
+
+    Returns:
+        (path, shared): shared is True if duct ignored the run's output
+        prefix (command.sh passes its own -p) and wrote to .duct/
+    """
+    own = sorted(run_dir.glob("*info.json"))
+    if own:
+        return own[0], False
+    info_files = entry.info_files(refresh=True)
+    return (info_files[0] if info_files else None), True
+
+
+def _archive_run(entry: GalleryEntry, info_path: Path, info: dict, run_dir: Path, keep: bool) -> None:
+    """Move (or copy, for the run left in place) one run's duct outputs into run_dir."""
+    run_dir.mkdir(parents=True, exist_ok=True)
+    for output in set(info.get("output_paths", {}).values()):
+        source = entry.path / output
+        if not source.is_file():
+            continue
+        if keep:
+            shutil.copy2(source, run_dir / source.name)
+        else:
+            shutil.move(str(source), run_dir / source.name)
+    if not (run_dir / info_path.name).exists():
+        shutil.copy2(info_path, run_dir / info_path.name)
+
+
+async def run_repeats(
+    entry: GalleryEntry,
+    repeat: int,
+    warmup: int,
+    log_dir: Path,
+    timeout: Optional[float],
+) -> Optional[BenchmarkResult]:
+    """
+    Run command.sh warmup + repeat times and aggregate the measured runs.
+
+    Each run gets its own duct output prefix through DUCT_OUTPUT_PREFIX
+    (.duct/repeats/run-<i>/, warmups .duct/repeats/warmup-<i>/), so repeats
+    never overwrite each other and the last run's outputs are plotted and
+    rendered from where duct wrote them. If command.sh passes its own -p to
+    duct, each measured run's outputs are instead moved from .duct/ into
+    its run directory, the last run's also being left in place.
+
+    Args:
+        entry: Execute-mode entry (setup.sh already run)
+        repeat: Number of measured runs
+        warmup: Number of unmeasured runs before measuring
+        log_dir: Directory for per-run script logs
+        timeout: Timeout for each run
+
+    Returns:
+        BenchmarkResult, or None if any run failed
+    """
+    repeats_dir = entry.path / DUCT_DIR / REPEATS_DIR
+    if repeats_dir.exists():
+        shutil.rmtree(repeats_dir)
+
+    run_dirs, run_infos, info_paths = [], [], []
+    for run in range(warmup + repeat):
+        measured = run >= warmup
+        label = f"repeat {run - warmup + 1}/{repeat}" if measured else f"warmup {run + 1}/{warmup}"
+        run_dir = repeats_dir / (f"run-{len(run_dirs)}" if measured else f"warmup-{run}")
+        prefix = f"{DUCT_DIR}/{REPEATS_DIR}/{run_dir.name}/"
+        logger.info(f"  Running command.sh ({label})...")
+        result = await execute_script_async(
+            entry.command_script, entry.path, log_dir / f"run-{run}", timeout, env={PREFIX_ENV: prefix}
+        )
+        if not result.success:
+            reason = f"timed out after {timeout}s" if result.timed_out else f"failed (see {result.stderr_path})"
+            logger.warning(f"Warning: Entry '{entry.name}' skipped - command.sh {label} {reason}")
+            return None
+        if not measured:
+            shutil.rmtree(run_dir, ignore_errors=True)
+            continue
+
+        info_path, shared = _find_info(entry, run_dir)
+        if info_path is None:
+            logger.warning(f"Warning: Entry '{entry.name}' skipped - no duct info.json found after {label}")
+            return None
+        try:
+            info = json.loads(info_path.read_text())
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Warning: Entry '{entry.name}' skipped - failed to parse info.json after {label}: {e}")
+            return None
+
+        if shared:
+            logger.debug(f"command.sh of '{entry.name}' sets its own duct prefix, moving outputs to {run_dir}")
+            _archive_run(entry, info_path, info, run_dir, keep=(run == warmup + repeat - 1))
+            info_path = run_dir / info_path.name
+        run_dirs.append(run_dir)
+        run_infos.append(info)
+        info_paths.append(info_path)
+
+    return BenchmarkResult(aggregate(run_infos), run_dirs, run_infos, info_paths)
@@ -0,0 +1,262 @@
+"""Incremental rebuild cache for gallery entries."""
+import hashlib
+import json
+import logging
+import os
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, Optional
+
+from src.models.gallery_entry import METADATA_FILE, GalleryEntry
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 2
+MANIFEST_NAME = ".cache.json"
+FRAGMENT_NAME = ".fragment.json"
+# Bump when render_entry output changes, so cached fragments are re-rendered
+FRAGMENT_VERSION = 3
+# Entry inputs fingerprinted in the manifest (metadata.json may be absent)
+INPUT_FILES = ("setup.sh", "command.sh", METADATA_FILE)
+
+
+def manifest_path(entry: GalleryEntry) -> Path:
+    """Location of the cache manifest, stored next to the entry's plot."""
+    return entry.path / "plots" / MANIFEST_NAME
+
+
+def hash_file(path: Path) -> str:
+    """Return the sha256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint(
+    path: Path, previous: Optional[dict] = None, stat_result: Optional[os.stat_result] = None
+) -> Optional[dict]:
+    """
+    Fingerprint a file by content hash.
+
+    The hash of an unchanged file (same size and mtime as in previous) is
+    reused, so large usage files are only re-read when they were touched.
+
+    Args:
+        path: File to fingerprint
+        previous: Fingerprint recorded for the same file on an earlier run
+        stat_result: Already known stat of path (skips the stat call)
+
+    Returns:
+        Dict with sha256, size and mtime_ns, or None if the file is missing
+    """
+    st = stat_result
+    if st is None:
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+    if previous and previous.get("size") == st.st_size and previous.get("mtime_ns") == st.st_mtime_ns:
+        return previous
+    return {"sha256": hash_file(path), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _relative(entry: GalleryEntry, path: Path) -> str:
+    return os.path.relpath(path, entry.path)
+
+
+def load_manifest(entry: GalleryEntry) -> Optional[dict]:
+    """Read an entry's cache manifest, or None if absent or unusable."""
+    path = manifest_path(entry)
+    try:
+        manifest = json.loads(path.read_text())
+    except FileNotFoundError:
+        return None
+    except (OSError, json.JSONDecodeError) as e:
+        logger.debug(f"Ignoring unreadable cache manifest {path}: {e}")
+        return None
+    if manifest.get("version") != CACHE_VERSION:
+        return None
+    return manifest
+
+
+def _tracked_files(entry: GalleryEntry, manifest: dict) -> Dict[str, Path]:
+    files = {name: entry.path / name for name in INPUT_FILES}
+    for key in ("info", "usage", "plot") if "plot" in manifest else ("info", "usage"):
+        files[manifest[key]] = entry.path / manifest[key]
+    return files
+
+
+def _current_fingerprint(entry: GalleryEntry, name: str, path: Path, previous: Optional[dict]) -> Optional[dict]:
+    """Fingerprint a tracked file, using the discovery snapshot's stat when it covers the file."""
+    if entry.scan is not None:
+        try:
+            st = entry.scan.stat(name)
+        except KeyError:
+            pass
+        else:
+            return fingerprint(path, previous, st) if st is not None else None
+    return fingerprint(path, previous)
+
+
+def stale_reason(entry: GalleryEntry, need_plot: bool = True) -> Optional[str]:
+    """
+    Why an entry's previous outputs cannot be reused.
+
+    Args:
+        entry: GalleryEntry to check
+        need_plot: Treat an entry built without a plot (HTML output) as stale
+
+    Returns:
+        A short reason such as "command.sh changed", or None if the entry is up to date
+    """
+    manifest = load_manifest(entry)
+    if manifest is None:
+        return "no previous build"
+    if need_plot and "plot" not in manifest:
+        return "no plot rendered yet"
+
+    recorded = manifest.get("files", {})
+    try:
+        tracked = _tracked_files(entry, manifest)
+    except KeyError:
+        return "incomplete cache manifest"
+
+    for name, path in tracked.items():
+        current = _current_fingerprint(entry, name, path, recorded.get(name))
+        if current != recorded.get(name):
+            return f"{name} missing" if current is None else f"{name} changed"
+    return None
+
+
+def plot_settings_changed(entry: GalleryEntry, plot_settings) -> bool:
+    """
+    Whether the entry's cached plot was rendered with other settings.
+
+    Args:
+        entry: GalleryEntry with a cache manifest
+        plot_settings: PlotSettings of the current build
+
+    Returns:
+        True if the plot must be rendered again (also when the settings were not recorded)
+    """
+    manifest = load_manifest(entry)
+    return manifest is not None and manifest.get("plot_settings") != asdict(plot_settings)
+
+
+def restore_cached(entry: GalleryEntry, need_plot: bool = True) -> bool:
+    """
+    Reuse an entry's previous outputs if none of its inputs changed.
+
+    Fills in usage_json, info_json, run_info and plot_path from the manifest
+    when every tracked file (setup.sh, command.sh, metadata.json, info.json,
+    usage file and plot) still has the recorded content. The plot may still
+    need re-rendering with new settings (see plot_settings_changed).
+
+    Args:
+        entry: GalleryEntry to check
+        need_plot: Treat an entry built without a plot (HTML output) as stale
+
+    Returns:
+        True if the entry is up to date and its outputs were restored
+    """
+    reason = stale_reason(entry, need_plot)
+    if reason is not None:
+        logger.debug(f"Cache miss for {entry.name}: {reason}")
+        return False
+
+    manifest = load_manifest(entry)
+    try:
+        entry.run_info = json.loads((entry.path / manifest["info"]).read_text())
+    except (OSError, json.JSONDecodeError):
+        return False
+    entry.info_json = entry.path / manifest["info"]
+    entry.usage_json = entry.path / manifest["usage"]
+    if "plot" in manifest:
+        entry.plot_path = entry.path / manifest["plot"]
+    return True
+
+
+def write_manifest(entry: GalleryEntry, plot_settings=None) -> None:
+    """
+    Record fingerprints of an entry's inputs and outputs after a rebuild.
+
+    Args:
+        entry: Successfully processed GalleryEntry (info_json and usage_json
+            must be set; plot_path is recorded if set)
+        plot_settings: PlotSettings the plot was rendered with
+    """
+    previous = (load_manifest(entry) or {}).get("files", {})
+    manifest = {
+        "version": CACHE_VERSION,
+        "info": _relative(entry, entry.info_json),
+        "usage": _relative(entry, entry.usage_json),
+    }
+    if entry.plot_path:
+        manifest["plot"] = _relative(entry, entry.plot_path)
+        if plot_settings is not None:
+            manifest["plot_settings"] = asdict(plot_settings)
+    manifest["files"] = {
+        name: fingerprint(path, previous.get(name))
+        for name, path in _tracked_files(entry, manifest).items()
+    }
+
+    path = manifest_path(entry)
+    try:
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(json.dumps(manifest, indent=2))
+    except OSError as e:
+        logger.warning(f"Warning: Could not write cache manifest {path}: {e}")
+
+
+def fragment_path(entry: GalleryEntry) -> Path:
+    """Location of the entry's cached markdown fragment, next to the manifest."""
+    return entry.path / "plots" / FRAGMENT_NAME
+
+
+def fragment_key(entry: GalleryEntry, output_path: Path) -> Optional[str]:
+    """
+    Key identifying everything an entry's rendered markdown depends on.
+
+    Covers the recorded input/output fingerprints, the entry's location
+    relative to the output file (image links are relative), its
+    regressions, thumbnail and process table (which is derived from the
+    fingerprinted usage file, so only its size matters). Benchmark results
+    are not cached.
+
+    Returns:
+        Hex digest, or None if the entry's fragment must not be cached
+    """
+    manifest = load_manifest(entry)
+    if manifest is None or entry.benchmark is not None:
+        return None
+    payload = {
+        "version": FRAGMENT_VERSION,
+        "files": manifest.get("files"),
+        "location": os.path.relpath(entry.path, output_path.parent),
+        "regressions": [[r.metric, r.baseline, r.current] for r in entry.regressions],
+        "thumbnail": _relative(entry, entry.thumbnail_path) if entry.thumbnail_path else None,
+        "processes": entry.processes.limit if entry.processes else None,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def load_fragment(entry: GalleryEntry, key: str) -> Optional[str]:
+    """Cached markdown of the entry if it was rendered with the same key."""
+    try:
+        cached = json.loads(fragment_path(entry).read_text())
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(cached, dict) or cached.get("key") != key:
+        return None
+    return cached.get("markdown")
+
+
+def store_fragment(entry: GalleryEntry, key: str, markdown: str) -> None:
+    """Cache an entry's rendered markdown under key."""
+    path = fragment_path(entry)
+    try:
+        path.write_text(json.dumps({"key": key, "markdown": markdown}))
+    except OSError as e:
+        logger.debug(f"Could not cache markdown fragment {path}: {e}")
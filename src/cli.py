@@ -0,0 +1,236 @@
+"""Command-line interface of con-duct-gallery.
+
+Kept free of the build pipeline's imports, so --help and --dry-run start
+quickly; the pipeline is imported once a build actually runs.
+"""
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+from src.defaults import (
+    DEFAULT_DEBOUNCE,
+    DEFAULT_NOISE_FLOORS,
+    DEFAULT_PLOT_POINTS,
+    DEFAULT_REMOTE_DIR,
+    DEFAULT_THRESHOLDS,
+    DEFAULT_TIMEOUT,
+    DEFAULT_TOP_PROCESSES,
+    DEFAULT_WORKER_COMMAND,
+    DOWNSAMPLE_METHODS,
+    EXIT_REGRESSION,
+    GROUP_BY,
+    GROUP_TAG,
+    HTML_DIR,
+    MIN_PLOT_POINTS,
+    PAGES_DIR,
+    PLOT_ENGINES,
+    SUMMARY_COLUMNS,
+)
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_FORMATS = ("markdown", "html")
+
+
+def positive_int(value: str) -> int:
+    """Argparse type for options that require an integer >= 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
+
+
+def non_negative_int(value: str) -> int:
+    """Argparse type for options that require an integer >= 0."""
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be a non-negative integer, got {value}")
+    return number
+
+
+def plot_points(value: str) -> int:
+    """Argparse type for --plot-points: smaller budgets cannot be downsampled to."""
+    number = int(value)
+    if number < MIN_PLOT_POINTS:
+        raise argparse.ArgumentTypeError(f"must be at least {MIN_PLOT_POINTS}, got {value}")
+    return number
+
+
+def size(value: str) -> int:
+    """Argparse type for byte sizes such as 512M or 16G."""
+    from src.footprint import parse_size
+
+    try:
+        return parse_size(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def main():
+    """Main entry point for con-duct-gallery CLI."""
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    parser = argparse.ArgumentParser(description="Generate gallery markdown from duct executions")
+    parser.add_argument("--gallery-dir", type=Path, default=Path("./gallery"), help="Gallery directory to scan")
+    parser.add_argument("--index", type=Path, default=None,
+                        help="SQLite run index to update (default: <gallery-dir>/.run-index.sqlite)")
+    parser.add_argument("--no-index", action="store_true", help="Do not record runs in the run index")
+    parser.add_argument("-n", "--dry-run", action="store_true",
+                        help="Print whether each entry would be executed, skipped (re-plotted from its archived "
+                             "run) or served from cache, and why; runs and writes nothing")
+    parser.add_argument("-j", "--jobs", type=positive_int, default=1,
+                        help="Number of entries to process in parallel (default: 1)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Rebuild every entry even if its inputs are unchanged")
+    parser.add_argument("--plot-engine", choices=PLOT_ENGINES, default="inprocess",
+                        help="Render plots in-process or with the con-duct plot command (default: inprocess)")
+    parser.add_argument("--plot-points", type=plot_points, default=DEFAULT_PLOT_POINTS,
+                        help=f"Maximum points per plotted series (default: {DEFAULT_PLOT_POINTS})")
+    parser.add_argument("--downsample", choices=DOWNSAMPLE_METHODS, default="minmax",
+                        help="Downsampling method for long series: minmax keeps peaks, lttb keeps shape "
+                             "(default: minmax)")
+    parser.add_argument("--thumbnail-width", type=positive_int, default=None, metavar="PX",
+                        help="Show PX-wide thumbnails (plots/usage.thumb.png) in the markdown, each linking to "
+                             "its full-size plot")
+    parser.add_argument("--top-processes", type=non_negative_int, default=DEFAULT_TOP_PROCESSES, metavar="N",
+                        help="Next to each plot, list the top N commands by CPU time, peak CPU, memory over time "
+                             f"and peak memory; 0 leaves the table out (default: {DEFAULT_TOP_PROCESSES})")
+    parser.add_argument("--plot-workers", type=positive_int, default=1, metavar="N",
+                        help="Render plots in N worker processes; use with -j so enough entries are in flight, "
+                             "e.g. to re-render large archives of skip-execution entries (default: 1, in-process)")
+    parser.add_argument("--timeout", type=positive_int, default=DEFAULT_TIMEOUT,
+                        help=f"Seconds before setup.sh/command.sh are killed, unless the entry's "
+                             f"metadata.json sets \"timeout\" (default: {DEFAULT_TIMEOUT})")
+
+    parser.add_argument("--repeat", type=positive_int, default=1, metavar="N",
+                        help="Benchmark mode: run command.sh N times and report statistics (default: 1)")
+    parser.add_argument("--warmup", type=non_negative_int, default=0, metavar="N",
+                        help="Benchmark mode: unmeasured command.sh runs before the repeats (default: 0)")
+    parser.add_argument("--overlay-repeats", action="store_true",
+                        help="Benchmark mode: also plot all repeats on shared axes (plots/repeats.png)")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="markdown",
+                        help=f"markdown: README.md with PNG plots; html: {HTML_DIR}/index.html with interactive "
+                             f"plots drawn in the browser, no PNGs rendered (default: markdown)")
+    parser.add_argument("--page-size", type=non_negative_int, default=0, metavar="N",
+                        help=f"Split the output into pages of N entries under {PAGES_DIR}/, with README.md as "
+                             f"the index (default: 0, a single README.md)")
+    parser.add_argument("--group-by", choices=GROUP_BY, default="none",
+                        help=f"With --page-size, page entries by name prefix or by the \"{GROUP_TAG}\" key of "
+                             f"their metadata.json (default: none)")
+    parser.add_argument("--summary-sort", choices=SUMMARY_COLUMNS, default=None, metavar="METRIC",
+                        help="Sort the gallery-wide summary table by this metric, largest first "
+                             f"({', '.join(SUMMARY_COLUMNS)}; default: discovery order)")
+    parser.add_argument("--pack", action="store_true",
+                        help="With -j, only run entries concurrently while their expected CPU and memory "
+                             "(metadata.json \"cpu\"/\"memory\", else their previous run) fit the host, "
+                             "longest first")
+    parser.add_argument("--cpu-total", type=float, metavar="PERCENT",
+                        help="CPU available to --pack, in percent of one core (default: 100 per CPU)")
+    parser.add_argument("--memory-total", type=size, metavar="SIZE",
+                        help="Memory available to --pack, e.g. 16G (default: physical memory)")
+    parser.add_argument("--worker", action="append", default=[], metavar="HOST[*SLOTS]",
+                        help="Run execute-mode entries on a worker: \"local\" or an SSH destination, optionally "
+                             "with the number of entries it runs at once (e.g. node1*4); repeat for more workers. "
+                             "Workers need con-duct-gallery installed; plots and README.md are made locally")
+    parser.add_argument("--remote-dir", default=DEFAULT_REMOTE_DIR,
+                        help=f"Scratch directory for entries on workers (default: {DEFAULT_REMOTE_DIR})")
+    parser.add_argument("--worker-command", default=DEFAULT_WORKER_COMMAND,
+                        help=f"Command running an entry on a worker (default: {DEFAULT_WORKER_COMMAND})")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running and rebuild entries whose setup.sh, command.sh, metadata.json or "
+                             "(skip-execution entries) .duct/ files change")
+    parser.add_argument("--poll", action="store_true",
+                        help="Watch mode: poll for changes instead of using inotify (e.g. on NFS)")
+    parser.add_argument("--debounce", type=float, default=DEFAULT_DEBOUNCE, metavar="SECONDS",
+                        help=f"Watch mode: wait until files are quiet for SECONDS before rebuilding "
+                             f"(default: {DEFAULT_DEBOUNCE})")
+    parser.add_argument("--profile", type=Path, metavar="TRACE_JSON",
+                        help="Write per-stage timings of every entry and of the whole run as a Chrome "
+                             "trace-event file (open in chrome://tracing or ui.perfetto.dev)")
+    parser.add_argument("--compare-to", type=Path, metavar="BASELINE",
+                        help=f"Compare execution summaries against a baseline file and exit with "
+                             f"code {EXIT_REGRESSION} if any entry regressed")
+    parser.add_argument("--save-baseline", type=Path, metavar="BASELINE",
+                        help="Write this run's execution summaries as a baseline file")
+    parser.add_argument("--threshold", action="append", default=[], metavar="METRIC=FRACTION",
+                        help="Relative increase counted as a regression (defaults: "
+                             + ", ".join(f"{k}={v}" for k, v in DEFAULT_THRESHOLDS.items()) + ")")
+    parser.add_argument("--noise-floor", action="append", default=[], metavar="METRIC=VALUE",
+                        help="Absolute increase ignored as noise (defaults: "
+                             + ", ".join(f"{k}={v:g}" for k, v in DEFAULT_NOISE_FLOORS.items()) + ")")
+
+    args = parser.parse_args()
+
+    from src.regression import load_baseline, parse_metric_values
+
+    try:
+        thresholds = parse_metric_values(args.threshold, DEFAULT_THRESHOLDS)
+        noise_floors = parse_metric_values(args.noise_floor, DEFAULT_NOISE_FLOORS)
+        workers = []
+        if args.worker:
+            from src.remote import Worker
+
+            workers = [Worker.parse(spec) for spec in args.worker]
+    except ValueError as e:
+        parser.error(str(e))
+    if args.format == "html" and args.page_size:
+        parser.error("--page-size applies to markdown output only")
+    if args.dry_run and args.watch:
+        parser.error("--dry-run cannot be combined with --watch")
+    if args.watch and args.save_baseline:
+        parser.error("--save-baseline cannot be combined with --watch")
+    if workers and args.pack:
+        parser.error("--pack applies to the local host and cannot be combined with --worker")
+    if workers and (args.repeat > 1 or args.warmup > 0):
+        parser.error("--worker cannot be combined with benchmark mode (--repeat/--warmup)")
+
+    if args.dry_run:
+        print_plan(args)
+        return
+
+    baseline = None
+    if args.compare_to:
+        try:
+            baseline = load_baseline(args.compare_to)
+        except (OSError, ValueError) as e:
+            logger.error(f"Error: Cannot read baseline {args.compare_to}: {e}")
+            sys.exit(1)
+
+    # The build pipeline (execution, plotting, asyncio) is only imported when a build runs
+    from src.gallery_render import build_gallery, watch_gallery
+    from src.profiling import enable_profiling, span
+
+    profiler = enable_profiling() if args.profile else None
+    try:
+        with span("run"):
+            if args.watch:
+                watch_gallery(args, baseline, thresholds, noise_floors, workers)
+            else:
+                build_gallery(args, baseline, thresholds, noise_floors, workers)
+    finally:
+        if profiler is not None:
+            profiler.write(args.profile)
+
+
+def print_plan(args) -> None:
+    """Print what a build with these arguments would do with each entry (--dry-run)."""
+    from src.discovery import discover_entries
+    from src.plan import format_plan, plan_entries
+    from src.plot_generator import PlotSettings
+
+    entries = discover_entries(args.gallery_dir)
+    if not entries:
+        logger.error(f"Error: No valid gallery entries found in {args.gallery_dir}")
+        sys.exit(1)
+    plans = plan_entries(
+        entries,
+        use_cache=not args.no_cache,
+        benchmarking=args.repeat > 1 or args.warmup > 0,
+        need_plot=args.format == "markdown",
+        plot_settings=PlotSettings(engine=args.plot_engine, max_points=args.plot_points, downsample=args.downsample),
+    )
+    print(format_plan(plans))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Comparison plots overlaying the usage of several entries or runs."""
+import json
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Sequence, Set, Tuple
+
+from src.models.gallery_entry import GalleryEntry
+from src.path_utils import safe_name
+from src.plot_generator import TIME_AXES, PlotSettings, get_engine
+
+logger = logging.getLogger(__name__)
+
+COMPARISONS_FILE = "comparisons.json"
+COMPARISONS_DIR = "comparisons"
+
+
+@dataclass
+class Comparison:
+    """A group of usage files plotted on shared axes."""
+
+    name: str
+    title: str
+    members: List[Tuple[str, Path]] = field(default_factory=list)
+    time_axis: str = "elapsed"
+    plot_path: Optional[Path] = None
+
+
+def load_comparisons(gallery_dir: Path, entries: Sequence[GalleryEntry]) -> List[Comparison]:
+    """
+    Read the comparison groups declared in <gallery-dir>/comparisons.json.
+
+    The file holds a list of groups::
+
+        [{"name": "variants", "entries": ["example-1", "example-2"], "time_axis": "relative"}]
+
+    Members are entry names (their current usage file is used) or objects
+    {"label": ..., "path": ...} with a usage file path relative to the gallery
+    directory, e.g. an archived run. "title" is optional. Members that are not
+    available are skipped with a warning; groups left with fewer than two
+    members are dropped.
+
+    Args:
+        gallery_dir: Gallery directory
+        entries: Successfully processed entries
+
+    Returns:
+        Comparisons ready to render (empty if the file is absent or invalid)
+    """
+    path = gallery_dir / COMPARISONS_FILE
+    try:
+        groups = json.loads(path.read_text())
+    except FileNotFoundError:
+        return []
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Warning: Ignoring invalid {COMPARISONS_FILE}: {e}")
+        return []
+    if not isinstance(groups, list):
+        logger.warning(f"Warning: Ignoring {COMPARISONS_FILE}: expected a list of comparison groups")
+        return []
+
+    usage_by_name = {entry.name: entry.usage_json for entry in entries if entry.usage_json}
+    comparisons = []
+    for group in groups:
+        if not isinstance(group, dict) or not group.get("name"):
+            logger.warning(f"Warning: Comparison skipped - each group needs a \"name\": {group!r}")
+            continue
+        name = str(group["name"])
+        time_axis = group.get("time_axis", "elapsed")
+        if time_axis not in TIME_AXES:
+            logger.warning(f"Warning: Comparison '{name}' skipped - time_axis must be one of {', '.join(TIME_AXES)}")
+            continue
+        comparison = Comparison(name, str(group.get("title") or name), time_axis=time_axis)
+        for member in group.get("entries", []):
+            if isinstance(member, dict):
+                label, usage = str(member.get("label", member.get("path"))), gallery_dir / str(member.get("path"))
+                if not member.get("path") or not usage.is_file():
+                    logger.warning(f"Warning: Comparison '{name}' member '{label}' skipped - usage file not found")
+                    continue
+            elif member in usage_by_name:
+                label, usage = str(member), usage_by_name[member]
+            else:
+                logger.warning(f"Warning: Comparison '{name}' member '{member}' skipped - no processed entry")
+                continue
+            comparison.members.append((label, usage))
+        if len(comparison.members) < 2:
+            logger.warning(f"Warning: Comparison '{name}' skipped - needs at least two usage files")
+            continue
+        comparisons.append(comparison)
+    return comparisons
+
+
+def render_comparisons(
+    comparisons: Sequence[Comparison],
+    output_dir: Path,
+    settings: Optional[PlotSettings] = None,
+    changed: Optional[Set[str]] = None,
+) -> List[Comparison]:
+    """
+    Render each comparison to <output_dir>/comparisons/<name>.png.
+
+    Args:
+        comparisons: Loaded comparison groups
+        output_dir: Directory of the markdown output
+        settings: Downsampling settings
+        changed: Names of the entries rebuilt since the plots were last
+            rendered (None: render all); comparisons without a changed
+            member keep their existing plot
+
+    Returns:
+        The comparisons that were rendered, with plot_path set
+    """
+    if not comparisons:
+        return []
+    if changed is not None:
+        stale = []
+        for comparison in comparisons:
+            plot_path = output_dir / COMPARISONS_DIR / f"{safe_name(comparison.name, 'comparison')}.png"
+            if plot_path.exists() and not changed.intersection(label for label, _ in comparison.members):
+                comparison.plot_path = plot_path
+            else:
+                stale.append(comparison)
+        render_comparisons(stale, output_dir, settings)
+        return [comparison for comparison in comparisons if comparison.plot_path is not None]
+    engine = get_engine()
+    if engine is None:
+        logger.warning("Warning: Comparison plots need in-process plotting, skipped")
+        return []
+    plots_dir = output_dir / COMPARISONS_DIR
+    plots_dir.mkdir(parents=True, exist_ok=True)
+    rendered = []
+    for comparison in comparisons:
+        plot_path = plots_dir / f"{safe_name(comparison.name, 'comparison')}.png"
+        try:
+            engine.render_overlay(comparison.members, plot_path, settings, comparison.time_axis, comparison.title)
+        except Exception as e:
+            logger.warning(f"Warning: Comparison '{comparison.name}' failed: {e}")
+            continue
+        comparison.plot_path = plot_path
+        logger.info(f"Generated plot: {plot_path}")
+        rendered.append(comparison)
+    return rendered
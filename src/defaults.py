@@ -0,0 +1,50 @@
+"""Defaults and choices of command-line options, importable without the modules that use them."""
+
+DEFAULT_TIMEOUT = 300  # 5 minutes
+DEFAULT_REMOTE_DIR = "/tmp/con-duct-gallery"
+DEFAULT_WORKER_COMMAND = "con-duct-gallery-worker"
+
+# Plotting
+PLOT_ENGINES = ("inprocess", "con-duct")
+DEFAULT_PLOT_POINTS = 2000
+# Smallest --plot-points every downsampling method can honour
+MIN_PLOT_POINTS = 4
+DOWNSAMPLE_METHODS = ("minmax", "lttb")
+DEFAULT_TOP_PROCESSES = 3
+
+# Output layout
+HTML_DIR = "html"
+PAGES_DIR = "pages"
+GROUP_BY = ("none", "prefix", "tag")
+# metadata.json key naming an entry's group for --group-by tag
+GROUP_TAG = "group"
+
+# execution_summary fields shown in summary tables, with their column titles
+SUMMARY_COLUMNS = {
+    "wall_clock_time": "Wall clock",
+    "peak_rss": "Peak RSS",
+    "average_rss": "Avg RSS",
+    "peak_pcpu": "Peak CPU",
+    "average_pcpu": "Avg CPU",
+    "num_samples": "Samples",
+}
+
+# Regression detection
+EXIT_REGRESSION = 3
+
+# Relative increase over the baseline that counts as a regression
+DEFAULT_THRESHOLDS = {
+    "wall_clock_time": 0.10,
+    "peak_rss": 0.10,
+    "average_pcpu": 0.20,
+}
+
+# Absolute increase below which a change is treated as noise
+DEFAULT_NOISE_FLOORS = {
+    "wall_clock_time": 0.5,        # seconds
+    "peak_rss": 1024 * 1024,       # bytes
+    "average_pcpu": 1.0,           # percent
+}
+
+# Watch mode
+DEFAULT_DEBOUNCE = 0.3
@@ -1,8 +1,10 @@
 """Gallery entry discovery logic."""
+import os
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 import logging
 
+from src.models.entry_scan import EntryScan
 from src.models.gallery_entry import GalleryEntry
 
 logger = logging.getLogger(__name__)
@@ -12,39 +14,53 @@ def discover_entries(gallery_dir: Path) -> List[GalleryEntry]:
     """
     Scan gallery directory and discover valid entries.
 
+    Each entry directory is listed once with os.scandir; the resulting
+    EntryScan answers all later file checks for the entry.
+
     Args:
         gallery_dir: Path to gallery directory
 
     Returns:
         List of validated GalleryEntry instances
     """
-    if not gallery_dir.exists() or not gallery_dir.is_dir():
+    try:
+        with os.scandir(gallery_dir) as it:
+            entry_dirs = sorted(item.name for item in it if item.is_dir())
+    except (FileNotFoundError, NotADirectoryError):
         logger.error(f"Gallery directory not found: {gallery_dir}")
         return []
 
     entries = []
-    for entry_dir in sorted(gallery_dir.iterdir()):
-        if not entry_dir.is_dir():
-            continue
-
-        entry = GalleryEntry.from_directory(entry_dir)
-
-        # Basic validation: entry directory must exist
-        if not entry.path.is_dir():
-            logger.warning(f"Skipping invalid entry: {entry.name}")
-            continue
-
-        # For execute mode: validate required files
-        # For skip mode: just accept the entry, validation happens in process_entry
-        if entry.has_command_script:
-            if entry.validate():
-                entries.append(entry)
-                logger.info(f"Discovered entry: {entry.name}")
-            else:
-                logger.warning(f"Skipping invalid entry: {entry.name}")
-        else:
-            # Skip mode entry - accept it, will be validated during processing
+    for name in entry_dirs:
+        entry = discover_entry(gallery_dir / name)
+        if entry is not None:
             entries.append(entry)
-            logger.info(f"Discovered entry: {entry.name}")
 
     return entries
+
+
+def discover_entry(entry_dir: Path) -> Optional[GalleryEntry]:
+    """
+    Scan and validate a single entry directory.
+
+    Args:
+        entry_dir: Directory of the entry
+
+    Returns:
+        GalleryEntry, or None if the directory is not a valid entry
+    """
+    try:
+        scan = EntryScan.scan(entry_dir)
+    except OSError as e:
+        logger.warning(f"Skipping invalid entry: {entry_dir.name} ({e})")
+        return None
+
+    entry = GalleryEntry.from_directory(entry_dir, scan)
+
+    # For execute mode: validate required files
+    # For skip mode: just accept the entry, validation happens in process_entry
+    if entry.has_command_script and not entry.validate():
+        logger.warning(f"Skipping invalid entry: {entry.name}")
+        return None
+    logger.info(f"Discovered entry: {entry.name}")
+    return entry
@@ -0,0 +1,116 @@
+"""Downsampling of usage time series before plotting."""
+from typing import Tuple
+
+import numpy as np
+
+# Smallest budgets the methods can honour (minmax: both endpoints plus one bucket's min and max)
+MIN_POINTS = {"minmax": 4, "lttb": 3}
+
+
+def minmax(x: np.ndarray, y: np.ndarray, max_points: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Keep the minimum and maximum sample of each bucket.
+
+    Every local peak and trough survives, so short spikes in rss or pcpu stay
+    visible however many samples are dropped.
+
+    Args:
+        x: Sample times, ascending
+        y: Sample values
+        max_points: Upper bound on returned points
+
+    Returns:
+        Downsampled (x, y)
+
+    Raises:
+        ValueError: If max_points is below MIN_POINTS["minmax"]
+    """
+    if max_points < MIN_POINTS["minmax"]:
+        raise ValueError(f"minmax needs max_points >= {MIN_POINTS['minmax']}, got {max_points}")
+    n = len(y)
+    if n <= max_points:
+        return x, y
+
+    # Two samples per bucket plus both endpoints
+    buckets = (max_points - 2) // 2
+    size = -(-n // buckets)
+    buckets = -(-n // size)
+    padded = np.full(buckets * size, np.nan)
+    padded[:n] = y
+    rows = padded.reshape(buckets, size)
+    offsets = np.arange(buckets) * size
+    keep = np.concatenate((
+        offsets + np.nanargmin(rows, axis=1),
+        offsets + np.nanargmax(rows, axis=1),
+        [0, n - 1],
+    ))
+    keep = np.unique(keep)
+    return x[keep], y[keep]
+
+
+def lttb(x: np.ndarray, y: np.ndarray, max_points: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Picks, per bucket, the sample forming the largest triangle with the
+    previously selected point and the average of the next bucket, which keeps
+    the visual shape of the series with exactly max_points samples.
+
+    Args:
+        x: Sample times, ascending
+        y: Sample values
+        max_points: Number of returned points
+
+    Returns:
+        Downsampled (x, y)
+
+    Raises:
+        ValueError: If max_points is below MIN_POINTS["lttb"]
+    """
+    if max_points < MIN_POINTS["lttb"]:
+        raise ValueError(f"lttb needs max_points >= {MIN_POINTS['lttb']}, got {max_points}")
+    n = len(y)
+    if n <= max_points:
+        return x, y
+
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.intp)
+    keep = np.empty(max_points, dtype=np.intp)
+    keep[0], keep[-1] = 0, n - 1
+    selected = 0
+    for i in range(max_points - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], edges[i + 2]
+        else:
+            next_start, next_end = n - 1, n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        area = np.abs(
+            (x[selected] - avg_x) * (y[start:end] - y[selected])
+            - (x[selected] - x[start:end]) * (avg_y - y[selected])
+        )
+        selected = start + int(area.argmax())
+        keep[i + 1] = selected
+    return x[keep], y[keep]
+
+
+def downsample(x, y, max_points: int, method: str = "minmax") -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduce a series to at most max_points samples.
+
+    Args:
+        x: Sample times (any buffer, e.g. array('d'))
+        y: Sample values, same length as x
+        max_points: Upper bound on returned points
+        method: "minmax" (keeps peaks) or "lttb" (keeps overall shape)
+
+    Returns:
+        Downsampled (x, y) as numpy arrays
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if method == "minmax":
+        return minmax(x, y, max_points)
+    if method == "lttb":
+        return lttb(x, y, max_points)
+    raise ValueError(f"Unknown downsampling method: {method}")
@@ -1,39 +1,136 @@
 """Script execution utilities."""
-import subprocess
+import asyncio
 import logging
+import os
+import signal
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Tuple
+from typing import Dict, Optional
+
+from src.defaults import DEFAULT_TIMEOUT
 
 logger = logging.getLogger(__name__)
 
+LOG_CHUNK_SIZE = 64 * 1024
+KILL_GRACE_PERIOD = 5
+
+
+@dataclass
+class ScriptResult:
+    """Outcome of a script run; output lives in the log files, not in memory."""
+
+    success: bool
+    returncode: Optional[int]
+    stdout_path: Path
+    stderr_path: Path
+    timed_out: bool = False
+
+
+async def _drain(stream: asyncio.StreamReader, log_path: Path) -> None:
+    """Copy a child's output stream to log_path in bounded chunks."""
+    with open(log_path, "wb") as log:
+        while True:
+            chunk = await stream.read(LOG_CHUNK_SIZE)
+            if not chunk:
+                break
+            log.write(chunk)
+
+
+async def _kill_process_group(proc: asyncio.subprocess.Process) -> None:
+    """Terminate the child's whole process group, escalating to SIGKILL."""
+    for sig in (signal.SIGTERM, signal.SIGKILL):
+        try:
+            os.killpg(proc.pid, sig)
+        except ProcessLookupError:
+            return
+        try:
+            await asyncio.wait_for(proc.wait(), KILL_GRACE_PERIOD)
+            return
+        except asyncio.TimeoutError:
+            continue
 
-def execute_script(script_path: Path, cwd: Path) -> Tuple[bool, str, str]:
+
+async def execute_script_async(
+    script_path: Path,
+    cwd: Path,
+    log_dir: Path,
+    timeout: Optional[float] = DEFAULT_TIMEOUT,
+    env: Optional[Dict[str, str]] = None,
+) -> ScriptResult:
     """
-    Execute a shell script and capture output.
+    Execute a shell script, streaming its output to log files.
+
+    The script runs in its own session so that on timeout the whole process
+    tree (duct and the command it monitors) is killed, not only the script.
+    Being in its own session it never receives the terminal's SIGINT, so the
+    tree is also killed when the run is cancelled (e.g. on Ctrl-C).
 
     Args:
         script_path: Path to script to execute
         cwd: Working directory for execution
+        log_dir: Directory receiving <script>.stdout and <script>.stderr
+        timeout: Seconds before the process group is killed (None to wait forever)
+        env: Variables set for the script on top of the current environment
 
     Returns:
-        Tuple of (success: bool, stdout: str, stderr: str)
+        ScriptResult describing the run
     """
+    log_dir.mkdir(parents=True, exist_ok=True)
+    stdout_path = log_dir / f"{script_path.stem}.stdout"
+    stderr_path = log_dir / f"{script_path.stem}.stderr"
+    result = ScriptResult(False, None, stdout_path, stderr_path)
+
     try:
-        result = subprocess.run(
-            [str(script_path.resolve())],
+        proc = await asyncio.create_subprocess_exec(
+            str(script_path.resolve()),
             cwd=str(cwd.resolve()),
-            capture_output=True,
-            text=True,
-            timeout=300,  # 5 minute timeout
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            start_new_session=True,
+            env={**os.environ, **env} if env else None,
         )
-        success = result.returncode == 0
-        return success, result.stdout, result.stderr
-    except subprocess.TimeoutExpired:
-        logger.error(f"Script timed out: {script_path}")
-        return False, "", "Script execution timed out"
     except Exception as e:
         logger.error(f"Script execution failed: {e}")
-        return False, "", str(e)
+        stderr_path.write_text(f"{e}\n")
+        return result
+
+    drains = asyncio.gather(_drain(proc.stdout, stdout_path), _drain(proc.stderr, stderr_path))
+    try:
+        await asyncio.wait_for(proc.wait(), timeout)
+    except asyncio.TimeoutError:
+        logger.error(f"Script timed out after {timeout}s: {script_path}")
+        result.timed_out = True
+        await _kill_process_group(proc)
+        # Orphaned grandchildren may still hold the pipes open
+        try:
+            await asyncio.wait_for(drains, KILL_GRACE_PERIOD)
+        except asyncio.TimeoutError:
+            logger.warning(f"Output of {script_path} truncated after timeout")
+    except asyncio.CancelledError:
+        # SIGTERM is sent before the first await, so the tree is signalled
+        # even if the escalation itself is cancelled
+        try:
+            await _kill_process_group(proc)
+        finally:
+            drains.cancel()
+        raise
+    else:
+        await drains
+
+    result.returncode = proc.returncode
+    result.success = not result.timed_out and proc.returncode == 0
+    return result
+
+
+def execute_script(
+    script_path: Path,
+    cwd: Path,
+    log_dir: Path,
+    timeout: Optional[float] = DEFAULT_TIMEOUT,
+) -> ScriptResult:
+    """Blocking wrapper around execute_script_async."""
+    return asyncio.run(execute_script_async(script_path, cwd, log_dir, timeout))
 
 
 def read_command_text(command_script: Path) -> str:
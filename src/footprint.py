@@ -0,0 +1,111 @@
+"""Expected resource footprint of entries, for packing concurrent runs."""
+import json
+import logging
+import os
+import re
+from dataclasses import dataclass
+from typing import Mapping, Optional
+
+from src.models.gallery_entry import GalleryEntry
+
+logger = logging.getLogger(__name__)
+
+# metadata.json keys declaring an entry's limits (override its history)
+CPU_KEY = "cpu"          # percent of one core, like duct's pcpu (200 = two cores)
+MEMORY_KEY = "memory"    # bytes
+
+_SIZE_UNITS = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+
+
+@dataclass(frozen=True)
+class Footprint:
+    """Resources an entry is expected to hold while it runs."""
+
+    cpu: float = 0.0          # percent of one core
+    memory: float = 0.0       # bytes
+    duration: float = 0.0     # seconds, used for longest-first ordering
+
+
+@dataclass(frozen=True)
+class Capacity:
+    """Resources available for concurrently running entries (named as in duct's system info)."""
+
+    cpu_total: float
+    memory_total: float
+
+    @classmethod
+    def of_host(cls) -> "Capacity":
+        """Capacity of this machine: 100% per CPU and its physical memory."""
+        cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+        return cls(cpus * 100.0, os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES"))
+
+    def fits(self, cpu: float, memory: float) -> bool:
+        return cpu <= self.cpu_total and memory <= self.memory_total
+
+
+def parse_size(value: str) -> int:
+    """
+    Parse a byte size such as 512M or 16G (binary units; plain numbers are bytes).
+
+    Raises:
+        ValueError: If value is not a size
+    """
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMGT]?)i?B?\s*", value, re.IGNORECASE)
+    if not match:
+        raise ValueError(f"Invalid size '{value}', expected e.g. 512M or 16G")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2).upper()])
+
+
+def _previous_summary(entry: GalleryEntry) -> Optional[dict]:
+    """execution_summary of the entry's last run still on disk, if any."""
+    info_files = entry.info_files()
+    if not info_files:
+        return None
+    try:
+        return json.loads(info_files[0].read_text()).get("execution_summary")
+    except (OSError, json.JSONDecodeError, AttributeError):
+        return None
+
+
+def estimate_footprint(entry: GalleryEntry, history: Optional[Mapping[str, Mapping]] = None) -> Footprint:
+    """
+    Expected footprint of an entry.
+
+    Uses, per resource, the limit declared in metadata.json ("cpu" in percent
+    of a core, "memory" in bytes), else the entry's latest run from history
+    (the run index), else the execution_summary of the info.json left by its
+    previous run. Skip-execution entries run nothing and need no resources.
+
+    Args:
+        entry: Entry to estimate
+        history: Latest recorded run per entry name (e.g. run index rows)
+
+    Returns:
+        Footprint (zero for unknown resources)
+    """
+    if entry.skip_execution:
+        return Footprint()
+    summary = (history or {}).get(entry.name) or _previous_summary(entry) or {}
+
+    def measured(metric: str) -> float:
+        value = summary[metric] if metric in summary.keys() else None
+        return float(value) if isinstance(value, (int, float)) else 0.0
+
+    def declared(key: str, parse) -> Optional[float]:
+        value = entry.metadata.get(key)
+        if value is None:
+            return None
+        try:
+            return float(parse(value))
+        except (TypeError, ValueError):
+            logger.warning(f"Warning: Ignoring invalid \"{key}\" in metadata.json of {entry.name}: {value}")
+            return None
+
+    cpu = declared(CPU_KEY, float)
+    memory = declared(MEMORY_KEY, lambda value: parse_size(str(value)))
+    return Footprint(
+        cpu=measured("average_pcpu") if cpu is None else cpu,
+        memory=measured("peak_rss") if memory is None else memory,
+        duration=measured("wall_clock_time"),
+    )
+
@@ -1,21 +1,66 @@
-"""Main CLI entrypoint for con-duct-gallery."""
-import argparse
+"""Build pipeline of con-duct-gallery: process entries and render the gallery."""
+import asyncio
 import logging
 import sys
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Dict, Optional, Set
+
+from src.archive import load_archived_run
+from src.benchmark import run_repeats
+from src.cache import plot_settings_changed, restore_cached, write_manifest
+from src.comparisons import COMPARISONS_FILE, load_comparisons, render_comparisons
+from src.discovery import discover_entries, discover_entry
+from src.defaults import DEFAULT_TIMEOUT, DEFAULT_TOP_PROCESSES, EXIT_REGRESSION, HTML_DIR
+from src.executor import execute_script_async, read_command_text
+from src.footprint import Capacity, estimate_footprint
+from src.images import ensure_thumbnail
+from src.models.entry_scan import DUCT_DIR
+from src.models.gallery_entry import TIMEOUT_KEY, GalleryEntry
+from src.plot_generator import PlotPool, PlotSettings, generate_plot, get_engine
+from src.process_stats import load_breakdown
+from src.profiling import span
+from src.regression import detect_regressions, save_baseline
+from src.renderers.html import write_html
+from src.renderers.markdown import MarkdownWriter, render_comparison_section
+from src.renderers.pages import write_pages
+from src.remote import RemoteExecutor
+from src.run_index import default_index_path, open_index
+from src.scheduler import run_entries
+from src.watch import open_watcher
 
-from src.discovery import discover_entries
-from src.executor import execute_script, read_command_text
-from src.plot_generator import generate_plot
-from src.renderers.markdown import render_markdown
-
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(message)s'
-)
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class BuildOptions:
+    """Settings shared by every entry processed in one run."""
+
+    use_cache: bool = True
+    plot_settings: PlotSettings = field(default_factory=PlotSettings)
+    timeout: float = DEFAULT_TIMEOUT
+    # Benchmark mode: measured and unmeasured runs of command.sh
+    repeat: int = 1
+    warmup: int = 0
+    overlay_repeats: bool = False
+    # False for HTML output, which draws plots in the browser
+    render_plots: bool = True
+    # Width in pixels of plot thumbnails linking to the full plot (None: embed full plots)
+    thumbnail_width: Optional[int] = None
+    # Commands listed from the top of each per-process ranking (0: no process table)
+    top_processes: int = DEFAULT_TOP_PROCESSES
+    # Worker processes rendering plots in parallel (None: render in a helper thread)
+    plot_pool: Optional[PlotPool] = None
+    # Worker hosts running setup.sh/command.sh (None: run them locally)
+    remote: Optional[RemoteExecutor] = None
+
+    @property
+    def benchmarking(self) -> bool:
+        return self.repeat > 1 or self.warmup > 0
+
+
 def validate_output_path(output_path: Path) -> bool:
     """Validate that output path is writable."""
     parent = output_path.parent
@@ -28,107 +73,300 @@ def validate_output_path(output_path: Path) -> bool:
     return True
 
 
-def process_entry(entry, output_path):
+def process_entry(entry, output_path, options=None):
     """Process a single gallery entry: execute scripts, generate plot, prepare for rendering."""
+    return asyncio.run(process_entry_async(entry, output_path, options))
+
+
+async def process_entry_async(entry, output_path, options=None):
+    """
+    Async implementation of process_entry.
+
+    Scripts are awaited as child processes and the plot is rendered in a
+    helper thread, so many entries can be processed on one event loop.
+    A "timeout" key in the entry's metadata overrides the default timeout.
+    """
     import json
 
+    options = options or BuildOptions()
     logger.info(f"Executing entry: {entry.name}")
 
+    # Reuse previous outputs when nothing in the entry changed; benchmark
+    # runs always measure afresh
+    use_cache = options.use_cache and (entry.skip_execution or not options.benchmarking)
+    with span("cache", entry.name):
+        restored = use_cache and restore_cached(entry, need_plot=options.render_plots)
+    if restored:
+        logger.info("  Up to date, reusing cached outputs")
+        entry.cached = True
+        if entry.has_command_script:
+            entry.command_text = read_command_text(entry.command_script)
+        else:
+            entry.command_text = "# Command not available (skip execution mode)"
+        await add_process_breakdown(entry, options)
+        if options.render_plots and plot_settings_changed(entry, options.plot_settings):
+            logger.info("  Plot settings changed, re-plotting")
+            entry.cached = False
+            return await plot_entry(entry, options)
+        if options.render_plots:
+            await add_thumbnail(entry, options)
+        return True
+
     # Check if we should skip execution (no command.sh)
     if entry.skip_execution:
         logger.info("  Skipping execution (no command.sh)")
         logger.info("  Validating existing logs...")
 
-        # Validate that logs exist
-        info_files = list(entry.path.glob(".duct/*info.json"))
-        if not info_files:
-            logger.warning(f"Warning: Entry '{entry.name}' skipped - command.sh absent but info.json missing")
-            return False
-
-        # Read usage.json path from info.json
-        try:
-            info_data = json.loads(info_files[0].read_text())
-            usage_path = info_data.get("output_paths", {}).get("usage")
-            if usage_path:
-                entry.usage_json = entry.path / usage_path
-            else:
-                logger.warning(f"Warning: Entry '{entry.name}' skipped - command.sh absent but usage path not in info.json")
-                return False
-        except Exception as e:
-            logger.warning(f"Warning: Entry '{entry.name}' skipped - command.sh absent but failed to parse info.json: {e}")
-            return False
-
-        # Validate usage.json exists
-        if not entry.usage_json.exists():
-            logger.warning(f"Warning: Entry '{entry.name}' skipped - command.sh absent but usage.json missing at {entry.usage_json}")
+        # Validate that logs exist and match the supported duct schema
+        with span("parse", entry.name):
+            loaded = await load_archived_run(entry)
+        if not loaded:
             return False
 
         # Read command text from existing logs if available, otherwise empty
-        if entry.command_script.exists():
+        if entry.has_command_script:
             entry.command_text = read_command_text(entry.command_script)
         else:
             entry.command_text = "# Command not available (skip execution mode)"
 
     else:
         # Execute mode: run setup.sh and command.sh
-        # Run setup.sh
-        logger.info("  Running setup.sh...")
-        success, stdout, stderr = execute_script(entry.setup_script, entry.path)
-        if not success:
-            logger.warning(f"Warning: Entry '{entry.name}' skipped - setup.sh failed with exit code 1")
+        timeout = entry.metadata.get(TIMEOUT_KEY, options.timeout)
+        log_dir = entry.path / "logs"
+
+        command_result = None
+        if options.remote is not None:
+            # Run setup.sh and command.sh on a worker host; outputs are copied back
+            with span("remote", entry.name):
+                results = await options.remote.run_entry(entry, timeout)
+            if results is None:
+                return False
+            result, command_result = results
+        else:
+            # Run setup.sh
+            logger.info("  Running setup.sh...")
+            with span("setup", entry.name):
+                result = await execute_script_async(entry.setup_script, entry.path, log_dir, timeout)
+        if result.timed_out:
+            logger.warning(f"Warning: Entry '{entry.name}' skipped - setup.sh timed out after {timeout}s")
             return False
-
-        # Run command.sh
-        logger.info("  Running command.sh...")
-        success, stdout, stderr = execute_script(entry.command_script, entry.path)
-        if not success:
-            logger.warning(f"Warning: Entry '{entry.name}' skipped - command.sh failed")
+        if not result.success:
+            logger.warning(f"Warning: Entry '{entry.name}' skipped - setup.sh failed with exit code {result.returncode}"
+                           f" (see {result.stderr_path})")
             return False
 
+        # Run command.sh (several times in benchmark mode)
+        if options.benchmarking:
+            with span("command", entry.name):
+                entry.benchmark = await run_repeats(entry, options.repeat, options.warmup, log_dir, timeout)
+            if entry.benchmark is None:
+                return False
+        else:
+            if command_result is not None:
+                result = command_result
+            else:
+                logger.info("  Running command.sh...")
+                with span("command", entry.name):
+                    result = await execute_script_async(entry.command_script, entry.path, log_dir, timeout)
+            if result.timed_out:
+                logger.warning(f"Warning: Entry '{entry.name}' skipped - command.sh timed out after {timeout}s")
+                return False
+            if not result.success:
+                logger.warning(f"Warning: Entry '{entry.name}' skipped - command.sh failed (see {result.stderr_path})")
+                return False
+
         # Read command text for display
         entry.command_text = read_command_text(entry.command_script)
 
-        # Find usage.json - duct creates files with prefix, need to find actual file
-        # Look for info.json to get the correct path
-        info_files = list(entry.path.glob(".duct/*info.json"))
-        if not info_files:
-            logger.warning(f"Warning: Entry '{entry.name}' skipped - no duct info.json found")
-            return False
+        with span("parse", entry.name):
+            # Find usage.json - duct creates files with prefix, need to find actual file
+            # Look for info.json to get the correct path
+            # In benchmark mode the last repeat is rendered
+            info_files = entry.benchmark.info_paths[-1:] if entry.benchmark else entry.info_files(refresh=True)
+            if not info_files:
+                logger.warning(f"Warning: Entry '{entry.name}' skipped - no duct info.json found")
+                return False
 
-        try:
-            info_data = json.loads(info_files[0].read_text())
-            usage_path = info_data.get("output_paths", {}).get("usage")
-            if usage_path:
-                entry.usage_json = entry.path / usage_path
-            else:
-                logger.warning(f"Warning: Entry '{entry.name}' skipped - usage path not in info.json")
+            try:
+                info_data = json.loads(info_files[0].read_text())
+                usage_path = info_data.get("output_paths", {}).get("usage")
+                if usage_path:
+                    entry.info_json = info_files[0]
+                    entry.run_info = info_data
+                    entry.usage_json = entry.path / usage_path
+                else:
+                    logger.warning(f"Warning: Entry '{entry.name}' skipped - usage path not in info.json")
+                    return False
+            except Exception as e:
+                logger.warning(f"Warning: Entry '{entry.name}' skipped - failed to parse info.json: {e}")
                 return False
-        except Exception as e:
-            logger.warning(f"Warning: Entry '{entry.name}' skipped - failed to parse info.json: {e}")
-            return False
 
-        if not entry.usage_json.exists():
-            logger.warning(f"Warning: Entry '{entry.name}' skipped - usage.json not found at {entry.usage_json}")
-            return False
+            if not entry.usage_json.exists():
+                logger.warning(f"Warning: Entry '{entry.name}' skipped - usage.json not found at {entry.usage_json}")
+                return False
+
+    await add_process_breakdown(entry, options)
+
+    # HTML output draws plots client-side from the usage file
+    if not options.render_plots:
+        with span("cache", entry.name):
+            write_manifest(entry)
+        return True
+
+    return await plot_entry(entry, options)
+
 
-    # Generate plot (both modes)
+async def plot_entry(entry, options):
+    """Render the plot (and thumbnail, overlay) of a processed entry and record it in the manifest."""
     logger.info("  Generating plot...")
     plots_dir = entry.path / "plots"
-    entry.plot_path = generate_plot(entry.usage_json, plots_dir)
+    with span("plot", entry.name):
+        if options.plot_pool is not None:
+            entry.plot_path = await options.plot_pool.generate(entry.usage_json, plots_dir, options.plot_settings)
+        else:
+            entry.plot_path = await asyncio.to_thread(
+                generate_plot, entry.usage_json, plots_dir, options.plot_settings
+            )
     if not entry.plot_path:
         logger.warning(f"Warning: Entry '{entry.name}' skipped - plot generation failed")
         return False
 
+    await add_thumbnail(entry, options)
+
+    if entry.benchmark and options.overlay_repeats:
+        with span("overlay", entry.name):
+            await asyncio.to_thread(render_repeat_overlay, entry, plots_dir, options.plot_settings)
+
+    with span("cache", entry.name):
+        write_manifest(entry, options.plot_settings)
     return True
 
 
-def main():
-    """Main entry point for con-duct-gallery CLI."""
-    parser = argparse.ArgumentParser(description="Generate gallery markdown from duct executions")
-    parser.add_argument("--gallery-dir", type=Path, default=Path("./gallery"), help="Gallery directory to scan")
+async def add_thumbnail(entry, options):
+    """Create or refresh the thumbnail of the entry's plot if thumbnails are enabled."""
+    if not options.thumbnail_width or not entry.plot_path:
+        return
+    with span("thumbnail", entry.name):
+        entry.thumbnail_path = await asyncio.to_thread(ensure_thumbnail, entry.plot_path, options.thumbnail_width)
 
-    args = parser.parse_args()
 
+async def add_process_breakdown(entry, options):
+    """Compute the entry's top processes; a failure only leaves the process table out."""
+    if not options.top_processes or not entry.usage_json:
+        return
+    with span("processes", entry.name):
+        try:
+            entry.processes = await asyncio.to_thread(load_breakdown, entry, options.top_processes)
+        except ImportError as e:
+            logger.debug(f"Process breakdown unavailable ({e})")
+        except (OSError, KeyError, ValueError) as e:
+            logger.warning(f"Warning: Could not break down processes of entry '{entry.name}': {e}")
+
+
+def render_repeat_overlay(entry, plots_dir, plot_settings):
+    """Overlay the usage of every measured repeat in plots/repeats.png."""
+    engine = get_engine()
+    if engine is None:
+        logger.warning(f"Warning: Entry '{entry.name}' repeat overlay needs in-process plotting, skipped")
+        return
+    usage_files = entry.benchmark.usage_files()
+    overlay_path = plots_dir / "repeats.png"
+    try:
+        engine.render_overlay(
+            [(f"run {i + 1}", usage) for i, usage in enumerate(usage_files)], overlay_path, plot_settings
+        )
+    except Exception as e:
+        logger.warning(f"Warning: Entry '{entry.name}' repeat overlay failed: {e}")
+        return
+    entry.benchmark.overlay_path = overlay_path
+    logger.info(f"Generated plot: {overlay_path}")
+
+
+def make_build_options(args, workers=()) -> BuildOptions:
+    """Processing options for the parsed command-line arguments."""
+    return BuildOptions(
+        use_cache=not args.no_cache,
+        plot_settings=PlotSettings(engine=args.plot_engine, max_points=args.plot_points, downsample=args.downsample),
+        timeout=args.timeout,
+        repeat=args.repeat,
+        warmup=args.warmup,
+        overlay_repeats=args.overlay_repeats,
+        plot_pool=PlotPool(args.plot_workers) if args.plot_workers > 1 else None,
+        render_plots=args.format == "markdown",
+        thumbnail_width=args.thumbnail_width,
+        top_processes=args.top_processes,
+        remote=RemoteExecutor(workers, args.remote_dir, args.worker_command) if workers else None,
+    )
+
+
+def pack_plan(args, entries, run_index):
+    """Expected footprints of entries and the host capacity, or (None, None) without --pack."""
+    if not args.pack:
+        return None, None
+    history = {row["entry"]: row for row in run_index.latest_runs()} if run_index is not None else {}
+    host = Capacity.of_host()
+    capacity = Capacity(args.cpu_total or host.cpu_total, args.memory_total or host.memory_total)
+    return [estimate_footprint(entry, history) for entry in entries], capacity
+
+
+def finish_entry(entry, run_index, baseline, thresholds, noise_floors) -> int:
+    """
+    Record a successfully processed entry in the run index and compare it to the baseline.
+
+    Returns:
+        1 if the entry regressed, else 0
+    """
+    # Record as soon as the entry finishes so history survives a crash later in the run
+    if run_index is not None:
+        run_index.record_entry(entry)
+    if baseline is None:
+        return 0
+    return detect_regressions([entry], baseline, thresholds, noise_floors)
+
+
+def render_gallery(args, options, entries, output_path, writer=None, changed=None):
+    """
+    Render comparison plots and write the gallery in the selected output format.
+
+    Args:
+        args: Parsed command-line arguments
+        options: Processing options
+        entries: Successfully processed entries, in discovery order
+        output_path: README.md path
+        writer: MarkdownWriter the entry sections were streamed to (single README.md only)
+        changed: Names of the entries rebuilt since the last render (None: all); comparisons
+            without a changed member keep their existing plot
+    """
+    # Overlay plots of the comparison groups declared in the gallery
+    appendix = ""
+    if options.render_plots:
+        with span("comparisons"):
+            comparisons = render_comparisons(
+                load_comparisons(args.gallery_dir, entries), output_path.parent, options.plot_settings, changed
+            )
+            appendix = render_comparison_section(comparisons, output_path)
+    elif (args.gallery_dir / COMPARISONS_FILE).exists():
+        logger.warning(f"Warning: {COMPARISONS_FILE} is only rendered in markdown output, skipped")
+
+    with span("render"):
+        if args.format == "html":
+            write_html(entries, output_path.parent / HTML_DIR, options.plot_settings, args.summary_sort)
+            return
+        if args.page_size:
+            write_pages(entries, output_path, args.page_size, args.group_by, args.summary_sort, appendix)
+        else:
+            if writer is None:
+                writer = MarkdownWriter(output_path, entries, args.summary_sort)
+                for entry in entries:
+                    writer.add(entry, True)
+            # Replace README.md with the streamed document
+            writer.append(appendix)
+            writer.commit()
+    logger.info(f"Generated markdown: {output_path} ({len(entries)} entries)")
+
+
+def build_gallery(args, baseline, thresholds, noise_floors, workers=()):
+    """Discover, process and render the gallery as configured by the parsed arguments."""
     # Output always goes to README.md in current directory
     output_path = Path("README.md")
 
@@ -138,7 +376,8 @@ def main():
 
     # Discover entries
     logger.info(f"Scanning gallery directory: {args.gallery_dir}")
-    entries = discover_entries(args.gallery_dir)
+    with span("discovery"):
+        entries = discover_entries(args.gallery_dir)
 
     if not entries:
         logger.error(f"Error: No valid gallery entries found in {args.gallery_dir}")
@@ -147,22 +386,158 @@ def main():
     logger.info(f"Found {len(entries)} entries")
 
     # Process each entry
-    successful_entries = []
-    for entry in entries:
-        if process_entry(entry, output_path):
-            successful_entries.append(entry)
-
-    if not successful_entries:
-        logger.error("Error: No entries were successfully processed")
+    options = make_build_options(args, workers)
+    # With workers, keep every worker slot busy
+    jobs = max(args.jobs, options.remote.slots) if options.remote else args.jobs
+    run_index = None if args.no_index else open_index(args.index or default_index_path(args.gallery_dir))
+
+    # Pack concurrent entries by their expected CPU and memory use
+    footprints, capacity = pack_plan(args, entries, run_index)
+
+    # A single README.md is streamed as entries finish; pages are written at the end
+    streaming = args.format == "markdown" and not args.page_size
+    writer = MarkdownWriter(output_path, entries, args.summary_sort) if streaming else None
+    regressed = 0
+
+    async def worker(entry):
+        nonlocal regressed
+        ok = await process_entry_async(entry, output_path, options)
+        if ok:
+            regressed += finish_entry(entry, run_index, baseline, thresholds, noise_floors)
+        if writer is not None:
+            writer.add(entry, ok)
+        return ok
+
+    with writer or nullcontext():
+        try:
+            with span("process"):
+                results = run_entries(entries, worker, jobs, footprints, capacity)
+        finally:
+            if run_index is not None:
+                run_index.close()
+            if options.plot_pool is not None:
+                options.plot_pool.close()
+        successful_entries = [entry for entry, ok in zip(entries, results) if ok]
+
+        if not successful_entries:
+            logger.error("Error: No entries were successfully processed")
+            sys.exit(1)
+
+        if args.save_baseline:
+            save_baseline(successful_entries, args.save_baseline)
+
+        render_gallery(args, options, successful_entries, output_path, writer)
+
+    if regressed:
+        logger.error(f"Error: {regressed} entries regressed against baseline {args.compare_to}")
+        sys.exit(EXIT_REGRESSION)
+
+
+def changed_entries(gallery_dir: Path, changes) -> Dict[str, Optional[GalleryEntry]]:
+    """
+    Entries to rebuild for a burst of watched changes.
+
+    .duct/ is an output of execute-mode entries and only an input when
+    skipping execution, so an execute-mode entry whose only changes are in
+    .duct/ is not rebuilt, whether or not its last run succeeded (its own
+    run would otherwise trigger the next one).
+
+    Args:
+        gallery_dir: Gallery directory
+        changes: (entry name, relative path) pairs reported by the watcher
+
+    Returns:
+        Newly discovered entry by name, or None for entries that were
+        removed or are no longer valid
+    """
+    changed_paths: Dict[str, Set[str]] = {}
+    for name, relpath in changes:
+        changed_paths.setdefault(name, set()).add(relpath)
+    entries = {}
+    for name, relpaths in changed_paths.items():
+        entry_dir = gallery_dir / name
+        entry = discover_entry(entry_dir) if entry_dir.is_dir() else None
+        outputs_only = all(relpath.startswith(DUCT_DIR) for relpath in relpaths)
+        if entry is not None and outputs_only and not entry.skip_execution:
+            continue
+        entries[name] = entry
+    return entries
+
+
+def watch_gallery(args, baseline, thresholds, noise_floors, workers=()):
+    """
+    Build the gallery, then rebuild the entries whose files change until interrupted.
+
+    Only entries whose setup.sh, command.sh or metadata.json changed (or, for
+    skip-execution entries, their .duct/ files) are processed again; the
+    sections of all other entries are reused from their cached fragments and
+    spliced into the rewritten output.
+    """
+    output_path = Path("README.md")
+    if not validate_output_path(output_path):
         sys.exit(1)
 
-    # Generate markdown
-    markdown_content = render_markdown(successful_entries, output_path)
-
-    # Write output
-    output_path.write_text(markdown_content)
-    logger.info(f"Generated markdown: {output_path} ({len(successful_entries)} entries)")
+    watcher = open_watcher(args.gallery_dir, polling=args.poll)
+    options = make_build_options(args, workers)
+    jobs = max(args.jobs, options.remote.slots) if options.remote else args.jobs
+    run_index = None if args.no_index else open_index(args.index or default_index_path(args.gallery_dir))
+    entries = {}
+
+    async def worker(entry):
+        ok = await process_entry_async(entry, output_path, options)
+        if ok:
+            finish_entry(entry, run_index, baseline, thresholds, noise_floors)
+        return ok
+
+    def rebuild(batch, changed):
+        footprints, capacity = pack_plan(args, batch, run_index)
+        with span("process"):
+            results = run_entries(batch, worker, jobs, footprints, capacity)
+        for entry, ok in zip(batch, results):
+            if ok:
+                entries[entry.name] = entry
+            else:
+                entries.pop(entry.name, None)
+        successful = [entries[name] for name in sorted(entries)]
+        if not successful:
+            logger.error("Error: No entries were successfully processed")
+            return
+        render_gallery(args, options, successful, output_path, changed=changed)
+        # Their fragments are current now, so later renders reuse them
+        for entry in successful:
+            entry.cached = True
+
+    try:
+        logger.info(f"Scanning gallery directory: {args.gallery_dir}")
+        with span("discovery"):
+            rebuild(discover_entries(args.gallery_dir), None)
+        logger.info(f"Watching {args.gallery_dir} for changes (Ctrl-C to stop)")
+        while True:
+            changes = watcher.wait(args.debounce)
+            started = time.perf_counter()
+            changed = changed_entries(args.gallery_dir, changes)
+            batch = []
+            for name, entry in sorted(changed.items()):
+                if entry is None:
+                    if entries.pop(name, None) is not None:
+                        logger.info(f"Removed entry: {name}")
+                    continue
+                batch.append(entry)
+            if not changed:
+                continue
+            rebuild(batch, set(changed))
+            logger.info(f"Rebuilt {len(batch)} entries in {time.perf_counter() - started:.2f}s, watching for changes")
+    except KeyboardInterrupt:
+        logger.info("Stopped watching")
+    finally:
+        watcher.close()
+        if run_index is not None:
+            run_index.close()
+        if options.plot_pool is not None:
+            options.plot_pool.close()
 
 
 if __name__ == "__main__":
+    from src.cli import main
+
     main()
@@ -0,0 +1,115 @@
+"""Storage of generated plot images: lossless recompression, deduplication and thumbnails."""
+import hashlib
+import io
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_SUFFIX = ".thumb.png"
+
+
+def thumbnail_path(plot_path: Path) -> Path:
+    """Location of a plot's thumbnail: plots/usage.png -> plots/usage.thumb.png."""
+    return plot_path.with_name(plot_path.stem + THUMBNAIL_SUFFIX)
+
+
+def optimize_png(data: bytes) -> bytes:
+    """
+    Losslessly recompress a PNG, keeping the smaller of the two encodings.
+
+    The pixels are re-encoded with zlib's best compression and adaptive
+    filtering; ancillary text chunks (e.g. the "Software" tag) are dropped.
+    Returns data unchanged if Pillow is not installed.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        return data
+    with Image.open(io.BytesIO(data)) as image:
+        out = io.BytesIO()
+        image.save(out, format="PNG", optimize=True)
+    optimized = out.getvalue()
+    return optimized if len(optimized) < len(data) else data
+
+
+def write_if_changed(path: Path, data: bytes) -> bool:
+    """
+    Atomically write data to path unless the file already holds exactly these bytes.
+
+    Leaving identical files untouched keeps their mtime, so version control
+    (git/datalad) and mtime-based caches see no change.
+
+    Returns:
+        True if the file was written
+    """
+    try:
+        if path.stat().st_size == len(data):
+            with open(path, "rb") as f:
+                if hashlib.sha256(f.read()).digest() == hashlib.sha256(data).digest():
+                    return False
+    except FileNotFoundError:
+        pass
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return True
+
+
+def store_png(path: Path, data: bytes) -> bool:
+    """
+    Recompress a rendered PNG and write it unless the stored image is identical.
+
+    Returns:
+        True if the file was written
+    """
+    written = write_if_changed(path, optimize_png(data))
+    if not written:
+        logger.debug(f"Unchanged image, not rewritten: {path}")
+    return written
+
+
+def ensure_thumbnail(plot_path: Path, width: int) -> Optional[Path]:
+    """
+    Create or refresh the thumbnail of a plot, width pixels wide.
+
+    The thumbnail is only regenerated if it is missing, older than the plot
+    or of a different width.
+
+    Returns:
+        Path of the thumbnail, or None if it cannot be made (e.g. no Pillow)
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        logger.warning("Warning: Thumbnails need Pillow, skipped")
+        return None
+    thumb = thumbnail_path(plot_path)
+    try:
+        if thumb.stat().st_mtime_ns >= plot_path.stat().st_mtime_ns:
+            with Image.open(thumb) as image:
+                if image.width == width:
+                    return thumb
+    except OSError:
+        pass
+    try:
+        with Image.open(plot_path) as image:
+            height = max(1, round(image.height * width / image.width))
+            out = io.BytesIO()
+            image.resize((width, height), Image.Resampling.LANCZOS).save(out, format="PNG", optimize=True)
+        write_if_changed(thumb, out.getvalue())
+    except OSError as e:
+        logger.warning(f"Warning: Could not create thumbnail of {plot_path}: {e}")
+        return None
+    # Mark it current even when the bytes did not change
+    os.utime(thumb)
+    return thumb
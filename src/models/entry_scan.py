@@ -0,0 +1,97 @@
+"""Directory snapshot of a gallery entry."""
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+DUCT_DIR = ".duct"
+
+
+@dataclass(slots=True)
+class EntryScan:
+    """
+    Files of one entry directory, listed with a single os.scandir pass.
+
+    Holds the directory entries of the entry's top-level files and of the
+    files in its .duct/ directory, so existence checks do not need a
+    filesystem round trip each (expensive on NFS/Lustre). Files are only
+    stat'ed when their stat is first asked for (os.DirEntry caches it), so
+    discovery itself does not stat every file.
+    """
+
+    path: Path
+    files: Dict[str, os.DirEntry] = field(default_factory=dict)
+    duct_files: Dict[str, os.DirEntry] = field(default_factory=dict)
+
+    @classmethod
+    def scan(cls, entry_dir: Path) -> "EntryScan":
+        """
+        List entry_dir (and its .duct/ directory if present).
+
+        Raises:
+            OSError: If entry_dir cannot be listed
+        """
+        snapshot = cls(entry_dir)
+        has_duct_dir = False
+        with os.scandir(entry_dir) as it:
+            for item in it:
+                if item.is_file():
+                    snapshot.files[item.name] = item
+                elif item.name == DUCT_DIR and item.is_dir():
+                    has_duct_dir = True
+        if has_duct_dir:
+            snapshot.rescan_duct()
+        return snapshot
+
+    def rescan_duct(self) -> None:
+        """Refresh the .duct/ listing, e.g. after command.sh produced new logs."""
+        self.duct_files = {}
+        try:
+            with os.scandir(self.path / DUCT_DIR) as it:
+                for item in it:
+                    if item.is_file():
+                        self.duct_files[item.name] = item
+        except FileNotFoundError:
+            pass
+
+    def has_file(self, name: str) -> bool:
+        """True if name is a regular file at the top of the entry directory."""
+        return name in self.files
+
+    def info_files(self) -> List[Path]:
+        """Duct info files (.duct/*info.json), sorted by name."""
+        return [self.path / DUCT_DIR / name for name in sorted(self.duct_files) if name.endswith("info.json")]
+
+    def usage_candidates(self) -> List[Path]:
+        """Usage files matching the prefix of each info file (<prefix>usage.json[l])."""
+        candidates = []
+        for info in self.info_files():
+            prefix = info.name[: -len("info.json")]
+            for suffix in ("usage.jsonl", "usage.json"):
+                if prefix + suffix in self.duct_files:
+                    candidates.append(info.parent / (prefix + suffix))
+        return candidates
+
+    def stat(self, relpath: str) -> Optional[os.stat_result]:
+        """
+        Cached stat of a file relative to the entry directory, taken on first use.
+
+        Returns:
+            The stat result, or None if the file is known not to exist
+
+        Raises:
+            KeyError: If relpath lies outside the scanned directories
+        """
+        parts = Path(relpath).parts
+        if len(parts) == 1:
+            item = self.files.get(parts[0])
+        elif len(parts) == 2 and parts[0] == DUCT_DIR:
+            item = self.duct_files.get(parts[1])
+        else:
+            raise KeyError(relpath)
+        if item is None:
+            return None
+        try:
+            return item.stat()
+        except FileNotFoundError:
+            return None
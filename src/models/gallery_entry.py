@@ -1,7 +1,22 @@
 """Gallery entry model."""
-from dataclasses import dataclass
+import json
+import logging
+import math
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, List, Optional
+
+from src.models.entry_scan import EntryScan
+
+if TYPE_CHECKING:
+    from src.benchmark import BenchmarkResult
+    from src.process_stats import ProcessBreakdown
+
+logger = logging.getLogger(__name__)
+
+METADATA_FILE = "metadata.json"
+# metadata.json key overriding the script timeout, in seconds
+TIMEOUT_KEY = "timeout"
 
 
 @dataclass
@@ -13,27 +28,56 @@ class GalleryEntry:
     setup_script: Path
     command_script: Path
     command_text: str = ""
+    info_json: Optional[Path] = None
+    run_info: Optional[dict] = None
     usage_json: Optional[Path] = None
     plot_path: Optional[Path] = None
+    # Smaller copy of the plot shown in the markdown, linking to plot_path
+    thumbnail_path: Optional[Path] = None
+    # True when the outputs were restored from the incremental cache
+    cached: bool = False
     metadata: dict = None
+    regressions: list = field(default_factory=list)
+    benchmark: Optional["BenchmarkResult"] = None
+    # Top processes of the run, shown next to the plot
+    processes: Optional["ProcessBreakdown"] = None
+    scan: Optional[EntryScan] = None
 
     def __post_init__(self):
         if self.metadata is None:
             self.metadata = {}
 
     @classmethod
-    def from_directory(cls, entry_dir: Path) -> "GalleryEntry":
-        """Create a GalleryEntry from a directory path."""
+    def from_directory(cls, entry_dir: Path, scan: Optional[EntryScan] = None) -> "GalleryEntry":
+        """
+        Create a GalleryEntry from a directory path.
+
+        With a scan, file checks are answered from the snapshot instead of
+        touching the filesystem again.
+        """
+        if scan is None or scan.has_file(METADATA_FILE):
+            metadata = load_metadata(entry_dir)
+        else:
+            metadata = {}
         return cls(
             name=entry_dir.name,
             path=entry_dir,
             setup_script=entry_dir / "setup.sh",
             command_script=entry_dir / "command.sh",
+            metadata=metadata,
+            scan=scan,
         )
 
+    def _has_file(self, path: Path) -> bool:
+        if self.scan is not None:
+            return self.scan.has_file(path.name)
+        return path.is_file()
+
     @property
     def has_command_script(self) -> bool:
         """Returns True if command.sh exists in entry directory."""
+        if self.scan is not None:
+            return self.scan.has_file(self.command_script.name)
         return self.command_script.exists()
 
     @property
@@ -43,10 +87,57 @@ class GalleryEntry:
 
     def validate(self) -> bool:
         """Validate that required files exist and are executable."""
-        if not self.path.is_dir():
+        if self.scan is None and not self.path.is_dir():
             return False
-        if not self.setup_script.exists() or not self.setup_script.is_file():
+        if not self._has_file(self.setup_script):
             return False
-        if not self.command_script.exists() or not self.command_script.is_file():
+        if not self._has_file(self.command_script):
             return False
         return True
+
+    def info_files(self, refresh: bool = False) -> List[Path]:
+        """
+        Locate duct info files (.duct/*info.json).
+
+        Args:
+            refresh: Re-list .duct/ first, e.g. after command.sh has run
+        """
+        if self.scan is None:
+            return sorted(self.path.glob(".duct/*info.json"))
+        if refresh:
+            self.scan.rescan_duct()
+        return self.scan.info_files()
+
+
+def load_metadata(entry_dir: Path) -> dict:
+    """Read optional per-entry settings from metadata.json (empty if absent or invalid)."""
+    try:
+        metadata = json.loads((entry_dir / METADATA_FILE).read_text())
+    except FileNotFoundError:
+        return {}
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Warning: Ignoring invalid {METADATA_FILE} in {entry_dir.name}: {e}")
+        return {}
+    if not isinstance(metadata, dict):
+        logger.warning(f"Warning: Ignoring {METADATA_FILE} in {entry_dir.name}: expected a JSON object")
+        return {}
+    if TIMEOUT_KEY in metadata:
+        timeout = parse_timeout(metadata[TIMEOUT_KEY])
+        if timeout is None:
+            logger.warning(f"Warning: Ignoring invalid \"{TIMEOUT_KEY}\" in {METADATA_FILE} of {entry_dir.name}: "
+                           f"{metadata[TIMEOUT_KEY]!r} (expected a positive number of seconds)")
+            del metadata[TIMEOUT_KEY]
+        else:
+            metadata[TIMEOUT_KEY] = timeout
+    return metadata
+
+
+def parse_timeout(value) -> Optional[float]:
+    """A timeout in seconds as a positive finite float, or None if value is not one."""
+    if isinstance(value, bool):
+        return None
+    try:
+        timeout = float(value)
+    except (TypeError, ValueError):
+        return None
+    return timeout if math.isfinite(timeout) and timeout > 0 else None
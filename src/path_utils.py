@@ -1,6 +1,8 @@
 """Path resolution utilities."""
 from pathlib import Path
+import hashlib
 import os
+import re
 
 
 def get_relative_path(from_path: Path, to_path: Path) -> str:
@@ -25,3 +27,25 @@ def get_relative_path(from_path: Path, to_path: Path) -> str:
     except ValueError:
         # Paths on different drives on Windows, return absolute
         return str(to_path.resolve())
+
+
+def safe_name(text: str, fallback: str) -> str:
+    """
+    File name (or HTML id) derived from arbitrary text, distinct for distinct texts.
+
+    Runs of unsafe characters become '-'. If that changed the text, a short
+    hash of the original is appended, so e.g. "gpu jobs" and "gpu-jobs" do
+    not share a file.
+
+    Args:
+        text: Name to convert, e.g. an entry, group or comparison name
+        fallback: Base used when nothing of the text is left
+
+    Returns:
+        Name made of letters, digits, '_', '.' and '-'
+    """
+    slug = re.sub(r"[^A-Za-z0-9_.-]+", "-", text).strip("-")
+    if slug == text and slug not in (".", ".."):
+        return slug
+    digest = hashlib.sha256(text.encode()).hexdigest()[:8]
+    return f"{slug or fallback}-{digest}"
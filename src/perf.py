@@ -0,0 +1,298 @@
+"""Benchmark suite for the gallery pipeline, run against synthetic or existing galleries."""
+import argparse
+import json
+import logging
+import platform
+import resource
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+from src.cli import non_negative_int, positive_int
+from src.discovery import discover_entries
+from src.gallery_render import BuildOptions, process_entry_async
+from src.models.gallery_entry import GalleryEntry
+from src.plot_generator import PlotSettings, generate_plot, get_engine
+from src.renderers.markdown import render_markdown
+from src.scheduler import run_entries
+from src.synthetic import generate_gallery
+from src.usage_cache import USAGE_CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+RESULTS_VERSION = 1
+# Pipeline stages, in the order they run; "plot-cached" re-plots with warm usage caches
+STAGES = ("discover", "process", "plot", "plot-cached", "render")
+DEFAULT_RESULTS = Path("perf-results.json")
+
+
+@dataclass
+class StageResult:
+    """Measurements of one pipeline stage."""
+
+    items: int
+    # Wall time of every timed run, in seconds
+    runs: List[float]
+    # Peak Python heap allocated during the stage (None: not measured)
+    peak_memory: Optional[int] = None
+
+    @property
+    def seconds(self) -> float:
+        """Best (lowest) wall time, the least disturbed by other load."""
+        return min(self.runs)
+
+    @property
+    def per_second(self) -> float:
+        return self.items / self.seconds if self.seconds > 0 else float("inf")
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "seconds": self.seconds, "per_second": self.per_second}
+
+
+@contextmanager
+def _quiet() -> Iterator[None]:
+    """Silence the pipeline's per-entry progress messages; warnings still show."""
+    logging.disable(logging.INFO)
+    try:
+        yield
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+def measure(run: Callable[[], int], repeat: int = 3, memory: bool = True,
+            setup: Optional[Callable[[], None]] = None) -> StageResult:
+    """
+    Time a stage and measure its peak memory.
+
+    Memory is measured with tracemalloc in one extra run, so its overhead
+    does not distort the timings.
+
+    Args:
+        run: Runs the stage once, returning the number of items it processed
+        repeat: Number of timed runs
+        memory: Whether to measure peak memory
+        setup: Called untimed before every run, to start each from the same state
+
+    Returns:
+        StageResult of the stage
+    """
+    runs = []
+    items = 0
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        items = run()
+        runs.append(time.perf_counter() - start)
+    peak = None
+    if memory:
+        if setup:
+            setup()
+        tracemalloc.start()
+        try:
+            run()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return StageResult(items, runs, peak)
+
+
+def _max_rss() -> int:
+    """Peak resident set size of this process, in bytes."""
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in kilobytes on Linux, bytes on macOS
+    return usage if sys.platform == "darwin" else usage * 1024
+
+
+def run_suite(gallery_dir: Path, repeat: int = 3, jobs: int = 1, plot_entries: int = 20,
+              memory: bool = True) -> Dict[str, StageResult]:
+    """
+    Measure every pipeline stage on a gallery.
+
+    Stages: discover_entries over the gallery, process_entry_async over all
+    entries (no cache, no plots: validating and fingerprinting the logs),
+    generate_plot over the first plot_entries entries with cold and with warm
+    usage caches, and render_markdown of the whole gallery.
+
+    Args:
+        gallery_dir: Gallery to measure (written to: manifests, plots and caches)
+        repeat: Timed runs per stage
+        jobs: Entries processed concurrently in the process stage
+        plot_entries: Entries plotted in the plot stages (0 to skip plotting)
+        memory: Whether to measure peak memory of each stage
+
+    Returns:
+        Results by stage name, in STAGES order (skipped stages are absent)
+    """
+    output_path = gallery_dir / "README.md"
+    options = BuildOptions(use_cache=False, render_plots=False)
+    results: Dict[str, StageResult] = {}
+    processed: List[GalleryEntry] = []
+
+    def discover() -> int:
+        return len(discover_entries(gallery_dir))
+
+    def reset_entries() -> None:
+        processed[:] = discover_entries(gallery_dir)
+
+    def process() -> int:
+        ok = run_entries(processed, lambda entry: process_entry_async(entry, output_path, options), jobs)
+        return sum(ok)
+
+    with _quiet():
+        results["discover"] = measure(discover, repeat, memory)
+        results["process"] = measure(process, repeat, memory, setup=reset_entries)
+        entries = [entry for entry in processed if entry.usage_json]
+
+        to_plot = entries[:plot_entries]
+        if to_plot and get_engine() is None:
+            logger.warning("Warning: matplotlib unavailable, skipping the plot stages")
+            to_plot = []
+        if to_plot:
+            settings = PlotSettings()
+
+            def plot() -> int:
+                return sum(generate_plot(entry.usage_json, entry.path / "plots", settings) is not None
+                           for entry in to_plot)
+
+            def drop_usage_caches() -> None:
+                for entry in to_plot:
+                    shutil.rmtree(entry.usage_json.parent / USAGE_CACHE_DIR, ignore_errors=True)
+
+            results["plot"] = measure(plot, repeat, memory, setup=drop_usage_caches)
+            results["plot-cached"] = measure(plot, repeat, memory)
+
+        def render() -> int:
+            render_markdown(entries, output_path)
+            return len(entries)
+
+        results["render"] = measure(render, repeat, memory)
+    return results
+
+
+def results_document(results: Dict[str, StageResult], gallery: dict, settings: dict) -> dict:
+    """Results of a suite run with the context needed to compare them later."""
+    return {
+        "version": RESULTS_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "gallery": gallery,
+        "settings": settings,
+        "max_rss": _max_rss(),
+        "stages": {name: result.to_dict() for name, result in results.items()},
+    }
+
+
+def _format_memory(value: Optional[int]) -> str:
+    return "-" if value is None else f"{value / 2 ** 20:.1f} MiB"
+
+
+def format_results(document: dict, previous: Optional[dict] = None) -> str:
+    """
+    Render suite results as a table, optionally with the change against an earlier run.
+
+    Args:
+        document: Results as written by results_document
+        previous: Earlier results to compare with; changes are relative wall
+            times (negative is faster)
+
+    Returns:
+        Table with one row per stage
+    """
+    header = f"{'STAGE':<12} {'ITEMS':>6} {'SECONDS':>9} {'ITEMS/S':>10} {'PEAK MEM':>11}"
+    if previous:
+        header += f" {'CHANGE':>8}"
+    lines = [header]
+    for name, stage in document["stages"].items():
+        line = (f"{name:<12} {stage['items']:>6} {stage['seconds']:>9.4f} {stage['per_second']:>10.1f} "
+                f"{_format_memory(stage['peak_memory']):>11}")
+        if previous:
+            before = previous.get("stages", {}).get(name)
+            if before and before["seconds"] > 0:
+                line += f" {stage['seconds'] / before['seconds'] - 1:>+8.1%}"
+            else:
+                line += f" {'-':>8}"
+        lines.append(line)
+    lines.append(f"max RSS: {_format_memory(document['max_rss'])}")
+    return "\n".join(lines)
+
+
+def main():
+    """Run the benchmark suite from the command line."""
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    parser = argparse.ArgumentParser(
+        description="Measure the con-duct-gallery pipeline stages on a synthetic (or existing) gallery"
+    )
+    parser.add_argument("--gallery-dir", type=Path,
+                        help="Measure this gallery instead of generating one (its outputs are rewritten)")
+    parser.add_argument("--entries", type=positive_int, default=1000,
+                        help="Synthetic entries to generate (default: 1000)")
+    parser.add_argument("--samples", type=positive_int, default=100,
+                        help="Usage reports per synthetic entry (default: 100)")
+    parser.add_argument("--processes", type=positive_int, default=4,
+                        help="Processes per synthetic entry (default: 4)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic gallery (default: 0)")
+    parser.add_argument("--workdir", type=Path,
+                        help="Generate the synthetic gallery here and keep it (default: a temporary directory)")
+    parser.add_argument("--repeat", type=positive_int, default=3,
+                        help="Timed runs per stage; the fastest is reported (default: 3)")
+    parser.add_argument("-j", "--jobs", type=positive_int, default=1,
+                        help="Entries processed concurrently (default: 1)")
+    parser.add_argument("--plot-entries", type=non_negative_int, default=20,
+                        help="Entries plotted in the plot stages, 0 to skip them (default: 20)")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="Do not measure peak memory (saves one traced run per stage)")
+    parser.add_argument("-o", "--output", type=Path, default=DEFAULT_RESULTS,
+                        help=f"Results file to write (default: {DEFAULT_RESULTS})")
+    parser.add_argument("--compare", type=Path, metavar="RESULTS",
+                        help="Earlier results file to compare against")
+    args = parser.parse_args()
+
+    previous = None
+    if args.compare:
+        try:
+            previous = json.loads(args.compare.read_text())
+        except (OSError, json.JSONDecodeError) as e:
+            parser.error(f"cannot read --compare results {args.compare}: {e}")
+
+    settings = {"repeat": args.repeat, "jobs": args.jobs, "plot_entries": args.plot_entries}
+    tmpdir = None
+    if args.gallery_dir:
+        if not args.gallery_dir.is_dir():
+            parser.error(f"gallery directory not found: {args.gallery_dir}")
+        gallery_dir = args.gallery_dir
+        gallery = {"path": str(gallery_dir.resolve())}
+    else:
+        if args.workdir:
+            gallery_dir = args.workdir
+        else:
+            tmpdir = tempfile.TemporaryDirectory(prefix="con-duct-gallery-perf-")
+            gallery_dir = Path(tmpdir.name)
+        gallery = {"entries": args.entries, "samples": args.samples, "processes": args.processes,
+                   "seed": args.seed}
+        start = time.perf_counter()
+        generate_gallery(gallery_dir, args.entries, args.samples, args.processes, args.seed)
+        logger.info(f"Generated {args.entries} entries in {gallery_dir} ({time.perf_counter() - start:.1f}s)")
+
+    try:
+        results = run_suite(gallery_dir, args.repeat, args.jobs, args.plot_entries, not args.no_memory)
+    finally:
+        if tmpdir is not None:
+            tmpdir.cleanup()
+
+    document = results_document(results, gallery, settings)
+    args.output.write_text(json.dumps(document, indent=2) + "\n")
+    print(format_results(document, previous))
+    logger.info(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Dry-run planning: what a build would do with each entry, without doing it."""
+import json
+from dataclasses import dataclass
+from typing import List, Sequence
+
+from src.archive import validate_run_info
+from src.cache import plot_settings_changed, stale_reason
+from src.models.gallery_entry import GalleryEntry
+
+# Actions, in the order they are listed
+ACTIONS = ("execute", "skip", "replot", "cached", "drop")
+
+
+@dataclass(frozen=True)
+class EntryPlan:
+    """What a build would do with one entry, and why."""
+
+    name: str
+    action: str
+    reason: str
+
+
+def _archived_run_problem(entry: GalleryEntry) -> str:
+    """Why the archived run of a skip-execution entry cannot be used ("" if it can)."""
+    info_files = entry.info_files()
+    if not info_files:
+        return "command.sh absent but info.json missing"
+    try:
+        problem = validate_run_info(json.loads(info_files[0].read_text()))
+    except (OSError, json.JSONDecodeError) as e:
+        return f"command.sh absent but info.json unreadable: {e}"
+    return problem or ""
+
+
+def plan_entry(entry: GalleryEntry, use_cache: bool = True, benchmarking: bool = False,
+               need_plot: bool = True, plot_settings=None) -> EntryPlan:
+    """
+    Decide what a build would do with an entry.
+
+    Only reads files: no script runs, nothing is plotted and no cache or
+    output is written.
+
+    Args:
+        entry: Discovered entry
+        use_cache: False for --no-cache
+        benchmarking: Benchmark mode (--repeat/--warmup), which always re-runs command.sh
+        need_plot: Whether the output format needs PNG plots
+        plot_settings: PlotSettings of the build (None: do not compare them)
+
+    Returns:
+        "execute" (run setup.sh and command.sh), "skip" (no command.sh: re-plot
+        the archived run), "replot" (reuse the run, render its plot again),
+        "cached" (reuse the previous outputs) or "drop" (the entry would be
+        left out), with the reason
+    """
+    if entry.has_command_script and benchmarking:
+        return EntryPlan(entry.name, "execute", "benchmark mode always re-measures")
+    if not use_cache:
+        reason = "--no-cache"
+    else:
+        reason = stale_reason(entry, need_plot)
+        if reason is None and need_plot and plot_settings is not None and plot_settings_changed(entry, plot_settings):
+            return EntryPlan(entry.name, "replot", "plot settings changed")
+        if reason is None:
+            return EntryPlan(entry.name, "cached", "inputs unchanged since the last build")
+    if entry.has_command_script:
+        return EntryPlan(entry.name, "execute", reason)
+    problem = _archived_run_problem(entry)
+    if problem:
+        return EntryPlan(entry.name, "drop", problem)
+    return EntryPlan(entry.name, "skip", f"no command.sh, re-plotting archived run ({reason})")
+
+
+def format_plan(plans: Sequence[EntryPlan]) -> str:
+    """Render plans as an aligned table followed by the number of entries per action."""
+    width = max([len("ENTRY")] + [len(plan.name) for plan in plans])
+    lines = [f"{'ACTION':<8} {'ENTRY':<{width}} REASON"]
+    lines += [f"{plan.action:<8} {plan.name:<{width}} {plan.reason}" for plan in plans]
+    counts = [f"{sum(plan.action == action for plan in plans)} {action}" for action in ACTIONS]
+    lines.append(", ".join(counts))
+    return "\n".join(lines)
+
+
+def plan_entries(entries: Sequence[GalleryEntry], use_cache: bool = True, benchmarking: bool = False,
+                 need_plot: bool = True, plot_settings=None) -> List[EntryPlan]:
+    """Plan every entry (see plan_entry)."""
+    return [plan_entry(entry, use_cache, benchmarking, need_plot, plot_settings) for entry in entries]
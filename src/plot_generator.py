@@ -1,30 +1,238 @@
 """Plot generation from duct usage.json files."""
-import subprocess
+import io
 import logging
+import threading
+from array import array
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from src.defaults import DEFAULT_PLOT_POINTS
+from src.images import store_png
+from src.summary import format_bytes
+from src.usage_cache import load_usage
 
 logger = logging.getLogger(__name__)
 
+TIME_AXES = ("elapsed", "relative")
+PCPU_COLOR = "tab:orange"
+RSS_COLOR = "tab:blue"
+
+
+@dataclass(frozen=True)
+class PlotSettings:
+    """How plots are rendered."""
+
+    engine: str = "inprocess"
+    # Upper bound on points per plotted series (in-process engine only)
+    max_points: Optional[int] = DEFAULT_PLOT_POINTS
+    downsample: str = "minmax"
+
 
-def generate_plot(usage_json: Path, output_dir: Path) -> Optional[Path]:
+_engine = None
+_engine_lock = threading.Lock()
+
+
+class PlotEngine:
     """
-    Generate plot from usage.json using con-duct.
+    Render usage plots in-process with a single reusable matplotlib figure.
 
-    Args:
-        usage_json: Path to usage.json file from duct execution
-        output_dir: Directory to save plot
+    matplotlib is imported once when the engine is created; every render
+    clears and redraws the same Agg-backed figure instead of paying for a
+    new interpreter and figure per entry.
+    """
 
-    Returns:
-        Path to generated plot, or None if generation failed
+    def __init__(self):
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        from matplotlib.ticker import FuncFormatter
+
+        from src.downsample import downsample
+
+        self._downsample = downsample
+        self._figure = Figure(figsize=(8, 5), layout="tight")
+        FigureCanvasAgg(self._figure)
+        self._bytes_formatter = FuncFormatter(lambda value, _pos: format_bytes(value))
+        # The figure is shared, so concurrent entries take turns drawing
+        self._lock = threading.Lock()
+
+    def _series(self, x, y, settings: PlotSettings):
+        if settings.max_points is None:
+            return x, y
+        return self._downsample(x, y, settings.max_points, settings.downsample)
+
+    def render(self, usage_json: Path, plot_path: Path, settings: Optional[PlotSettings] = None) -> None:
+        """
+        Render one usage file to plot_path.
+
+        Every series is downsampled to settings.max_points before drawing, so
+        render time stays bounded for long, finely sampled runs. The PNG is
+        recompressed and left untouched if the stored plot is identical.
+
+        Raises:
+            OSError, KeyError, ValueError: If the usage file cannot be read
+        """
+        settings = settings or PlotSettings()
+        usage = load_usage(usage_json)
+        with self._lock:
+            fig = self._figure
+            fig.clear()
+            ax = fig.add_subplot()
+            ax2 = ax.twinx()
+            # Per-pid traces stay faint; the totals carry the signal
+            for pid_series in usage.pids.values():
+                ax.plot(*self._series(pid_series.elapsed, pid_series.values["pcpu"], settings),
+                        color=PCPU_COLOR, linestyle=":", linewidth=0.8, alpha=0.4)
+                ax2.plot(*self._series(pid_series.elapsed, pid_series.values["rss"], settings),
+                         color=RSS_COLOR, linestyle=":", linewidth=0.8, alpha=0.4)
+            pcpu_line, = ax.plot(*self._series(usage.elapsed, usage.totals["pcpu"], settings),
+                                 color=PCPU_COLOR, linewidth=1.5, label="pcpu")
+            rss_line, = ax2.plot(*self._series(usage.elapsed, usage.totals["rss"], settings),
+                                 color=RSS_COLOR, linewidth=1.5, label="rss")
+            ax.set_xlabel("Elapsed Time (s)")
+            ax.set_ylabel("pcpu (%)")
+            ax2.set_ylabel("rss")
+            ax2.yaxis.set_major_formatter(self._bytes_formatter)
+            ax.set_ylim(bottom=0)
+            ax2.set_ylim(bottom=0)
+            ax.legend(handles=[pcpu_line, rss_line], loc="upper left", fontsize=9)
+            ax.set_title("Resource Usage Over Time")
+            png = io.BytesIO()
+            fig.savefig(png, format="png")
+        store_png(plot_path, png.getvalue())
+
+    def render_overlay(
+        self,
+        usage_files: Sequence[Tuple[str, Path]],
+        plot_path: Path,
+        settings: Optional[PlotSettings] = None,
+        time_axis: str = "elapsed",
+        title: str = "Resource Usage Comparison",
+    ) -> None:
+        """
+        Overlay the total pcpu and rss of several usage files on shared axes.
+
+        Args:
+            usage_files: (label, usage_json) pairs, one line each
+            plot_path: Output image path
+            settings: Downsampling settings
+            time_axis: "elapsed" for seconds since each run's start, or
+                "relative" for percent of each run's duration, so runs of
+                different length line up
+            title: Plot title
+
+        Raises:
+            OSError, KeyError, ValueError: If a usage file cannot be read
+        """
+        settings = settings or PlotSettings()
+        usages = [(label, load_usage(usage_json)) for label, usage_json in usage_files]
+        with self._lock:
+            fig = self._figure
+            fig.clear()
+            ax_pcpu, ax_rss = fig.subplots(2, 1, sharex=True)
+            for label, usage in usages:
+                x = usage.elapsed
+                if time_axis == "relative" and len(x) and x[-1] > 0:
+                    x = array("d", (t * 100 / usage.elapsed[-1] for t in usage.elapsed))
+                ax_pcpu.plot(*self._series(x, usage.totals["pcpu"], settings), linewidth=1.2, label=label)
+                ax_rss.plot(*self._series(x, usage.totals["rss"], settings), linewidth=1.2, label=label)
+            ax_pcpu.set_ylabel("pcpu (%)")
+            ax_rss.set_ylabel("rss")
+            ax_rss.yaxis.set_major_formatter(self._bytes_formatter)
+            ax_rss.set_xlabel("Run Progress (%)" if time_axis == "relative" else "Elapsed Time (s)")
+            ax_pcpu.set_ylim(bottom=0)
+            ax_rss.set_ylim(bottom=0)
+            ax_pcpu.legend(loc="upper left", fontsize=8)
+            ax_pcpu.set_title(title)
+            png = io.BytesIO()
+            fig.savefig(png, format="png")
+        store_png(plot_path, png.getvalue())
+
+    def render_batch(
+        self, jobs: Iterable[Tuple[Path, Path]], settings: Optional[PlotSettings] = None
+    ) -> List[Optional[Path]]:
+        """
+        Render several usage files in one call.
+
+        Args:
+            jobs: (usage_json, plot_path) pairs
+            settings: Downsampling settings shared by every job
+
+        Returns:
+            Plot path for each job, or None where rendering failed
+        """
+        results = []
+        for usage_json, plot_path in jobs:
+            try:
+                plot_path.parent.mkdir(parents=True, exist_ok=True)
+                self.render(usage_json, plot_path, settings)
+                results.append(plot_path)
+            except Exception as e:
+                logger.error(f"Plot generation failed for {usage_json}: {e}")
+                results.append(None)
+        return results
+
+
+def get_engine() -> Optional[PlotEngine]:
+    """Return the shared in-process engine, or None if matplotlib is unavailable."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            try:
+                _engine = PlotEngine()
+            except ImportError as e:
+                logger.warning(f"In-process plotting unavailable ({e}), using con-duct plot")
+                _engine = False
+    return _engine or None
+
+
+def _init_plot_worker() -> None:
+    # Workers only report problems; the coordinating process logs progress
+    logging.basicConfig(format='%(message)s')
+    logging.getLogger().setLevel(logging.WARNING)
+
+
+class PlotPool:
     """
-    if not usage_json.exists():
-        logger.error(f"usage.json not found: {usage_json}")
-        return None
+    Render plots in a pool of worker processes.
 
-    # Create output directory
-    output_dir.mkdir(parents=True, exist_ok=True)
-    plot_path = output_dir / "usage.png"
+    Each worker keeps its own PlotEngine, so plots of many entries (e.g. an
+    archive of skip-execution entries) render in parallel instead of taking
+    turns on the single in-process engine.
+    """
+
+    def __init__(self, workers: int):
+        # Process and subprocess machinery is imported on use, keeping the
+        # module cheap to import for its settings (e.g. by --dry-run)
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn"), initializer=_init_plot_worker
+        )
+
+    async def generate(self, usage_json: Path, output_dir: Path, settings: PlotSettings) -> Optional[Path]:
+        """Run generate_plot in a worker process."""
+        import asyncio
+        from concurrent.futures.process import BrokenProcessPool
+
+        loop = asyncio.get_running_loop()
+        try:
+            plot_path = await loop.run_in_executor(self._executor, generate_plot, usage_json, output_dir, settings)
+        except BrokenProcessPool as e:
+            logger.error(f"Plot generation failed: {e}")
+            return None
+        if plot_path:
+            logger.info(f"Generated plot: {plot_path}")
+        return plot_path
+
+    def close(self) -> None:
+        self._executor.shutdown()
+
+
+def _plot_with_con_duct(usage_json: Path, plot_path: Path) -> bool:
+    """Render a plot by running the con-duct plot command."""
+    import subprocess
 
     try:
         # Use con-duct plot command to generate visualization
@@ -36,15 +244,58 @@ def generate_plot(usage_json: Path, output_dir: Path) -> Optional[Path]:
         )
 
         if result.returncode == 0 and plot_path.exists():
-            logger.info(f"Generated plot: {plot_path}")
-            return plot_path
+            return True
         else:
             logger.error(f"con-duct plot failed: {result.stderr}")
-            return None
+            return False
 
     except subprocess.TimeoutExpired:
         logger.error("Plot generation timed out")
-        return None
+        return False
     except Exception as e:
         logger.error(f"Plot generation failed: {e}")
+        return False
+
+
+def generate_plot(usage_json: Path, output_dir: Path, settings: Optional[PlotSettings] = None) -> Optional[Path]:
+    """
+    Generate plot from usage.json.
+
+    Args:
+        usage_json: Path to usage.json file from duct execution
+        output_dir: Directory to save plot
+        settings: Rendering settings. With engine "inprocess" the shared
+            PlotEngine is used (falling back to con-duct if it is unavailable
+            or fails); with "con-duct" the con-duct plot command always runs
+
+    Returns:
+        Path to generated plot, or None if generation failed
+    """
+    if not usage_json.exists():
+        logger.error(f"usage.json not found: {usage_json}")
         return None
+
+    # Create output directory
+    output_dir.mkdir(parents=True, exist_ok=True)
+    plot_path = output_dir / "usage.png"
+
+    settings = settings or PlotSettings()
+    plot_engine = get_engine() if settings.engine == "inprocess" else None
+    if plot_engine is not None:
+        try:
+            plot_engine.render(usage_json, plot_path, settings)
+            logger.info(f"Generated plot: {plot_path}")
+            return plot_path
+        except Exception as e:
+            logger.warning(f"In-process plot failed for {usage_json} ({e}), retrying with con-duct plot")
+
+    # Rendered next to the plot first, so an identical image is not rewritten
+    partial = output_dir / f".{plot_path.stem}.partial.png"
+    try:
+        if not _plot_with_con_duct(usage_json, partial):
+            return None
+        store_png(plot_path, partial.read_bytes())
+    finally:
+        partial.unlink(missing_ok=True)
+    logger.info(f"Generated plot: {plot_path}")
+    return plot_path
@@ -0,0 +1,239 @@
+"""Per-process breakdown of an entry's usage: top consumers and concurrency over time."""
+import json
+import logging
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from src.cache import fingerprint, fragment_path
+from src.defaults import DEFAULT_TOP_PROCESSES
+from src.models.gallery_entry import GalleryEntry
+from src.summary import format_bytes
+from src.usage_cache import load_usage
+
+logger = logging.getLogger(__name__)
+
+# Metrics commands are ranked by; the table shows the top N of each
+RANKINGS = ("cpu_seconds", "peak_pcpu", "rss_seconds", "peak_rss")
+# Time buckets of the concurrency sparkline
+SPARK_BUCKETS = 24
+_SPARKS = "▁▂▃▄▅▆▇█"
+_MAX_CMD = 48
+# Column titles of format_process_row cells
+PROCESS_COLUMNS = ("Procs", "Peak CPU", "CPU time", "Peak RSS", "RSS × time", "Lifetime")
+# Stored breakdown, next to the entry's markdown fragment
+BREAKDOWN_NAME = ".processes.json"
+# Bump when analyze_usage results change
+BREAKDOWN_VERSION = 1
+
+
+@dataclass(frozen=True)
+class ProcessStats:
+    """Resource use of all processes running one command line."""
+
+    cmd: str
+    # Number of processes (pids) that ran the command
+    count: int
+    # Highest combined %CPU of the command's processes in one report
+    peak_pcpu: float
+    # CPU time: %CPU / 100 integrated over time
+    cpu_seconds: float
+    # Highest combined RSS of the command's processes in one report
+    peak_rss: float
+    # RSS integrated over time, in byte-seconds
+    rss_seconds: float
+    # Seconds from the first to the last report the command appeared in
+    lifetime: float
+
+
+@dataclass(frozen=True)
+class ProcessBreakdown:
+    """Top resource consumers of a run and how many processes ran at once."""
+
+    # Commands in the top `limit` of any ranking, by CPU time (largest first)
+    top: List[ProcessStats]
+    processes: int
+    commands: int
+    peak_concurrency: int
+    mean_concurrency: float
+    # Most processes running at once in each of up to SPARK_BUCKETS time buckets
+    concurrency: List[int]
+    limit: int
+
+
+def analyze_usage(usage_json: Path, limit: int = DEFAULT_TOP_PROCESSES) -> ProcessBreakdown:
+    """
+    Break an entry's usage down by process in one vectorized pass over all samples.
+
+    Processes with the same command line (e.g. the workers of a pool) are
+    combined. Each report is taken to cover the interval since the previous
+    report when integrating CPU and memory over time.
+
+    Args:
+        usage_json: duct usage file (read through the columnar usage cache)
+        limit: Commands taken from the top of each ranking
+
+    Returns:
+        ProcessBreakdown of the run
+
+    Raises:
+        ImportError: If numpy is not installed
+        OSError: If the usage file cannot be read
+        KeyError, ValueError: If a record is malformed
+    """
+    import numpy as np
+
+    series = load_usage(usage_json)
+    elapsed = np.asarray(series.elapsed, dtype=np.float64)
+    reports = len(elapsed)
+
+    pid_series = list(series.pids.values())
+    groups = {}
+    group_of_pid = [groups.setdefault(s.cmd, len(groups)) for s in pid_series]
+    lengths = [len(s.ordinal) for s in pid_series]
+    if not pid_series or not sum(lengths):
+        return ProcessBreakdown([], 0, 0, 0, 0.0, [], limit)
+
+    group = np.repeat(np.asarray(group_of_pid, dtype=np.int64), lengths)
+    ordinal = np.concatenate([np.asarray(s.ordinal, dtype=np.int64) for s in pid_series])
+    pcpu = np.concatenate([np.asarray(s.values["pcpu"], dtype=np.float64) for s in pid_series])
+    rss = np.concatenate([np.asarray(s.values["rss"], dtype=np.float64) for s in pid_series])
+    when = elapsed[ordinal]
+
+    # Each report covers the interval since the previous one (the first: the next interval)
+    interval = np.diff(elapsed, prepend=elapsed[0])
+    if reports > 1:
+        interval[0] = interval[1]
+    dt = interval[ordinal]
+
+    n = len(groups)
+    cpu_seconds = np.bincount(group, weights=pcpu * dt / 100, minlength=n)
+    rss_seconds = np.bincount(group, weights=rss * dt, minlength=n)
+    # Combined usage of each command per report, then its peak over the run
+    cells, cell = np.unique(group * reports + ordinal, return_inverse=True)
+    peak_pcpu = np.zeros(n)
+    peak_rss = np.zeros(n)
+    np.maximum.at(peak_pcpu, cells // reports, np.bincount(cell, weights=pcpu))
+    np.maximum.at(peak_rss, cells // reports, np.bincount(cell, weights=rss))
+    first = np.full(n, np.inf)
+    last = np.full(n, -np.inf)
+    np.minimum.at(first, group, when)
+    np.maximum.at(last, group, when)
+    count = np.bincount(np.asarray(group_of_pid, dtype=np.int64), minlength=n)
+
+    ranked = {
+        "cpu_seconds": cpu_seconds, "peak_pcpu": peak_pcpu,
+        "rss_seconds": rss_seconds, "peak_rss": peak_rss,
+    }
+    selected = set()
+    for metric in RANKINGS:
+        selected.update(np.argsort(-ranked[metric], kind="stable")[:limit].tolist())
+    commands = list(groups)
+    top = [
+        ProcessStats(commands[i], int(count[i]), float(peak_pcpu[i]), float(cpu_seconds[i]),
+                     float(peak_rss[i]), float(rss_seconds[i]), float(last[i] - first[i]))
+        for i in sorted(selected, key=lambda i: (-cpu_seconds[i], i))
+    ]
+
+    running = np.bincount(ordinal, minlength=reports)
+    starts = np.linspace(0, reports, min(SPARK_BUCKETS, reports), endpoint=False).astype(np.int64)
+    concurrency = np.maximum.reduceat(running, np.unique(starts)).tolist()
+    return ProcessBreakdown(
+        top=top,
+        processes=len(pid_series),
+        commands=n,
+        peak_concurrency=int(running.max()),
+        mean_concurrency=float(running.mean()),
+        concurrency=concurrency,
+        limit=limit,
+    )
+
+
+def breakdown_path(entry: GalleryEntry) -> Path:
+    """Location of the entry's stored process breakdown."""
+    return fragment_path(entry).with_name(BREAKDOWN_NAME)
+
+
+def load_breakdown(entry: GalleryEntry, limit: int = DEFAULT_TOP_PROCESSES) -> ProcessBreakdown:
+    """
+    analyze_usage for an entry, reusing the stored breakdown while its usage file is unchanged.
+
+    The breakdown is stored with the fingerprint of the usage file and the
+    limit it was computed for, so entries served from the incremental cache
+    do not read their usage again on every build.
+
+    Args:
+        entry: Entry with usage_json set
+        limit: Commands taken from the top of each ranking
+
+    Returns:
+        ProcessBreakdown of the run
+
+    Raises:
+        Same as analyze_usage
+    """
+    path = breakdown_path(entry)
+    try:
+        stored = json.loads(path.read_text())
+    except (OSError, json.JSONDecodeError):
+        stored = None
+    if not isinstance(stored, dict) or stored.get("version") != BREAKDOWN_VERSION:
+        stored = None
+    previous = stored and stored.get("source")
+    source = fingerprint(entry.usage_json, previous)
+    if source is None:
+        raise FileNotFoundError(f"Usage file not found: {entry.usage_json}")
+
+    breakdown = None
+    if previous and source["sha256"] == previous.get("sha256") and stored.get("limit") == limit:
+        breakdown = _from_dict(stored.get("breakdown"))
+        if breakdown is not None and source is previous:
+            return breakdown
+    if breakdown is None:
+        breakdown = analyze_usage(entry.usage_json, limit)
+    try:
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(json.dumps({"version": BREAKDOWN_VERSION, "source": source, "limit": limit,
+                                    "breakdown": asdict(breakdown)}))
+    except OSError as e:
+        logger.debug(f"Could not store process breakdown {path}: {e}")
+    return breakdown
+
+
+def _from_dict(data) -> Optional[ProcessBreakdown]:
+    """Rebuild a stored ProcessBreakdown (None if it does not match the current fields)."""
+    try:
+        return ProcessBreakdown(**{**data, "top": [ProcessStats(**stats) for stats in data["top"]]})
+    except (KeyError, TypeError):
+        return None
+
+
+def sparkline(values: List[int]) -> str:
+    """Render counts as a unicode sparkline scaled to their maximum."""
+    top = max(values, default=0)
+    if top <= 0:
+        return _SPARKS[0] * len(values)
+    return "".join(_SPARKS[round(value / top * (len(_SPARKS) - 1))] for value in values)
+
+
+def short_command(cmd: str) -> str:
+    """Command line shortened for a table cell."""
+    return cmd if len(cmd) <= _MAX_CMD else cmd[:_MAX_CMD - 1] + "…"
+
+
+def format_process_row(stats: ProcessStats) -> List[str]:
+    """Table cells of a command: count, peak CPU, CPU time, peak RSS, RSS over time and lifetime."""
+    return [
+        str(stats.count),
+        f"{stats.peak_pcpu:.1f}%",
+        f"{stats.cpu_seconds:.2f}s",
+        format_bytes(stats.peak_rss),
+        f"{format_bytes(stats.rss_seconds)}·s",
+        f"{stats.lifetime:.2f}s",
+    ]
+
+
+def describe_concurrency(breakdown: ProcessBreakdown) -> str:
+    """One-line summary of the process counts, e.g. "12 processes, 3 commands, up to 4 at once"."""
+    return (f"{breakdown.processes} processes, {breakdown.commands} commands, "
+            f"up to {breakdown.peak_concurrency} at once (mean {breakdown.mean_concurrency:.1f})")
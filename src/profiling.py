@@ -0,0 +1,133 @@
+"""Timing spans for pipeline stages, written as a Chrome trace-event report."""
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Track name of spans that do not belong to an entry (discovery, rendering, ...)
+RUN_TRACK = "gallery"
+
+_profiler = None
+
+
+class Profiler:
+    """
+    Collect timing spans of pipeline stages.
+
+    Spans are grouped into one track per entry (plus a track for run-wide
+    stages) and written in the Chrome trace-event format, which can be
+    opened in chrome://tracing or https://ui.perfetto.dev. Per-stage totals
+    are included under "otherData" for scripted analysis.
+    """
+
+    def __init__(self):
+        self._origin = time.perf_counter()
+        self._events: List[dict] = []
+        self._tracks: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _track(self, name: str) -> int:
+        with self._lock:
+            if name not in self._tracks:
+                self._tracks[name] = len(self._tracks)
+            return self._tracks[name]
+
+    def add_span(self, stage: str, start: float, end: float, entry: Optional[str] = None) -> None:
+        """
+        Record a finished span.
+
+        Args:
+            stage: Stage name (e.g. "setup", "plot")
+            start: time.perf_counter() at the start of the stage
+            end: time.perf_counter() at the end of the stage
+            entry: Entry the stage belongs to, None for run-wide stages
+        """
+        event = {
+            "name": stage,
+            "cat": "entry" if entry else "run",
+            "ph": "X",
+            "ts": round((start - self._origin) * 1e6, 1),
+            "dur": round((end - start) * 1e6, 1),
+            "pid": os.getpid(),
+            "tid": self._track(entry or RUN_TRACK),
+        }
+        if entry:
+            event["args"] = {"entry": entry}
+        with self._lock:
+            self._events.append(event)
+
+    def stage_totals(self) -> Dict[str, dict]:
+        """Number of spans and total/max seconds per stage."""
+        totals: Dict[str, dict] = {}
+        with self._lock:
+            events = list(self._events)
+        for event in events:
+            seconds = event["dur"] / 1e6
+            total = totals.setdefault(event["name"], {"count": 0, "total": 0.0, "max": 0.0})
+            total["count"] += 1
+            total["total"] += seconds
+            total["max"] = max(total["max"], seconds)
+        for total in totals.values():
+            total["total"] = round(total["total"], 6)
+        return totals
+
+    def write(self, path: Path) -> None:
+        """Write the collected spans as a Chrome trace-event JSON file."""
+        with self._lock:
+            events = list(self._events)
+            tracks = dict(self._tracks)
+        names = [
+            {"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid, "args": {"name": name}}
+            for name, tid in tracks.items()
+        ]
+        report = {
+            "traceEvents": names + sorted(events, key=lambda event: event["ts"]),
+            "displayTimeUnit": "ms",
+            "otherData": {"stages": self.stage_totals()},
+        }
+        try:
+            path.write_text(json.dumps(report))
+        except OSError as e:
+            logger.warning(f"Warning: Could not write profile {path}: {e}")
+            return
+        logger.info(f"Wrote profile: {path}")
+
+
+def enable_profiling() -> Profiler:
+    """Start collecting spans for the rest of the run."""
+    global _profiler
+    _profiler = Profiler()
+    return _profiler
+
+
+def disable_profiling() -> None:
+    global _profiler
+    _profiler = None
+
+
+@contextmanager
+def span(stage: str, entry: Optional[str] = None) -> Iterator[None]:
+    """
+    Time a pipeline stage if profiling is enabled (otherwise does nothing).
+
+    Works around awaits as well, so async stages are timed wall-clock.
+
+    Args:
+        stage: Stage name
+        entry: Name of the entry being processed, None for run-wide stages
+    """
+    profiler = _profiler
+    if profiler is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profiler.add_span(stage, start, time.perf_counter(), entry)
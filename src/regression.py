@@ -0,0 +1,166 @@
+"""Performance regression detection against a stored baseline."""
+import json
+import logging
+import statistics
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from src.defaults import DEFAULT_NOISE_FLOORS, DEFAULT_THRESHOLDS
+from src.models.gallery_entry import GalleryEntry
+
+logger = logging.getLogger(__name__)
+
+BASELINE_VERSION = 1
+
+
+@dataclass
+class Regression:
+    """One metric of one entry that got worse than its baseline."""
+
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        """Relative increase over the baseline."""
+        if self.baseline == 0:
+            return float("inf")
+        return (self.current - self.baseline) / self.baseline
+
+
+def format_metric(value: float) -> str:
+    """Format a metric value compactly without switching to exponent notation."""
+    return f"{round(value, 3):.12g}"
+
+
+def entry_metrics(entry: GalleryEntry, metrics: Sequence[str] = tuple(DEFAULT_THRESHOLDS)) -> Dict[str, float]:
+    """
+    Extract the compared execution_summary metrics of a processed entry.
+
+    In benchmark mode (--repeat) each metric is the median over the measured
+    repeats rather than the last repeat's single, noisy value.
+    """
+    if entry.benchmark is not None and entry.benchmark.run_infos:
+        summaries = [info.get("execution_summary") or {} for info in entry.benchmark.run_infos]
+    else:
+        summaries = [(entry.run_info or {}).get("execution_summary") or {}]
+    values = {}
+    for metric in metrics:
+        samples = [summary.get(metric) for summary in summaries]
+        if all(isinstance(s, (int, float)) and not isinstance(s, bool) for s in samples):
+            values[metric] = statistics.median(samples)
+    return values
+
+
+def load_baseline(path: Path) -> Dict[str, Dict[str, float]]:
+    """
+    Read a baseline file written by save_baseline.
+
+    Raises:
+        OSError, ValueError: If the file cannot be read or is not a baseline
+    """
+    data = json.loads(path.read_text())
+    if not isinstance(data, dict) or data.get("version") != BASELINE_VERSION:
+        raise ValueError(f"{path} is not a version {BASELINE_VERSION} baseline file")
+    return data.get("entries", {})
+
+
+def save_baseline(entries: Sequence[GalleryEntry], path: Path) -> None:
+    """Write the metrics of the given entries as a new baseline."""
+    data = {
+        "version": BASELINE_VERSION,
+        "entries": {entry.name: entry_metrics(entry) for entry in entries},
+    }
+    path.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
+    logger.info(f"Saved baseline: {path} ({len(entries)} entries)")
+
+
+def compare(
+    current: Dict[str, float],
+    baseline: Dict[str, float],
+    thresholds: Optional[Dict[str, float]] = None,
+    noise_floors: Optional[Dict[str, float]] = None,
+) -> List[Regression]:
+    """
+    Compare one entry's metrics with its baseline.
+
+    A metric regresses when it grows by more than its relative threshold and
+    by more than its absolute noise floor; only increases are regressions.
+
+    Args:
+        current: Metric values of this run
+        baseline: Metric values of the baseline run
+        thresholds: Relative threshold per metric (defaults to DEFAULT_THRESHOLDS)
+        noise_floors: Absolute tolerance per metric (defaults to DEFAULT_NOISE_FLOORS)
+
+    Returns:
+        Regressions found, in threshold order
+    """
+    thresholds = DEFAULT_THRESHOLDS if thresholds is None else thresholds
+    noise_floors = DEFAULT_NOISE_FLOORS if noise_floors is None else noise_floors
+
+    regressions = []
+    for metric, threshold in thresholds.items():
+        if metric not in current or metric not in baseline:
+            continue
+        old, new = baseline[metric], current[metric]
+        if new - old <= noise_floors.get(metric, 0.0):
+            continue
+        if old > 0 and (new - old) / old <= threshold:
+            continue
+        regressions.append(Regression(metric, old, new))
+    return regressions
+
+
+def detect_regressions(
+    entries: Sequence[GalleryEntry],
+    baseline: Dict[str, Dict[str, float]],
+    thresholds: Optional[Dict[str, float]] = None,
+    noise_floors: Optional[Dict[str, float]] = None,
+) -> int:
+    """
+    Compare every entry against the baseline and attach the results.
+
+    Sets entry.regressions on each entry. Entries absent from the baseline
+    are new and never regress.
+
+    Returns:
+        Number of entries with at least one regression
+    """
+    regressed = 0
+    for entry in entries:
+        if entry.name not in baseline:
+            continue
+        entry.regressions = compare(entry_metrics(entry, thresholds or DEFAULT_THRESHOLDS),
+                                    baseline[entry.name], thresholds, noise_floors)
+        for regression in entry.regressions:
+            logger.warning(
+                f"Regression: Entry '{entry.name}' {regression.metric} "
+                f"{format_metric(regression.baseline)} -> {format_metric(regression.current)} "
+                f"({regression.change:+.0%})"
+            )
+        regressed += bool(entry.regressions)
+    return regressed
+
+
+def parse_metric_values(pairs: Sequence[str], defaults: Dict[str, float]) -> Dict[str, float]:
+    """
+    Parse METRIC=VALUE command line overrides on top of defaults.
+
+    Raises:
+        ValueError: On malformed pairs, non-numeric values or metrics not in defaults
+    """
+    values = dict(defaults)
+    for pair in pairs:
+        metric, sep, value = pair.partition("=")
+        if not sep or not metric:
+            raise ValueError(f"expected METRIC=VALUE, got '{pair}'")
+        if metric not in defaults:
+            raise ValueError(f"unknown metric '{metric}' (choose from: {', '.join(defaults)})")
+        try:
+            values[metric] = float(value)
+        except ValueError:
+            raise ValueError(f"invalid value for {metric}: '{value}'") from None
+    return values
@@ -0,0 +1,252 @@
+"""Distributed execution of gallery entries on worker hosts."""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import shlex
+import shutil
+import tempfile
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, List, Optional, Sequence, Tuple
+
+from src.defaults import DEFAULT_REMOTE_DIR, DEFAULT_TIMEOUT, DEFAULT_WORKER_COMMAND
+from src.executor import ScriptResult, execute_script
+from src.models.gallery_entry import GalleryEntry, parse_timeout
+
+logger = logging.getLogger(__name__)
+
+LOCAL_HOST = "local"
+# Entry outputs produced by the worker and copied back to the coordinator
+RESULT_DIRS = (".duct", "logs")
+# Time allowed on top of the script timeouts for copying and process startup
+TRANSFER_GRACE_PERIOD = 120
+
+
+@dataclass(frozen=True)
+class Worker:
+    """A host running entries, with the number of entries it runs at once."""
+
+    host: str
+    slots: int = 1
+
+    @classmethod
+    def parse(cls, spec: str) -> "Worker":
+        """
+        Parse a worker spec: "local", "[user@]host" or either followed by "*SLOTS".
+
+        Raises:
+            ValueError: If the slot count is not a positive integer
+        """
+        host, _, slots = spec.partition("*")
+        if not host:
+            raise ValueError(f"Invalid worker '{spec}': missing host")
+        if not slots:
+            return cls(host)
+        if not slots.isdigit() or int(slots) < 1:
+            raise ValueError(f"Invalid worker '{spec}': slots must be a positive integer")
+        return cls(host, int(slots))
+
+    def shell(self, command: str) -> List[str]:
+        """Argument vector running a shell command on this worker."""
+        if self.host == LOCAL_HOST:
+            return ["sh", "-c", command]
+        return ["ssh", "-o", "BatchMode=yes", self.host, command]
+
+
+async def _run_pipeline(command: str, timeout: float) -> Tuple[int, str]:
+    """Run a local shell pipeline, returning its exit code and stderr (failing if any stage fails)."""
+    proc = await asyncio.create_subprocess_exec(
+        "bash", "-o", "pipefail", "-c", command, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        _, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        return -1, f"timed out after {timeout}s"
+    return proc.returncode, stderr.decode(errors="replace").strip()
+
+
+class RemoteExecutor:
+    """
+    Run entries' setup.sh and command.sh on worker hosts.
+
+    For each entry a free worker slot is taken, the entry directory (without
+    previous outputs) is copied to a scratch directory on the worker with
+    tar, con-duct-gallery-worker runs the scripts there, and the resulting
+    .duct/ and logs/ directories are copied back into the local entry. Plots
+    and markdown are then produced by the coordinator as usual. Workers need
+    con-duct-gallery (and duct) installed; SSH hosts must accept
+    non-interactive logins.
+    """
+
+    def __init__(
+        self,
+        workers: Sequence[Worker],
+        remote_dir: str = DEFAULT_REMOTE_DIR,
+        worker_command: str = DEFAULT_WORKER_COMMAND,
+    ):
+        self.workers = list(workers)
+        self.remote_dir = remote_dir
+        self.worker_command = worker_command
+        self._free: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def slots(self) -> int:
+        """Total number of entries the workers run at once."""
+        return sum(worker.slots for worker in self.workers)
+
+    @asynccontextmanager
+    async def _slot(self) -> AsyncIterator[Worker]:
+        # Each run_entries() call has its own event loop (e.g. successive --watch rebuilds)
+        loop = asyncio.get_running_loop()
+        if self._free is None or self._loop is not loop:
+            self._loop = loop
+            self._free = asyncio.Queue()
+            for worker in self.workers:
+                for _ in range(worker.slots):
+                    self._free.put_nowait(worker)
+        worker = await self._free.get()
+        try:
+            yield worker
+        finally:
+            self._free.put_nowait(worker)
+
+    async def run_entry(
+        self, entry: GalleryEntry, timeout: Optional[float]
+    ) -> Optional[Tuple[ScriptResult, Optional[ScriptResult]]]:
+        """
+        Run an entry's scripts on the next free worker and fetch its outputs.
+
+        Args:
+            entry: Execute-mode entry
+            timeout: Timeout of each script on the worker (None to wait forever)
+
+        Returns:
+            Results of setup.sh and command.sh (None if setup.sh failed), with
+            log paths inside the local entry; None if the worker could not be
+            reached or the outputs could not be transferred
+        """
+        async with self._slot() as worker:
+            logger.info(f"  Dispatching to worker {worker.host}")
+            scratch = f"{self.remote_dir}/{uuid.uuid4().hex}"
+            try:
+                return await self._run_on(worker, entry, scratch, timeout)
+            finally:
+                await _run_pipeline(shlex.join(worker.shell(f"rm -rf {shlex.quote(scratch)}")), TRANSFER_GRACE_PERIOD)
+
+    async def _run_on(
+        self, worker: Worker, entry: GalleryEntry, scratch: str, timeout: Optional[float]
+    ) -> Optional[Tuple[ScriptResult, Optional[ScriptResult]]]:
+        remote_entry = f"{scratch}/{entry.name}"
+
+        excludes = " ".join(
+            f"--exclude={shlex.quote(f'{entry.name}/{name}')}" for name in (*RESULT_DIRS, "plots")
+        )
+        unpack = shlex.join(worker.shell(f"mkdir -p {shlex.quote(scratch)} && tar -C {shlex.quote(scratch)} -xf -"))
+        push = f"tar -C {shlex.quote(str(entry.path.parent))} {excludes} -cf - {shlex.quote(entry.name)} | {unpack}"
+        code, error = await _run_pipeline(push, TRANSFER_GRACE_PERIOD)
+        if code != 0:
+            logger.warning(f"Warning: Entry '{entry.name}' skipped - could not copy entry to worker {worker.host}: {error}")
+            return None
+
+        run = f"cd {shlex.quote(remote_entry)} && {self.worker_command}"
+        if timeout is not None:
+            # The timeout may come from metadata.json: never pass it through unchecked
+            seconds = parse_timeout(timeout)
+            if seconds is None:
+                logger.warning(f"Warning: Entry '{entry.name}' skipped - invalid timeout {timeout!r}")
+                return None
+            timeout = seconds
+            run += f" --timeout {shlex.quote(str(seconds))}"
+        proc = await asyncio.create_subprocess_exec(
+            *worker.shell(run), stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        limit = None if timeout is None else 2 * timeout + TRANSFER_GRACE_PERIOD
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), limit)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            logger.warning(f"Warning: Entry '{entry.name}' skipped - worker {worker.host} did not finish in {limit}s")
+            return None
+        try:
+            status = json.loads(stdout.decode().strip().splitlines()[-1])
+        except (IndexError, UnicodeDecodeError, json.JSONDecodeError):
+            logger.warning(f"Warning: Entry '{entry.name}' skipped - worker {worker.host} failed: "
+                           f"{stderr.decode(errors='replace').strip()}")
+            return None
+
+        setup, command = (_script_result(entry, status.get(name)) for name in ("setup", "command"))
+        # Previous .duct/ outputs are only replaced by those of a successful run
+        fetched = list(RESULT_DIRS) if command is not None and command.success else ["logs"]
+        # Outputs are extracted next to the previous ones and only swapped in
+        # once the whole transfer succeeded; a missing directory fails tar
+        staging = Path(tempfile.mkdtemp(dir=entry.path, prefix=".fetch-"))
+        try:
+            pack = shlex.join(worker.shell(
+                f"cd {shlex.quote(remote_entry)} && tar -cf - {' '.join(shlex.quote(name) for name in fetched)}"
+            ))
+            code, error = await _run_pipeline(f"{pack} | tar -C {shlex.quote(str(staging))} -xf -",
+                                              TRANSFER_GRACE_PERIOD)
+            if code != 0:
+                logger.warning(f"Warning: Entry '{entry.name}' skipped - could not fetch outputs from worker "
+                               f"{worker.host}: {error}")
+                return None
+            for name in fetched:
+                local = entry.path / name
+                if local.exists():
+                    os.replace(local, staging / f"{name}.previous")
+                os.replace(staging / name, local)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        return setup, command
+
+
+def _script_result(entry: GalleryEntry, status: Optional[dict]) -> Optional[ScriptResult]:
+    """Rebuild a worker's ScriptResult with log paths inside the local entry."""
+    if status is None:
+        return None
+    return ScriptResult(
+        success=status["success"],
+        returncode=status["returncode"],
+        stdout_path=entry.path / status["stdout"],
+        stderr_path=entry.path / status["stderr"],
+        timed_out=status["timed_out"],
+    )
+
+
+def _status(result: ScriptResult, entry_dir: Path) -> dict:
+    return {
+        "success": result.success,
+        "returncode": result.returncode,
+        "stdout": str(result.stdout_path.relative_to(entry_dir)),
+        "stderr": str(result.stderr_path.relative_to(entry_dir)),
+        "timed_out": result.timed_out,
+    }
+
+
+def worker_main():
+    """Run an entry's setup.sh and command.sh on a worker host and report the results as JSON."""
+    parser = argparse.ArgumentParser(description="Run one con-duct-gallery entry (used by the coordinator)")
+    parser.add_argument("entry_dir", type=Path, nargs="?", default=Path("."), help="Entry directory")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Seconds before a script is killed")
+    args = parser.parse_args()
+
+    entry_dir = args.entry_dir.resolve()
+    log_dir = entry_dir / "logs"
+    status = {"setup": None, "command": None}
+    setup = execute_script(entry_dir / "setup.sh", entry_dir, log_dir, args.timeout)
+    status["setup"] = _status(setup, entry_dir)
+    if setup.success:
+        status["command"] = _status(execute_script(entry_dir / "command.sh", entry_dir, log_dir, args.timeout), entry_dir)
+    print(json.dumps(status))
+
+
+if __name__ == "__main__":
+    worker_main()
@@ -0,0 +1,293 @@
+"""Static HTML gallery with lazily loaded, client-side drawn usage plots."""
+import html
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+from src.defaults import SUMMARY_COLUMNS
+from src.models.gallery_entry import GalleryEntry
+from src.path_utils import safe_name
+from src.plot_generator import PlotSettings
+from src.process_stats import PROCESS_COLUMNS, describe_concurrency, format_process_row, short_command, sparkline
+from src.renderers.markdown import atomic_output
+from src.summary import entry_summary, format_summary_value
+from src.usage_cache import load_usage
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = "data"
+SERIES_METRICS = ("pcpu", "rss")
+
+# Loads each entry's series script when its canvas scrolls into view, draws
+# it on the canvas (drag to zoom, double-click to reset) and sorts the
+# summary table by the clicked column. Series files are scripts rather than
+# JSON so the page also works when opened from disk (file:// blocks fetch).
+_SCRIPT = """
+const PAD = 40, COLORS = {pcpu: "#ff7f0e", rss: "#1f77b4"}, pending = {};
+function gallerySeries(id, data) { const canvas = pending[id]; delete pending[id]; if (canvas) attach(canvas, data); }
+function fmt(metric, value) {
+  if (metric === "pcpu") return value.toFixed(1) + "%";
+  const units = ["B", "KB", "MB", "GB", "TB"]; let i = 0;
+  while (Math.abs(value) >= 1024 && i < units.length - 1) { value /= 1024; i++; }
+  return value.toFixed(i ? 1 : 0) + units[i];
+}
+function extent(data) {
+  const ts = SERIES.flatMap(m => data[m].t);
+  return [Math.min(...ts), Math.max(...ts)];
+}
+function draw(canvas, data, view) {
+  const ctx = canvas.getContext("2d"), w = canvas.width, h = canvas.height, span = (view[1] - view[0]) || 1;
+  ctx.clearRect(0, 0, w, h);
+  ctx.font = "11px sans-serif";
+  SERIES.forEach((metric, n) => {
+    const {t, v} = data[metric];
+    const shown = t.map((_, i) => i).filter(i => t[i] >= view[0] && t[i] <= view[1]);
+    const max = Math.max(1e-9, ...shown.map(i => v[i]));
+    ctx.strokeStyle = ctx.fillStyle = COLORS[metric];
+    ctx.beginPath();
+    shown.forEach((i, k) => {
+      const x = PAD + (t[i] - view[0]) / span * (w - 2 * PAD), y = h - PAD - v[i] / max * (h - 2 * PAD);
+      k ? ctx.lineTo(x, y) : ctx.moveTo(x, y);
+    });
+    ctx.stroke();
+    ctx.fillText(`${metric} max ${fmt(metric, max)}`, PAD + n * 140, 14);
+  });
+  ctx.fillStyle = "#333";
+  ctx.fillText(view[0].toFixed(1) + "s", PAD, h - 12);
+  ctx.fillText(view[1].toFixed(1) + "s", w - PAD - 40, h - 12);
+}
+function attach(canvas, data) {
+  let view = extent(data), dragStart = null;
+  canvas.addEventListener("mousedown", e => { dragStart = e.offsetX; });
+  canvas.addEventListener("mouseup", e => {
+    const a = Math.min(dragStart, e.offsetX), b = Math.max(dragStart, e.offsetX);
+    dragStart = null;
+    if (b - a < 5) return;
+    const scale = canvas.width / canvas.clientWidth, span = view[1] - view[0];
+    const toT = x => view[0] + (x * scale - PAD) / (canvas.width - 2 * PAD) * span;
+    view = [toT(a), toT(b)];
+    draw(canvas, data, view);
+  });
+  canvas.addEventListener("dblclick", () => { view = extent(data); draw(canvas, data, view); });
+  draw(canvas, data, view);
+}
+const observer = new IntersectionObserver(items => items.forEach(item => {
+  if (!item.isIntersecting) return;
+  observer.unobserve(item.target);
+  pending[item.target.id] = item.target;
+  const script = document.createElement("script");
+  script.src = item.target.dataset.src;
+  document.body.appendChild(script);
+}), {rootMargin: "300px"});
+document.querySelectorAll("canvas.usage").forEach(canvas => observer.observe(canvas));
+document.querySelectorAll("table.summary th").forEach((th, col) => th.addEventListener("click", () => {
+  const body = th.closest("table").tBodies[0], desc = th.dataset.order !== "desc";
+  th.dataset.order = desc ? "desc" : "asc";
+  [...body.rows].sort((a, b) => {
+    const x = a.cells[col].dataset.value, y = b.cells[col].dataset.value;
+    const cmp = col === 0 ? x.localeCompare(y) : (parseFloat(x) || 0) - (parseFloat(y) || 0);
+    return desc ? -cmp : cmp;
+  }).forEach(row => body.appendChild(row));
+}));
+"""
+
+_STYLE = """
+body { font-family: sans-serif; max-width: 960px; margin: 2em auto; color: #222; }
+pre { background: #f6f8fa; padding: 0.8em; overflow-x: auto; }
+table { border-collapse: collapse; margin: 1em 0; }
+th, td { border: 1px solid #ddd; padding: 0.3em 0.6em; text-align: right; }
+th:first-child, td:first-child { text-align: left; }
+table.summary th { cursor: pointer; }
+canvas.usage { width: 100%; height: 240px; border: 1px solid #eee; }
+table.processes caption { text-align: left; font-weight: bold; }
+.regression { border-left: 4px solid #d73a49; padding-left: 0.8em; }
+"""
+
+
+def _slug(name: str) -> str:
+    return safe_name(name, "entry")
+
+
+def series_payload(usage_json: Path, settings: Optional[PlotSettings] = None) -> Dict[str, Dict[str, list]]:
+    """
+    Compact, downsampled total pcpu and rss series of a usage file.
+
+    Uses the same point budget and downsampling method as the PNG plots
+    (falling back to stride decimation if numpy is missing).
+
+    Returns:
+        {"pcpu": {"t": [...], "v": [...]}, "rss": {...}} with rounded values
+
+    Raises:
+        OSError, KeyError, ValueError: If the usage file cannot be read
+    """
+    settings = settings or PlotSettings()
+    try:
+        import numpy as np
+
+        from src.downsample import downsample
+    except ImportError:
+        downsample = None
+    max_points = settings.max_points
+    if max_points is not None and downsample is not None:
+        # Keep more reports than needed so minmax/lttb pick the points
+        max_points *= 4
+    usage = load_usage(usage_json, max_points=max_points)
+    payload = {}
+    for metric in SERIES_METRICS:
+        t, v = usage.elapsed, usage.totals[metric]
+        if downsample is not None and settings.max_points is not None:
+            t, v = downsample(np.asarray(t), np.asarray(v), settings.max_points, settings.downsample)
+        payload[metric] = {
+            "t": [round(float(x), 2) for x in t],
+            "v": [round(float(y), 1) if metric == "pcpu" else int(y) for y in v],
+        }
+    return payload
+
+
+def _series_header(settings: PlotSettings) -> str:
+    """First line of a series script, recording the settings its points were selected with."""
+    recorded = {"max_points": settings.max_points, "downsample": settings.downsample}
+    return f"// {json.dumps(recorded, sort_keys=True)}\n"
+
+
+def write_series(entry: GalleryEntry, data_dir: Path, settings: Optional[PlotSettings] = None) -> Optional[Path]:
+    """
+    Write an entry's series script (data/<entry>.js).
+
+    An existing script is reused if it is newer than the usage file and was
+    written with the same point budget and downsampling method.
+
+    Returns:
+        Path of the script, or None if the usage file could not be read
+    """
+    settings = settings or PlotSettings()
+    header = _series_header(settings)
+    path = data_dir / f"{_slug(entry.name)}.js"
+    try:
+        if path.stat().st_mtime_ns >= entry.usage_json.stat().st_mtime_ns:
+            with open(path) as f:
+                if f.readline() == header:
+                    return path
+    except FileNotFoundError:
+        pass
+    try:
+        payload = series_payload(entry.usage_json, settings)
+    except (OSError, KeyError, ValueError) as e:
+        logger.warning(f"Warning: Entry '{entry.name}' has no interactive plot - cannot read usage: {e}")
+        return None
+    with atomic_output(path) as out:
+        out.write(header)
+        out.write(f"gallerySeries({json.dumps('plot-' + _slug(entry.name))}, "
+                  f"{json.dumps(payload, separators=(',', ':'))});\n")
+    return path
+
+
+def _summary_table(rows: Sequence[tuple]) -> str:
+    """Sortable summary table: (name, anchor, summary) per entry (anchor may be empty)."""
+    header = "".join(f"<th>{html.escape(title)}</th>" for title in ("Entry", *SUMMARY_COLUMNS.values()))
+    body = []
+    for name, anchor, summary in rows:
+        label = f'<a href="#{anchor}">{html.escape(name)}</a>' if anchor else html.escape(name)
+        cells = [f'<td data-value="{html.escape(name)}">{label}</td>']
+        for metric in SUMMARY_COLUMNS:
+            value = summary.get(metric)
+            cells.append(f'<td data-value="{"" if value is None else value}">'
+                         f"{html.escape(format_summary_value(metric, value))}</td>")
+        body.append(f"<tr>{''.join(cells)}</tr>")
+    return f'<table class="summary"><thead><tr>{header}</tr></thead><tbody>{"".join(body)}</tbody></table>'
+
+
+def _process_table(breakdown) -> str:
+    """Top processes of a run: concurrency summary and one row per command."""
+    header = "".join(f"<th>{html.escape(title)}</th>" for title in ("Command", *PROCESS_COLUMNS))
+    body = "".join(
+        f'<tr><td><code title="{html.escape(stats.cmd)}">{html.escape(short_command(stats.cmd))}</code></td>'
+        + "".join(f"<td>{html.escape(cell)}</td>" for cell in format_process_row(stats)) + "</tr>"
+        for stats in breakdown.top
+    )
+    caption = f"Top processes: {describe_concurrency(breakdown)} {sparkline(breakdown.concurrency)}"
+    return (f'<table class="processes"><caption>{html.escape(caption)}</caption>'
+            f"<thead><tr>{header}</tr></thead><tbody>{body}</tbody></table>")
+
+
+def render_entry_html(entry: GalleryEntry, series_src: Optional[str]) -> str:
+    """
+    Render one entry as an HTML section.
+
+    Args:
+        entry: Processed GalleryEntry
+        series_src: Path of the entry's series script relative to the page, None for no plot
+
+    Returns:
+        HTML string for the entry
+    """
+    anchor = f"entry-{_slug(entry.name)}"
+    parts = [f'<section id="{anchor}"><h2>Entry: {html.escape(entry.name)}</h2>']
+    if entry.regressions:
+        items = "".join(
+            f"<li><code>{html.escape(r.metric)}</code>: {r.baseline:g} → {r.current:g} ({r.change:+.0%})</li>"
+            for r in entry.regressions
+        )
+        parts.append(f'<div class="regression"><strong>⚠ Performance regression</strong><ul>{items}</ul></div>')
+    if entry.command_text:
+        parts.append(f"<pre><code>{html.escape(entry.command_text)}</code></pre>")
+    summary = entry_summary(entry)
+    if summary:
+        parts.append(_summary_table([(entry.name, "", summary)]))
+    if series_src:
+        parts.append(f'<canvas class="usage" id="plot-{_slug(entry.name)}" width="900" height="240" '
+                     f'data-src="{html.escape(series_src)}"></canvas>')
+    if entry.processes and entry.processes.top:
+        parts.append(_process_table(entry.processes))
+    parts.append("</section>")
+    return "\n".join(parts)
+
+
+def write_html(
+    entries: Sequence[GalleryEntry],
+    output_dir: Path,
+    settings: Optional[PlotSettings] = None,
+    summary_sort: Optional[str] = None,
+) -> Path:
+    """
+    Write the gallery as a static HTML page with client-side plots.
+
+    No images are rendered: each entry's downsampled series goes to
+    <output_dir>/data/<entry>.js and is loaded only when its plot scrolls
+    into view, so page weight follows what the reader looks at.
+
+    Args:
+        entries: Successfully processed entries, in discovery order
+        output_dir: Directory receiving index.html and data/
+        settings: Point budget and downsampling method for the series
+        summary_sort: Summary metric to sort the summary table by initially
+
+    Returns:
+        Path of index.html
+    """
+    data_dir = output_dir / DATA_DIR
+    data_dir.mkdir(parents=True, exist_ok=True)
+
+    rows = [(entry.name, f"entry-{_slug(entry.name)}", entry_summary(entry)) for entry in entries]
+    if summary_sort:
+        rows.sort(key=lambda row: row[2].get(summary_sort, float("-inf")), reverse=True)
+    regressed = [entry.name for entry in entries if entry.regressions]
+
+    index_path = output_dir / "index.html"
+    with atomic_output(index_path) as out:
+        out.write(f'<!DOCTYPE html>\n<html lang="en"><head><meta charset="utf-8"><title>Gallery</title>'
+                  f"<style>{_STYLE}</style></head><body>\n<h1>Gallery</h1>\n")
+        if regressed:
+            out.write(f"<p><strong>⚠ {len(regressed)} entries regressed against the baseline:</strong> "
+                      f"{html.escape(', '.join(regressed))}</p>\n")
+        if any(row[2] for row in rows):
+            out.write(_summary_table([row for row in rows if row[2]]) + "\n")
+        for entry in entries:
+            series = write_series(entry, data_dir, settings) if entry.usage_json else None
+            src = f"{DATA_DIR}/{series.name}" if series else None
+            out.write(render_entry_html(entry, src) + "\n")
+        out.write(f"<script>const SERIES = {json.dumps(list(SERIES_METRICS))};{_SCRIPT}</script>\n</body></html>\n")
+    logger.info(f"Generated HTML: {index_path} ({len(entries)} entries)")
+    return index_path
@@ -1,9 +1,23 @@
 """Markdown rendering for gallery output."""
+import os
+import re
+import shutil
+import tempfile
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterator, List, Optional, Sequence, TextIO, Tuple
 
+from src.cache import fragment_key, load_fragment, store_fragment
+from src.defaults import SUMMARY_COLUMNS
 from src.models.gallery_entry import GalleryEntry
 from src.path_utils import get_relative_path
+from src.process_stats import PROCESS_COLUMNS, describe_concurrency, format_process_row, short_command, sparkline
+from src.profiling import span
+from src.regression import format_metric
+from src.summary import entry_summary, format_summary_value
+
+# (entry name, link to the entry's section, summary metrics)
+SummaryRow = Tuple[str, str, Dict[str, float]]
 
 
 def render_entry(entry: GalleryEntry, output_path: Path) -> str:
@@ -22,34 +36,338 @@ def render_entry(entry: GalleryEntry, output_path: Path) -> str:
     # Entry heading
     sections.append(f"## Entry: {entry.name}\n")
 
+    # Regressions against the baseline (if compared)
+    if entry.regressions:
+        lines = [
+            f"> - `{r.metric}`: {format_metric(r.baseline)} → {format_metric(r.current)} ({r.change:+.0%})"
+            for r in entry.regressions
+        ]
+        sections.append("> **⚠ Performance regression**\n>\n" + "\n".join(lines) + "\n")
+
     # Command code block
     if entry.command_text:
         sections.append(f"```bash\n{entry.command_text}\n```\n")
 
+    # Resource summary from execution_summary
+    summary = entry_summary(entry)
+    if summary:
+        sections.append(render_summary_table([(entry.name, "", summary)]))
+
     # Plot image (if available)
     if entry.plot_path and entry.plot_path.exists():
         rel_path = get_relative_path(output_path, entry.plot_path)
-        sections.append(f"![Plot]({rel_path})\n")
+        if entry.thumbnail_path:
+            thumb_path = get_relative_path(output_path, entry.thumbnail_path)
+            sections.append(f"[![Plot]({thumb_path})]({rel_path})\n")
+        else:
+            sections.append(f"![Plot]({rel_path})\n")
+
+    # Top processes of the run
+    if entry.processes and entry.processes.top:
+        sections.append(render_processes(entry.processes))
+
+    # Benchmark statistics over repeated runs
+    if entry.benchmark and entry.benchmark.stats:
+        sections.append(render_benchmark(entry.benchmark, output_path))
 
     sections.append("---\n")
 
     return "\n".join(sections)
 
 
-def render_markdown(entries: List[GalleryEntry], output_path: Path) -> str:
+def render_benchmark(benchmark, output_path: Path) -> str:
+    """
+    Render repeated-run statistics as a markdown table.
+
+    Args:
+        benchmark: BenchmarkResult of the entry
+        output_path: Output markdown file path (for relative path calculation)
+
+    Returns:
+        Markdown string with the table and optional overlay plot
+    """
+    n = max(stats.n for stats in benchmark.stats.values())
+    lines = [
+        f"**Benchmark** ({n} runs, 95% CI)\n",
+        "| Metric | Mean | Median | Std dev | 95% CI |",
+        "|---|---|---|---|---|",
+    ]
+    for metric, stats in benchmark.stats.items():
+        lines.append(
+            f"| `{metric}` | {format_metric(stats.mean)} | {format_metric(stats.median)} | "
+            f"{format_metric(stats.stdev)} | {format_metric(stats.ci_low)} – {format_metric(stats.ci_high)} |"
+        )
+    if benchmark.overlay_path and benchmark.overlay_path.exists():
+        rel_path = get_relative_path(output_path, benchmark.overlay_path)
+        lines.append(f"\n![Repeats]({rel_path})")
+    return "\n".join(lines) + "\n"
+
+
+def render_processes(breakdown) -> str:
+    """
+    Render the top processes of a run as a compact markdown table.
+
+    Args:
+        breakdown: ProcessBreakdown of the entry
+
+    Returns:
+        Markdown string with the concurrency summary and one row per command
+    """
+    lines = [
+        f"**Top processes**: {describe_concurrency(breakdown)} `{sparkline(breakdown.concurrency)}`\n",
+        "| Command | " + " | ".join(PROCESS_COLUMNS) + " |",
+        "|---" + "|---:" * len(PROCESS_COLUMNS) + "|",
+    ]
+    for stats in breakdown.top:
+        cmd = short_command(stats.cmd).replace("`", "'").replace("|", "\\|")
+        lines.append(f"| `{cmd}` | " + " | ".join(format_process_row(stats)) + " |")
+    return "\n".join(lines) + "\n"
+
+
+def entry_anchor(entry: GalleryEntry) -> str:
+    """Fragment identifier of the entry's heading, as generated by GitHub."""
+    return "entry-" + re.sub(r"[^\w\- ]", "", entry.name.lower()).replace(" ", "-")
+
+
+def render_summary_table(rows: Sequence[SummaryRow], sort_by: Optional[str] = None) -> str:
+    """
+    Render resource summaries as a markdown table, one row per entry.
+
+    Args:
+        rows: (name, link, summary) per entry; the name is linked when link is set
+        sort_by: Summary metric to sort rows by, largest first (default: keep order)
+
+    Returns:
+        Markdown string with the table
+    """
+    if sort_by:
+        rows = sorted(rows, key=lambda row: row[2].get(sort_by, float("-inf")), reverse=True)
+    lines = [
+        "| Entry | " + " | ".join(SUMMARY_COLUMNS.values()) + " |",
+        "|---" + "|---:" * len(SUMMARY_COLUMNS) + "|",
+    ]
+    for name, link, summary in rows:
+        label = f"[{name}]({link})" if link else name
+        values = " | ".join(format_summary_value(metric, summary.get(metric)) for metric in SUMMARY_COLUMNS)
+        lines.append(f"| {label} | {values} |")
+    return "\n".join(lines) + "\n"
+
+
+def render_markdown(entries: List[GalleryEntry], output_path: Path, summary_sort: Optional[str] = None) -> str:
     """
     Render complete markdown document from gallery entries.
 
     Args:
         entries: List of GalleryEntry instances
         output_path: Output markdown file path
+        summary_sort: Summary metric to sort the gallery-wide table by
 
     Returns:
         Complete markdown document as string
     """
-    content = ["# Gallery\n"]
+    content = [render_header(
+        [entry.name for entry in entries if entry.regressions],
+        [(entry.name, f"#{entry_anchor(entry)}", entry_summary(entry)) for entry in entries],
+        summary_sort,
+    )]
 
     for entry in entries:
         content.append(render_entry(entry, output_path))
 
     return "\n".join(content)
+
+
+def render_comparison_section(comparisons, output_path: Path) -> str:
+    """
+    Render the comparison plots as a markdown section.
+
+    Args:
+        comparisons: Rendered Comparison groups
+        output_path: Output markdown file path (for relative path calculation)
+
+    Returns:
+        Markdown string for the section (empty if there are no comparisons)
+    """
+    if not comparisons:
+        return ""
+    sections = ["## Comparisons\n"]
+    for comparison in comparisons:
+        labels = ", ".join(label for label, _ in comparison.members)
+        rel_path = get_relative_path(output_path, comparison.plot_path)
+        sections.append(f"### {comparison.title}\n\n{labels}\n\n![{comparison.title}]({rel_path})\n")
+    return "\n".join(sections)
+
+
+def render_entry_cached(entry: GalleryEntry, output_path: Path) -> str:
+    """
+    Render an entry, reusing its cached fragment if the entry was restored from cache.
+
+    Args:
+        entry: GalleryEntry to render
+        output_path: Markdown file the section goes into
+
+    Returns:
+        Markdown string for the entry
+    """
+    key = fragment_key(entry, output_path)
+    section = load_fragment(entry, key) if key and entry.cached else None
+    if section is None:
+        section = render_entry(entry, output_path)
+        if key:
+            store_fragment(entry, key, section)
+    return section
+
+
+def render_header(
+    regressed: Sequence[str], summaries: Sequence[SummaryRow] = (), summary_sort: Optional[str] = None
+) -> str:
+    """
+    Render the document title, the list of regressed entries and the gallery-wide summary.
+
+    Args:
+        regressed: Names of entries that regressed against the baseline
+        summaries: Summary row of every entry (entries without a summary are left out)
+        summary_sort: Summary metric to sort the table by
+
+    Returns:
+        Markdown string for the top of the document
+    """
+    content = ["# Gallery\n"]
+    if regressed:
+        content.append(f"**⚠ {len(regressed)} entries regressed against the baseline:** {', '.join(regressed)}\n")
+    rows = [row for row in summaries if row[2]]
+    if rows:
+        content.append(render_summary_table(rows, summary_sort))
+    return "\n".join(content)
+
+
+class MarkdownWriter:
+    """
+    Stream entry sections to disk as entries finish, then replace the output atomically.
+
+    Sections are appended to a temporary file next to the output in discovery
+    order (sections of entries finishing early are held until their
+    predecessors are done). commit() writes the header followed by the
+    spooled sections to a second temporary file and renames it over the
+    output, so an interrupted run leaves the previous README.md untouched.
+    Sections of entries served from the cache are reused from their cached
+    fragment instead of being rendered again.
+    """
+
+    def __init__(self, output_path: Path, entries: Sequence[GalleryEntry], summary_sort: Optional[str] = None):
+        """
+        Args:
+            output_path: Final markdown file path
+            entries: All entries in discovery order
+            summary_sort: Summary metric to sort the gallery-wide table by
+        """
+        self.output_path = output_path
+        self.summary_sort = summary_sort
+        self.written = 0
+        self._order = {id(entry): position for position, entry in enumerate(entries)}
+        self._finished: Dict[int, Optional[GalleryEntry]] = {}
+        self._next = 0
+        self._regressed: List[str] = []
+        self._summaries: List[SummaryRow] = []
+        self._body = tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=output_path.parent, prefix=f".{output_path.name}.", suffix=".part",
+            delete=False,
+        )
+
+    def __enter__(self) -> "MarkdownWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def add(self, entry: GalleryEntry, ok: bool) -> None:
+        """
+        Record that an entry finished; its section is written once all earlier entries are done.
+
+        Args:
+            entry: Finished entry
+            ok: Whether the entry was processed successfully (failed entries are left out)
+        """
+        self._finished[self._order[id(entry)]] = entry if ok else None
+        while self._next in self._finished:
+            finished = self._finished.pop(self._next)
+            self._next += 1
+            if finished is not None:
+                self._write_section(finished)
+
+    def _write_section(self, entry: GalleryEntry) -> None:
+        with span("render", entry.name):
+            section = render_entry_cached(entry, self.output_path)
+        if self.written:
+            self._body.write("\n")
+        self._body.write(section)
+        self.written += 1
+        if entry.regressions:
+            self._regressed.append(entry.name)
+        self._summaries.append((entry.name, f"#{entry_anchor(entry)}", entry_summary(entry)))
+
+    def append(self, markdown: str) -> None:
+        """Append a section after the entries (call once all entries are added)."""
+        if not markdown:
+            return
+        if self.written:
+            self._body.write("\n")
+        self._body.write(markdown)
+
+    def commit(self) -> None:
+        """Write the complete document and atomically replace the output file."""
+        self._body.flush()
+        with atomic_output(self.output_path) as out:
+            out.write(render_header(self._regressed, self._summaries, self.summary_sort))
+            if self.written:
+                out.write("\n")
+            with open(self._body.name, encoding="utf-8") as body:
+                shutil.copyfileobj(body, out)
+        self.close()
+
+    def close(self) -> None:
+        """Discard the spooled sections (the output file is left as it is unless committed)."""
+        if self._body.closed:
+            return
+        self._body.close()
+        try:
+            os.unlink(self._body.name)
+        except FileNotFoundError:
+            pass
+
+
+@contextmanager
+def atomic_output(output_path: Path) -> Iterator[TextIO]:
+    """
+    Write a file through a temporary sibling that replaces it only on success.
+
+    Args:
+        output_path: File to (re)write
+
+    Yields:
+        Text file to write the new content to
+    """
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=output_path.parent, prefix=f".{output_path.name}.", suffix=".tmp",
+        delete=False,
+    ) as out:
+        try:
+            yield out
+            out.flush()
+            os.fsync(out.fileno())
+            os.chmod(out.name, _output_mode(output_path))
+        except BaseException:
+            out.close()
+            os.unlink(out.name)
+            raise
+    os.replace(out.name, output_path)
+
+
+def _output_mode(output_path: Path) -> int:
+    """Permissions for the new output: those of the file it replaces, else 0644 minus the umask."""
+    try:
+        return output_path.stat().st_mode & 0o777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o644 & ~umask
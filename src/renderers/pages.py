@@ -0,0 +1,201 @@
+"""Sharded (paginated) markdown output for large galleries."""
+import hashlib
+import json
+import logging
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from src.defaults import GROUP_TAG, PAGES_DIR
+from src.models.gallery_entry import GalleryEntry
+from src.path_utils import get_relative_path, safe_name
+from src.renderers.markdown import atomic_output, entry_anchor, render_entry_cached, render_header
+from src.summary import entry_summary
+
+logger = logging.getLogger(__name__)
+
+SHARDS_MANIFEST = ".shards.json"
+UNGROUPED = "other"
+
+
+@dataclass
+class Shard:
+    """One page of entries belonging to a single group."""
+
+    group: str
+    number: int
+    entries: List[GalleryEntry]
+
+    @property
+    def filename(self) -> str:
+        return f"{safe_name(self.group, UNGROUPED)}-{self.number}.md"
+
+
+def entry_group(entry: GalleryEntry, group_by: str) -> str:
+    """
+    Group an entry belongs to.
+
+    Args:
+        entry: GalleryEntry to classify
+        group_by: "none", "prefix" (name up to the first '-' or '_') or
+            "tag" (the "group" key of the entry's metadata.json)
+
+    Returns:
+        Group name
+    """
+    if group_by == "prefix":
+        return re.split(r"[-_]", entry.name, maxsplit=1)[0] or UNGROUPED
+    if group_by == "tag":
+        tag = entry.metadata.get(GROUP_TAG)
+        return str(tag) if tag else UNGROUPED
+    return "page"
+
+
+def shard_entries(entries: Sequence[GalleryEntry], page_size: int, group_by: str = "none") -> List[Shard]:
+    """
+    Split entries into pages of at most page_size entries per group.
+
+    Groups appear in order of their first entry; entries keep discovery order.
+    """
+    groups: Dict[str, List[GalleryEntry]] = {}
+    for entry in entries:
+        groups.setdefault(entry_group(entry, group_by), []).append(entry)
+    shards = []
+    for group, members in groups.items():
+        for start in range(0, len(members), page_size):
+            shards.append(Shard(group, start // page_size + 1, members[start:start + page_size]))
+    return shards
+
+
+def render_page(shard: Shard, page_path: Path, index_path: Path, previous: str, following: str) -> str:
+    """
+    Render one page: title, navigation and the sections of its entries.
+
+    Args:
+        shard: Shard to render
+        page_path: Page file path (for relative path calculation)
+        index_path: Index page, linked from the navigation
+        previous: Filename of the previous page, or "" for none
+        following: Filename of the next page, or "" for none
+
+    Returns:
+        Markdown string for the page
+    """
+    nav = [f"[Index]({get_relative_path(page_path, index_path)})"]
+    if previous:
+        nav.append(f"[Previous]({previous})")
+    if following:
+        nav.append(f"[Next]({following})")
+    content = [f"# Gallery: {shard.group} ({shard.number})\n", " · ".join(nav) + "\n"]
+    for entry in shard.entries:
+        content.append(render_entry_cached(entry, page_path))
+    return "\n".join(content)
+
+
+def render_index(
+    shards: Sequence[Shard], index_path: Path, pages_dir: Path, grouped: bool, summary_sort: Optional[str] = None
+) -> str:
+    """
+    Render the index page linking to every shard.
+
+    Args:
+        shards: All shards, in page order
+        index_path: Index file path (for relative path calculation)
+        pages_dir: Directory containing the pages
+        grouped: Whether to add a heading per group
+        summary_sort: Summary metric to sort the gallery-wide table by
+
+    Returns:
+        Markdown string for the index
+    """
+    regressed = [entry.name for shard in shards for entry in shard.entries if entry.regressions]
+    summaries = [
+        (entry.name, f"{get_relative_path(index_path, pages_dir / shard.filename)}#{entry_anchor(entry)}",
+         entry_summary(entry))
+        for shard in shards for entry in shard.entries
+    ]
+    content = [render_header(regressed, summaries, summary_sort)]
+    lines: List[str] = []
+    group = None
+    for shard in shards:
+        if grouped and shard.group != group:
+            if lines:
+                content.append("\n".join(lines) + "\n")
+                lines = []
+            group = shard.group
+            content.append(f"## {group}\n")
+        link = get_relative_path(index_path, pages_dir / shard.filename)
+        names = ", ".join(entry.name for entry in shard.entries)
+        lines.append(f"- [{shard.group} {shard.number}]({link}): {names}")
+    if lines:
+        content.append("\n".join(lines) + "\n")
+    return "\n".join(content)
+
+
+def _load_shards_manifest(pages_dir: Path) -> Dict[str, str]:
+    try:
+        manifest = json.loads((pages_dir / SHARDS_MANIFEST).read_text())
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
+
+
+def write_pages(
+    entries: Sequence[GalleryEntry],
+    index_path: Path,
+    page_size: int,
+    group_by: str = "none",
+    summary_sort: Optional[str] = None,
+    appendix: str = "",
+) -> int:
+    """
+    Write the gallery as an index page plus one page per shard.
+
+    Pages go to a "pages" directory next to the index. A page is only
+    rewritten when its content changed since the last run (tracked by hash
+    in pages/.shards.json), and pages that no longer exist are removed.
+
+    Args:
+        entries: Successfully processed entries, in discovery order
+        index_path: Index file path (README.md)
+        page_size: Maximum entries per page
+        group_by: Grouping of entries into pages, one of GROUP_BY
+        summary_sort: Summary metric to sort the index's summary table by
+        appendix: Markdown added at the end of the index (e.g. comparison plots)
+
+    Returns:
+        Number of pages written
+    """
+    pages_dir = index_path.parent / PAGES_DIR
+    pages_dir.mkdir(exist_ok=True)
+    previous_hashes = _load_shards_manifest(pages_dir)
+    shards = shard_entries(entries, page_size, group_by)
+
+    hashes = {}
+    written = 0
+    for position, shard in enumerate(shards):
+        page_path = pages_dir / shard.filename
+        previous = shards[position - 1].filename if position > 0 else ""
+        following = shards[position + 1].filename if position + 1 < len(shards) else ""
+        page = render_page(shard, page_path, index_path, previous, following)
+        digest = hashlib.sha256(page.encode()).hexdigest()
+        hashes[shard.filename] = digest
+        if previous_hashes.get(shard.filename) == digest and page_path.exists():
+            continue
+        with atomic_output(page_path) as out:
+            out.write(page)
+        written += 1
+
+    for stale in set(previous_hashes) - set(hashes):
+        (pages_dir / stale).unlink(missing_ok=True)
+
+    with atomic_output(pages_dir / SHARDS_MANIFEST) as out:
+        json.dump(hashes, out, indent=2)
+    with atomic_output(index_path) as out:
+        out.write(render_index(shards, index_path, pages_dir, group_by != "none", summary_sort))
+        if appendix:
+            out.write("\n" + appendix)
+
+    logger.info(f"Wrote {written} of {len(shards)} pages to {pages_dir}")
+    return written
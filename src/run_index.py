@@ -0,0 +1,225 @@
+"""Persistent SQLite index of duct execution summaries."""
+import argparse
+import json
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from src.models.gallery_entry import GalleryEntry
+
+logger = logging.getLogger(__name__)
+
+INDEX_NAME = ".run-index.sqlite"
+
+# execution_summary fields stored as columns (also the metrics that can be queried)
+SUMMARY_METRICS = (
+    "wall_clock_time",
+    "peak_rss",
+    "average_rss",
+    "peak_vsz",
+    "average_vsz",
+    "peak_pmem",
+    "average_pmem",
+    "peak_pcpu",
+    "average_pcpu",
+    "num_samples",
+    "num_reports",
+)
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    entry TEXT NOT NULL,
+    start_time REAL NOT NULL,
+    end_time REAL,
+    exit_code INTEGER,
+    {", ".join(f"{metric} REAL" for metric in SUMMARY_METRICS)},
+    hostname TEXT,
+    duct_version TEXT,
+    schema_version TEXT,
+    recorded_at REAL NOT NULL,
+    PRIMARY KEY (entry, start_time)
+);
+CREATE INDEX IF NOT EXISTS runs_by_start ON runs (start_time);
+"""
+
+
+def default_index_path(gallery_dir: Path) -> Path:
+    """Default index location inside the gallery directory."""
+    return gallery_dir / INDEX_NAME
+
+
+def _check_metric(metric: str) -> str:
+    if metric not in SUMMARY_METRICS:
+        raise ValueError(f"Unknown metric '{metric}', expected one of: {', '.join(SUMMARY_METRICS)}")
+    return metric
+
+
+class RunIndex:
+    """SQLite-backed history of entry runs, keyed by entry name and start time."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._conn = sqlite3.connect(str(path))
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "RunIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def record(self, name: str, info: dict) -> bool:
+        """
+        Store the execution_summary of one run.
+
+        Re-recording the same run (same entry and start_time) replaces the row,
+        so entries served from cache do not create duplicates.
+
+        Args:
+            name: Entry name
+            info: Parsed duct info.json
+
+        Returns:
+            True if a row was written, False if info has no usable summary
+        """
+        summary = info.get("execution_summary") or {}
+        start_time = summary.get("start_time")
+        if start_time is None:
+            return False
+        system = info.get("system") or {}
+        row = {
+            "entry": name,
+            "start_time": start_time,
+            "end_time": summary.get("end_time"),
+            "exit_code": summary.get("exit_code"),
+            **{metric: summary.get(metric) for metric in SUMMARY_METRICS},
+            "hostname": system.get("hostname"),
+            "duct_version": info.get("duct_version"),
+            "schema_version": info.get("schema_version"),
+            "recorded_at": time.time(),
+        }
+        columns = ", ".join(row)
+        placeholders = ", ".join(f":{column}" for column in row)
+        with self._conn:
+            self._conn.execute(f"INSERT OR REPLACE INTO runs ({columns}) VALUES ({placeholders})", row)
+        return True
+
+    def record_entry(self, entry: GalleryEntry) -> bool:
+        """
+        Store the run(s) of a processed entry.
+
+        Every measured repeat of a benchmark is recorded; otherwise the single
+        run, reading info.json only if it was not parsed yet.
+        """
+        if entry.benchmark is not None:
+            return any([self.record(entry.name, info) for info in entry.benchmark.run_infos])
+        info = entry.run_info
+        if info is None and entry.info_json is not None:
+            try:
+                info = json.loads(entry.info_json.read_text())
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Warning: Could not index entry '{entry.name}': {e}")
+                return False
+        return bool(info) and self.record(entry.name, info)
+
+    def latest_runs(self) -> List[sqlite3.Row]:
+        """Most recent run of every entry."""
+        return self._conn.execute(
+            "SELECT * FROM runs WHERE (entry, start_time) IN "
+            "(SELECT entry, MAX(start_time) FROM runs GROUP BY entry) ORDER BY entry"
+        ).fetchall()
+
+    def history(self, name: str) -> List[sqlite3.Row]:
+        """All recorded runs of one entry, oldest first."""
+        return self._conn.execute(
+            "SELECT * FROM runs WHERE entry = ? ORDER BY start_time", (name,)
+        ).fetchall()
+
+    def top(self, metric: str, limit: int = 10) -> List[sqlite3.Row]:
+        """Entries with the largest value of metric in their latest run."""
+        metric = _check_metric(metric)
+        return self._conn.execute(
+            f"SELECT entry, start_time, {metric} AS value FROM runs WHERE (entry, start_time) IN "
+            f"(SELECT entry, MAX(start_time) FROM runs GROUP BY entry) "
+            f"AND {metric} IS NOT NULL ORDER BY {metric} DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+
+    def regressions(self, metric: str, threshold: float = 0.1) -> List[sqlite3.Row]:
+        """
+        Entries whose latest run is worse than the previous one.
+
+        Args:
+            metric: Summary metric to compare
+            threshold: Minimum relative increase (0.1 = 10%) reported
+
+        Returns:
+            Rows with entry, previous, latest and change (relative increase)
+        """
+        metric = _check_metric(metric)
+        return self._conn.execute(
+            f"""
+            WITH ranked AS (
+                SELECT entry, {metric} AS value,
+                       ROW_NUMBER() OVER (PARTITION BY entry ORDER BY start_time DESC) AS age
+                FROM runs WHERE {metric} IS NOT NULL
+            )
+            SELECT latest.entry, previous.value AS previous, latest.value AS latest,
+                   (latest.value - previous.value) / previous.value AS change
+            FROM ranked AS latest JOIN ranked AS previous
+              ON latest.entry = previous.entry AND latest.age = 1 AND previous.age = 2
+            WHERE previous.value > 0 AND (latest.value - previous.value) / previous.value > ?
+            ORDER BY change DESC
+            """,
+            (threshold,),
+        ).fetchall()
+
+
+def open_index(path: Optional[Path]) -> Optional[RunIndex]:
+    """Open the run index, or return None (with a warning) if it is unusable."""
+    if path is None:
+        return None
+    try:
+        return RunIndex(path)
+    except sqlite3.Error as e:
+        logger.warning(f"Warning: Run index disabled, cannot open {path}: {e}")
+        return None
+
+
+def main():
+    """Query the run index from the command line."""
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    parser = argparse.ArgumentParser(description="Query the con-duct-gallery run index")
+    parser.add_argument("--index", type=Path, default=default_index_path(Path("./gallery")),
+                        help="Run index to query (default: ./gallery/.run-index.sqlite)")
+    subparsers = parser.add_subparsers(dest="query", required=True)
+    top_parser = subparsers.add_parser("top", help="Entries with the highest metric in their latest run")
+    top_parser.add_argument("metric", choices=SUMMARY_METRICS)
+    top_parser.add_argument("-n", "--limit", type=int, default=10)
+    reg_parser = subparsers.add_parser("regressions", help="Entries whose latest run got worse")
+    reg_parser.add_argument("metric", choices=SUMMARY_METRICS)
+    reg_parser.add_argument("--threshold", type=float, default=0.1,
+                            help="Minimum relative increase to report (default: 0.1)")
+    args = parser.parse_args()
+
+    if not args.index.exists():
+        logger.error(f"Error: Run index not found: {args.index}")
+        raise SystemExit(1)
+
+    with RunIndex(args.index) as index:
+        if args.query == "top":
+            for row in index.top(args.metric, args.limit):
+                print(f"{row['entry']}\t{row['value']}")
+        else:
+            for row in index.regressions(args.metric, args.threshold):
+                print(f"{row['entry']}\t{row['previous']} -> {row['latest']}\t{row['change']:+.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""Concurrent processing of gallery entries."""
+import asyncio
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable, List, Optional, Sequence
+
+from src.footprint import Capacity, Footprint
+from src.models.gallery_entry import GalleryEntry
+from src.summary import format_bytes
+
+logger = logging.getLogger(__name__)
+
+
+class EntryLogBuffer(logging.Filter):
+    """
+    Hold back log records of concurrently processed entries until they finish.
+
+    Installed as a filter on the root handlers while entries run. Records
+    emitted inside ``capture()`` (including from helper threads started with
+    asyncio.to_thread, which inherit the context) are diverted into that
+    entry's buffer and replayed as one contiguous block when the entry
+    completes, so the output of concurrent entries never interleaves.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._records: ContextVar[Optional[list]] = ContextVar("entry_log_records", default=None)
+        self._flush_lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        records = self._records.get()
+        if records is None:
+            return True
+        # The same record reaches every root handler; keep one copy
+        if not records or records[-1] is not record:
+            records.append(record)
+        return False
+
+    @contextmanager
+    def capture(self):
+        """Buffer records logged in the current context until the block exits."""
+        records = []
+        token = self._records.set(records)
+        try:
+            yield
+        finally:
+            self._records.reset(token)
+            with self._flush_lock:
+                for record in records:
+                    logging.getLogger(record.name).handle(record)
+
+
+async def _run_all(
+    entries: Sequence[GalleryEntry],
+    worker: Callable[[GalleryEntry], Awaitable[bool]],
+    jobs: int,
+    log_buffer: Optional[EntryLogBuffer],
+) -> List[bool]:
+    semaphore = asyncio.Semaphore(jobs)
+
+    async def run_one(entry: GalleryEntry) -> bool:
+        async with semaphore:
+            if log_buffer is None:
+                return await worker(entry)
+            with log_buffer.capture():
+                return await worker(entry)
+
+    return list(await asyncio.gather(*(run_one(entry) for entry in entries)))
+
+
+async def _run_packed(
+    entries: Sequence[GalleryEntry],
+    worker: Callable[[GalleryEntry], Awaitable[bool]],
+    jobs: int,
+    log_buffer: Optional[EntryLogBuffer],
+    footprints: Sequence[Footprint],
+    capacity: Capacity,
+) -> List[bool]:
+    """
+    Start entries longest-first, only while their footprints fit the capacity.
+
+    Whenever an entry finishes, pending entries are scanned in order of
+    expected duration and every one that still fits is started. An entry
+    larger than the whole capacity runs once nothing else is running.
+    """
+    async def run_one(entry: GalleryEntry) -> bool:
+        if log_buffer is None:
+            return await worker(entry)
+        with log_buffer.capture():
+            return await worker(entry)
+
+    pending = sorted(range(len(entries)), key=lambda i: footprints[i].duration, reverse=True)
+    results: List[Optional[bool]] = [None] * len(entries)
+    running = {}
+    cpu_used = memory_used = 0.0
+    while pending or running:
+        for i in list(pending):
+            if len(running) >= jobs:
+                break
+            footprint = footprints[i]
+            if running and not capacity.fits(cpu_used + footprint.cpu, memory_used + footprint.memory):
+                continue
+            pending.remove(i)
+            cpu_used += footprint.cpu
+            memory_used += footprint.memory
+            running[asyncio.create_task(run_one(entries[i]))] = i
+        done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            i = running.pop(task)
+            cpu_used -= footprints[i].cpu
+            memory_used -= footprints[i].memory
+            results[i] = task.result()
+    return results
+
+
+def run_entries(
+    entries: Sequence[GalleryEntry],
+    worker: Callable[[GalleryEntry], Awaitable[bool]],
+    jobs: int = 1,
+    footprints: Optional[Sequence[Footprint]] = None,
+    capacity: Optional[Capacity] = None,
+) -> List[bool]:
+    """
+    Run an async worker over every entry with at most jobs entries in flight.
+
+    Entries are processed as tasks on a single event loop: child processes
+    are awaited rather than blocking a thread each, so the number of
+    concurrent entries is limited only by jobs.
+
+    Args:
+        entries: Entries in discovery order
+        worker: Coroutine function processing one entry, returning True on success
+        jobs: Maximum number of entries processed at the same time
+        footprints: Expected footprint of each entry; with capacity, entries
+            are started longest-first and only while their combined CPU and
+            memory fit, so concurrent runs do not skew each other's measurements
+        capacity: CPU and memory available to concurrently running entries
+
+    Returns:
+        Worker results, in the same order as entries
+    """
+    if jobs <= 1 or len(entries) <= 1:
+        return asyncio.run(_run_all(entries, worker, 1, None))
+
+    log_buffer = EntryLogBuffer()
+    handlers = list(logging.getLogger().handlers)
+    for handler in handlers:
+        handler.addFilter(log_buffer)
+
+    try:
+        if footprints is not None and capacity is not None:
+            logger.info(f"Processing entries with up to {jobs} parallel jobs within "
+                        f"cpu_total={capacity.cpu_total:g}% memory_total={format_bytes(capacity.memory_total)}")
+            return asyncio.run(_run_packed(entries, worker, jobs, log_buffer, footprints, capacity))
+        logger.info(f"Processing entries with {jobs} parallel jobs")
+        return asyncio.run(_run_all(entries, worker, jobs, log_buffer))
+    finally:
+        for handler in handlers:
+            handler.removeFilter(log_buffer)
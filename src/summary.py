@@ -0,0 +1,44 @@
+"""Resource summary of entries, taken from duct's execution_summary."""
+from typing import Dict, Optional
+
+from src.defaults import SUMMARY_COLUMNS
+from src.models.gallery_entry import GalleryEntry
+
+
+def entry_summary(entry: GalleryEntry) -> Dict[str, float]:
+    """
+    Summary metrics of a processed entry.
+
+    Read from the info.json already parsed while processing the entry
+    (entry.run_info), so the file is not read again.
+
+    Returns:
+        The numeric SUMMARY_COLUMNS fields present in execution_summary
+    """
+    summary = (entry.run_info or {}).get("execution_summary") or {}
+    return {
+        metric: summary[metric]
+        for metric in SUMMARY_COLUMNS
+        if isinstance(summary.get(metric), (int, float)) and not isinstance(summary.get(metric), bool)
+    }
+
+
+def format_bytes(value: float) -> str:
+    """Format a byte count with a binary unit (e.g. 5.9MB)."""
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if abs(value) < 1024 or unit == "TB":
+            return f"{value:.0f}{unit}" if unit == "B" else f"{value:.1f}{unit}"
+        value /= 1024
+
+
+def format_summary_value(metric: str, value: Optional[float]) -> str:
+    """Format one summary metric for display ("–" if missing)."""
+    if value is None:
+        return "–"
+    if metric.endswith("_rss"):
+        return format_bytes(value)
+    if metric.endswith("_pcpu"):
+        return f"{value:.1f}%"
+    if metric == "wall_clock_time":
+        return f"{value:.2f}s"
+    return f"{value:.0f}"
@@ -0,0 +1,148 @@
+"""Synthetic galleries of archived duct runs, for benchmarking the pipeline at scale."""
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List
+
+from src.models.entry_scan import DUCT_DIR
+
+SCHEMA_VERSION = "0.2.2"
+DUCT_VERSION = "0.16.0"
+# Seconds between usage reports
+REPORT_INTERVAL = 0.1
+_PAGE = 4096
+_START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _timestamp(offset: float) -> str:
+    return (_START + timedelta(seconds=offset)).isoformat()
+
+
+def _etime(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes:02d}:{seconds:02d}"
+
+
+def write_synthetic_entry(entry_dir: Path, samples: int, processes: int, rng: random.Random) -> None:
+    """
+    Write the .duct/ logs of one archived run (a skip-execution entry).
+
+    The run has a shell process plus processes - 1 children that start and
+    exit at random points, each with a slowly drifting CPU and memory load.
+    Reports, totals and execution_summary are consistent with each other,
+    as in logs written by duct.
+
+    Args:
+        entry_dir: Entry directory to create
+        samples: Number of usage reports
+        processes: Number of distinct processes over the whole run
+        rng: Random source (seed it for reproducible galleries)
+    """
+    duct_dir = entry_dir / DUCT_DIR
+    duct_dir.mkdir(parents=True, exist_ok=True)
+    command = f"bash -c ./workload.sh --size {rng.randint(1, 100)}"
+    base_pid = rng.randint(10000, 4000000)
+
+    # (pid, cmd, first report, last report, rss pages, pcpu)
+    procs = [(base_pid, command, 0, samples - 1, rng.randint(500, 2000), 0.5)]
+    for child in range(1, processes):
+        start = rng.randrange(samples)
+        end = min(samples - 1, start + rng.randint(1, max(1, samples // 2)))
+        procs.append((base_pid + child, f"worker --shard {child}", start, end,
+                      rng.randint(1000, 500000), rng.uniform(5.0, 100.0)))
+    load = {pid: (pages, pcpu) for pid, _cmd, _start, _end, pages, pcpu in procs}
+
+    peak_rss = peak_vsz = 0
+    peak_pcpu = peak_pmem = 0.0
+    sum_rss = sum_vsz = sum_pcpu = sum_pmem = 0.0
+    with (duct_dir / "runusage.json").open("w") as out:
+        for report in range(samples):
+            offset = report * REPORT_INTERVAL
+            stamp = _timestamp(offset)
+            stats = {}
+            for pid, cmd, start, end, _pages, _pcpu in procs:
+                if not start <= report <= end:
+                    continue
+                pages, pcpu = load[pid]
+                pages = max(100, int(pages * rng.uniform(0.95, 1.06)))
+                pcpu = min(100.0, max(0.0, pcpu + rng.uniform(-5.0, 5.0)))
+                load[pid] = (pages, pcpu)
+                rss = pages * _PAGE
+                stats[str(pid)] = {
+                    "pcpu": round(pcpu, 1), "pmem": round(rss / 2 ** 35 * 100, 1), "rss": rss,
+                    "vsz": rss * 4 + 200 * 2 ** 20, "timestamp": stamp,
+                    "etime": _etime(offset - start * REPORT_INTERVAL),
+                    "stat": {"R" if pcpu > 50 else "S": 1}, "cmd": cmd,
+                }
+            totals = {
+                "pmem": round(sum(s["pmem"] for s in stats.values()), 1),
+                "pcpu": round(sum(s["pcpu"] for s in stats.values()), 1),
+                "rss": sum(s["rss"] for s in stats.values()),
+                "vsz": sum(s["vsz"] for s in stats.values()),
+            }
+            record = {"timestamp": stamp, "num_samples": 1, "processes": stats, "totals": totals,
+                      "averages": {"rss": totals["rss"], "vsz": totals["vsz"], "pmem": totals["pmem"],
+                                   "pcpu": totals["pcpu"], "num_samples": 1}}
+            out.write(json.dumps(record) + "\n")
+            peak_rss, peak_vsz = max(peak_rss, totals["rss"]), max(peak_vsz, totals["vsz"])
+            peak_pcpu, peak_pmem = max(peak_pcpu, totals["pcpu"]), max(peak_pmem, totals["pmem"])
+            sum_rss += totals["rss"]
+            sum_vsz += totals["vsz"]
+            sum_pcpu += totals["pcpu"]
+            sum_pmem += totals["pmem"]
+
+    wall_clock = samples * REPORT_INTERVAL
+    info = {
+        "command": command,
+        "system": {"cpu_total": 16, "memory_total": 2 ** 35, "hostname": "synthetic",
+                   "uid": 1000, "user": "bench"},
+        "env": {},
+        "gpu": None,
+        "duct_version": DUCT_VERSION,
+        "schema_version": SCHEMA_VERSION,
+        "execution_summary": {
+            "exit_code": 0, "command": command, "logs_prefix": f"{DUCT_DIR}/run",
+            "wall_clock_time": wall_clock,
+            "peak_rss": peak_rss, "average_rss": sum_rss / samples,
+            "peak_vsz": peak_vsz, "average_vsz": sum_vsz / samples,
+            "peak_pmem": peak_pmem, "average_pmem": sum_pmem / samples,
+            "peak_pcpu": peak_pcpu, "average_pcpu": sum_pcpu / samples,
+            "num_samples": samples, "num_reports": samples,
+            "start_time": _START.timestamp(), "end_time": _START.timestamp() + wall_clock,
+            "working_directory": str(entry_dir),
+        },
+        "output_paths": {
+            "stdout": f"{DUCT_DIR}/runstdout", "stderr": f"{DUCT_DIR}/runstderr",
+            "usage": f"{DUCT_DIR}/runusage.json", "info": f"{DUCT_DIR}/runinfo.json",
+            "prefix": f"{DUCT_DIR}/run",
+        },
+        "working_directory": str(entry_dir),
+        "message": "",
+    }
+    (duct_dir / "runinfo.json").write_text(json.dumps(info))
+
+
+def generate_gallery(gallery_dir: Path, entries: int, samples: int = 100, processes: int = 4,
+                     seed: int = 0) -> List[Path]:
+    """
+    Create a gallery of skip-execution entries with synthetic duct logs.
+
+    Args:
+        gallery_dir: Directory to create the entries in
+        entries: Number of entries
+        samples: Usage reports per entry
+        processes: Distinct processes per entry
+        seed: Random seed; the same arguments always produce the same gallery
+
+    Returns:
+        Entry directories, in discovery order
+    """
+    rng = random.Random(seed)
+    width = len(str(entries - 1)) if entries > 1 else 1
+    entry_dirs = []
+    for index in range(entries):
+        entry_dir = gallery_dir / f"synthetic-{index:0{width}d}"
+        write_synthetic_entry(entry_dir, samples, processes, rng)
+        entry_dirs.append(entry_dir)
+    return entry_dirs
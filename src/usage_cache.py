@@ -0,0 +1,307 @@
+"""Columnar sidecar cache of parsed usage files."""
+import json
+import logging
+import os
+import shutil
+import tempfile
+from array import array
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.cache import fingerprint
+from src.usage_reader import METRICS, PidSeries, UsageSeries, iter_usage_lines, read_usage
+
+logger = logging.getLogger(__name__)
+
+USAGE_CACHE_DIR = ".usage-cache"
+USAGE_CACHE_VERSION = 1
+META_NAME = "meta.json"
+# Columns stored as one .npy file each (per-pid columns are concatenated,
+# pid i owning rows offsets[i]:offsets[i + 1])
+COLUMNS = ("elapsed", "totals", "pid_ordinal", "pid_elapsed", "pid_values")
+# Rows parsed before they are flushed to the staging files, bounding memory on a cache miss
+BUILD_CHUNK = 1 << 16
+
+
+def usage_cache_dir(usage_json: Path) -> Path:
+    """Cache directory of a usage file: .usage-cache/<usage file name>/ next to it."""
+    return usage_json.parent / USAGE_CACHE_DIR / usage_json.name
+
+
+def _write_meta(directory: Path, meta: dict) -> None:
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=f".{META_NAME}.")
+    with os.fdopen(fd, "w") as f:
+        json.dump(meta, f)
+    os.replace(tmp, directory / META_NAME)
+
+
+class _Spool:
+    """Rows of float64 values appended to a flat file, buffering at most BUILD_CHUNK rows."""
+
+    def __init__(self, path: Path, width: int):
+        self.path = path
+        self.width = width
+        self.rows = 0
+        self._buffer = array("d")
+        self._file = open(path, "wb")
+
+    def append(self, row) -> None:
+        self._buffer.extend(row)
+        self.rows += 1
+        if len(self._buffer) >= BUILD_CHUNK * self.width:
+            self._flush()
+
+    def _flush(self) -> None:
+        self._buffer.tofile(self._file)
+        del self._buffer[:]
+
+    def close(self) -> None:
+        self._flush()
+        self._file.close()
+
+    def open(self):
+        """The spooled rows as a read-only (rows, width) array."""
+        import numpy as np
+
+        if not self.rows:
+            return np.empty((0, self.width))
+        return np.memmap(self.path, dtype=np.float64, mode="r", shape=(self.rows, self.width))
+
+
+def _new_column(path: Path, shape, dtype):
+    """Writable .npy column backed by path (a plain array if empty, which cannot be mapped)."""
+    import numpy as np
+
+    if 0 in shape:
+        return np.empty(shape, dtype=dtype)
+    return np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=shape)
+
+
+def _build_cache(usage_json: Path, source: dict) -> Optional[dict]:
+    """
+    Stream a usage file into its cache directory with bounded memory.
+
+    Reports are parsed one line at a time and spooled to flat staging files
+    in chunks; the .npy columns are then filled chunk by chunk through
+    memory maps (per-pid rows placed by a counting sort on the pid), so
+    neither the parsed records nor the columns are ever held in memory.
+    The columns are written first and meta.json last, so a crash leaves a
+    cache that fails validation rather than one that is silently wrong.
+
+    Returns:
+        meta of the written cache, or None if it could not be written
+
+    Raises:
+        OSError: If the usage file cannot be read
+        KeyError, ValueError: If a record is malformed
+    """
+    import numpy as np
+
+    directory = usage_cache_dir(usage_json)
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(dir=directory, prefix=".build-"))
+    except OSError as e:
+        logger.debug(f"Could not write usage cache for {usage_json}: {e}")
+        return None
+    try:
+        # Per report: elapsed, totals; per process sample: pid index, ordinal, elapsed, values
+        reports = _Spool(staging / "reports", 1 + len(METRICS))
+        samples = _Spool(staging / "samples", 3 + len(METRICS))
+        pid_index: Dict[str, int] = {}
+        cmds: List[str] = []
+        counts: List[int] = []
+        num_records = 0
+        start = None
+        try:
+            for ordinal, line in enumerate(iter_usage_lines(usage_json)):
+                num_records = ordinal + 1
+                record = json.loads(line)
+                ts = datetime.fromisoformat(record["timestamp"])
+                if start is None:
+                    start = ts
+                elapsed = (ts - start).total_seconds()
+                totals = record["totals"]
+                reports.append([elapsed, *(float(totals.get(metric, 0.0)) for metric in METRICS)])
+                for pid, proc in record.get("processes", {}).items():
+                    index = pid_index.get(pid)
+                    if index is None:
+                        index = pid_index[pid] = len(cmds)
+                        cmds.append(proc.get("cmd", ""))
+                        counts.append(0)
+                    counts[index] += 1
+                    samples.append([index, ordinal, elapsed, *(float(proc.get(metric, 0.0)) for metric in METRICS)])
+        finally:
+            reports.close()
+            samples.close()
+
+        offsets = [0]
+        for count in counts:
+            offsets.append(offsets[-1] + count)
+        length, total = reports.rows, samples.rows
+        paths = {name: staging / f"{name}.npy" for name in COLUMNS}
+        columns = {
+            "elapsed": _new_column(paths["elapsed"], (length,), np.float64),
+            "totals": _new_column(paths["totals"], (len(METRICS), length), np.float64),
+            "pid_ordinal": _new_column(paths["pid_ordinal"], (total,), np.int64),
+            "pid_elapsed": _new_column(paths["pid_elapsed"], (total,), np.float64),
+            "pid_values": _new_column(paths["pid_values"], (len(METRICS), total), np.float64),
+        }
+
+        rows = reports.open()
+        for first in range(0, length, BUILD_CHUNK):
+            chunk = rows[first:first + BUILD_CHUNK]
+            columns["elapsed"][first:first + len(chunk)] = chunk[:, 0]
+            columns["totals"][:, first:first + len(chunk)] = chunk[:, 1:].T
+
+        # Next free row of each pid in the concatenated per-pid columns
+        cursor = np.asarray(offsets[:-1], dtype=np.int64)
+        rows = samples.open()
+        for first in range(0, total, BUILD_CHUNK):
+            chunk = rows[first:first + BUILD_CHUNK]
+            index = chunk[:, 0].astype(np.int64)
+            order = np.argsort(index, kind="stable")
+            grouped = index[order]
+            rank = np.arange(len(grouped)) - np.searchsorted(grouped, grouped)
+            target = cursor[grouped] + rank
+            columns["pid_ordinal"][target] = chunk[order, 1].astype(np.int64)
+            columns["pid_elapsed"][target] = chunk[order, 2]
+            columns["pid_values"][:, target] = chunk[order, 3:].T
+            cursor += np.bincount(index, minlength=len(cursor))
+        del rows, chunk
+
+        for name, column in columns.items():
+            if isinstance(column, np.memmap):
+                column.flush()
+            else:
+                np.save(paths[name], column)
+            os.replace(paths[name], directory / f"{name}.npy")
+        meta = {
+            "version": USAGE_CACHE_VERSION,
+            "source": source,
+            "num_records": num_records,
+            "length": length,
+            "pids": list(pid_index),
+            "cmds": cmds,
+            "offsets": offsets,
+        }
+        _write_meta(directory, meta)
+        return meta
+    except OSError as e:
+        if not usage_json.exists():
+            raise
+        logger.debug(f"Could not write usage cache for {usage_json}: {e}")
+        return None
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def _load_cached(directory: Path, meta: dict) -> Optional[UsageSeries]:
+    """Memory-map the cached columns described by meta, or None if they do not match it."""
+    import numpy as np
+
+    try:
+        columns = {name: np.load(directory / f"{name}.npy", mmap_mode="r") for name in COLUMNS}
+    except (OSError, ValueError) as e:
+        logger.debug(f"Ignoring unreadable usage cache {directory}: {e}")
+        return None
+    length, offsets = meta["length"], meta["offsets"]
+    if (len(columns["elapsed"]) != length or columns["totals"].shape != (len(METRICS), length)
+            or len(columns["pid_ordinal"]) != offsets[-1]):
+        return None
+
+    series = UsageSeries(elapsed=columns["elapsed"], num_records=meta["num_records"])
+    series.totals = {metric: columns["totals"][i] for i, metric in enumerate(METRICS)}
+    for n, (pid, cmd) in enumerate(zip(meta["pids"], meta["cmds"])):
+        rows = slice(offsets[n], offsets[n + 1])
+        series.pids[pid] = PidSeries(
+            cmd=cmd,
+            ordinal=columns["pid_ordinal"][rows],
+            elapsed=columns["pid_elapsed"][rows],
+            values={metric: columns["pid_values"][i, rows] for i, metric in enumerate(METRICS)},
+        )
+    return series
+
+
+def _select(series: UsageSeries, stride: int, max_points: Optional[int]) -> UsageSeries:
+    """Keep the reports read_usage(stride, max_points) would have kept."""
+    while max_points is not None and -(-series.num_records // stride) > max_points:
+        stride *= 2
+    if stride == 1:
+        return series
+    selected = UsageSeries(
+        elapsed=series.elapsed[::stride],
+        totals={metric: column[::stride] for metric, column in series.totals.items()},
+        num_records=series.num_records,
+        stride=stride,
+    )
+    for pid, pid_series in series.pids.items():
+        keep = pid_series.ordinal % stride == 0
+        if not keep.any():
+            continue
+        selected.pids[pid] = PidSeries(
+            cmd=pid_series.cmd,
+            ordinal=pid_series.ordinal[keep],
+            elapsed=pid_series.elapsed[keep],
+            values={metric: column[keep] for metric, column in pid_series.values.items()},
+        )
+    return selected
+
+
+def load_usage(usage_json: Path, stride: int = 1, max_points: Optional[int] = None) -> UsageSeries:
+    """
+    read_usage() backed by a memory-mapped columnar cache.
+
+    The first read of a usage file streams it, with bounded memory, into
+    .npy files under .duct/.usage-cache/<usage file name>/; later reads
+    memory-map them instead of parsing JSON, so replotting a long run no
+    longer pays for the parse. The cache is invalidated when the usage file's
+    content hash changes (the hash is only recomputed when its size or mtime
+    changed). The returned columns are numpy arrays rather than
+    array.array, with the same reports kept as read_usage would keep.
+
+    Falls back to plain read_usage (with its bounded memory) when numpy is
+    not installed or the cache cannot be written.
+
+    Raises:
+        OSError: If the file cannot be read
+        KeyError, ValueError: If a record is malformed
+    """
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return read_usage(usage_json, stride, max_points)
+    if stride < 1:
+        raise ValueError(f"stride must be >= 1, got {stride}")
+    if max_points is not None and max_points < 2:
+        raise ValueError(f"max_points must be >= 2, got {max_points}")
+
+    directory = usage_cache_dir(usage_json)
+    try:
+        meta = json.loads((directory / META_NAME).read_text())
+    except (OSError, json.JSONDecodeError):
+        meta = None
+    if not isinstance(meta, dict) or meta.get("version") != USAGE_CACHE_VERSION:
+        meta = None
+    previous = meta and meta.get("source")
+    source = fingerprint(usage_json, previous)
+    if source is None:
+        raise FileNotFoundError(f"Usage file not found: {usage_json}")
+
+    series = None
+    if previous and source["sha256"] == previous.get("sha256"):
+        series = _load_cached(directory, meta)
+    if series is None:
+        built = _build_cache(usage_json, source)
+        series = built and _load_cached(directory, built)
+        if series is None:
+            # No cache could be written: parse with read_usage's bounded memory instead
+            return read_usage(usage_json, stride, max_points)
+    elif source is not previous:
+        # Touched but unchanged: record the new mtime so the hash is not recomputed
+        try:
+            _write_meta(directory, {**meta, "source": source})
+        except OSError:
+            pass
+    return _select(series, stride, max_points)
@@ -0,0 +1,121 @@
+"""Streaming reader for duct usage files."""
+import json
+from array import array
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+METRICS = ("rss", "vsz", "pcpu", "pmem")
+
+
+def _columns() -> Dict[str, array]:
+    return {metric: array("d") for metric in METRICS}
+
+
+@dataclass
+class PidSeries:
+    """Samples of a single process, aligned on the kept report ordinals."""
+
+    cmd: str
+    ordinal: array = field(default_factory=lambda: array("q"))
+    elapsed: array = field(default_factory=lambda: array("d"))
+    values: Dict[str, array] = field(default_factory=_columns)
+
+
+@dataclass
+class UsageSeries:
+    """Columnar view of a usage file: report totals plus per-pid series."""
+
+    elapsed: array = field(default_factory=lambda: array("d"))
+    totals: Dict[str, array] = field(default_factory=_columns)
+    pids: Dict[str, PidSeries] = field(default_factory=dict)
+    num_records: int = 0
+    stride: int = 1
+
+    def __len__(self) -> int:
+        return len(self.elapsed)
+
+
+def iter_usage_lines(usage_json: Path) -> Iterator[str]:
+    """Yield the non-blank lines of a JSON Lines usage file, one at a time."""
+    with open(usage_json) as f:
+        for line in f:
+            if line.strip():
+                yield line
+
+
+def _decimate(series: UsageSeries) -> None:
+    """Double the stride, dropping every other kept record in place."""
+    series.stride *= 2
+    del series.elapsed[1::2]
+    for column in series.totals.values():
+        del column[1::2]
+    for pid, pid_series in list(series.pids.items()):
+        keep = [i for i, n in enumerate(pid_series.ordinal) if n % series.stride == 0]
+        if not keep:
+            del series.pids[pid]
+            continue
+        pid_series.ordinal = array("q", (pid_series.ordinal[i] for i in keep))
+        pid_series.elapsed = array("d", (pid_series.elapsed[i] for i in keep))
+        for metric, column in pid_series.values.items():
+            pid_series.values[metric] = array("d", (column[i] for i in keep))
+
+
+def read_usage(usage_json: Path, stride: int = 1, max_points: Optional[int] = None) -> UsageSeries:
+    """
+    Stream a usage file into compact columnar arrays.
+
+    Lines are parsed one at a time and only every ``stride``-th report is
+    decoded at all. With ``max_points`` the stride doubles whenever the number
+    of kept reports would exceed it, so memory stays bounded no matter how
+    long the run was.
+
+    Args:
+        usage_json: Path to duct usage file (JSON Lines)
+        stride: Keep every stride-th report
+        max_points: Optional upper bound on the number of kept reports
+
+    Returns:
+        UsageSeries with elapsed seconds since the first report
+
+    Raises:
+        OSError: If the file cannot be read
+        KeyError, ValueError: If a record is malformed
+    """
+    if stride < 1:
+        raise ValueError(f"stride must be >= 1, got {stride}")
+    if max_points is not None and max_points < 2:
+        raise ValueError(f"max_points must be >= 2, got {max_points}")
+
+    series = UsageSeries(stride=stride)
+    start = None
+    for ordinal, line in enumerate(iter_usage_lines(usage_json)):
+        series.num_records = ordinal + 1
+        if ordinal % series.stride:
+            continue
+
+        record = json.loads(line)
+        ts = datetime.fromisoformat(record["timestamp"])
+        if start is None:
+            start = ts
+        elapsed = (ts - start).total_seconds()
+
+        series.elapsed.append(elapsed)
+        totals = record["totals"]
+        for metric in METRICS:
+            series.totals[metric].append(float(totals.get(metric, 0.0)))
+
+        for pid, proc in record.get("processes", {}).items():
+            pid_series = series.pids.get(pid)
+            if pid_series is None:
+                pid_series = series.pids[pid] = PidSeries(cmd=proc.get("cmd", ""))
+            pid_series.ordinal.append(ordinal)
+            pid_series.elapsed.append(elapsed)
+            for metric in METRICS:
+                pid_series.values[metric].append(float(proc.get(metric, 0.0)))
+
+        if max_points is not None and len(series) > max_points:
+            _decimate(series)
+
+    return series
@@ -0,0 +1,238 @@
+"""Change notification for the gallery directory (inotify, or polling elsewhere)."""
+import abc
+import logging
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
+
+from src.defaults import DEFAULT_DEBOUNCE
+from src.models.entry_scan import DUCT_DIR
+from src.models.gallery_entry import METADATA_FILE
+
+logger = logging.getLogger(__name__)
+
+# Entry files whose changes trigger a rebuild (plus the files in .duct/)
+WATCHED_FILES = ("setup.sh", "command.sh", METADATA_FILE)
+POLL_INTERVAL = 0.5
+
+# A change: (entry name, path relative to the entry), where the path is ""
+# when the entry directory itself appeared or disappeared
+Change = Tuple[str, str]
+
+_IN_ATTRIB = 0x4
+_IN_CLOSE_WRITE = 0x8
+_IN_MOVED_FROM = 0x40
+_IN_MOVED_TO = 0x80
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_Q_OVERFLOW = 0x4000
+_IN_IGNORED = 0x8000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = os.O_CLOEXEC
+_FILE_EVENTS = _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+_DIR_EVENTS = _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+_EVENT = struct.Struct("iIII")
+
+
+def is_watched(relpath: str) -> bool:
+    """True for the entry files a rebuild depends on (hidden files in .duct/ are our own caches)."""
+    parts = relpath.split("/")
+    if len(parts) == 1:
+        return parts[0] in WATCHED_FILES or parts[0] == ""
+    return len(parts) == 2 and parts[0] == DUCT_DIR and not parts[1].startswith(".")
+
+
+class Watcher(abc.ABC):
+    """Collects changes to gallery entries; subclasses provide the event source."""
+
+    def __init__(self, gallery_dir: Path):
+        self.gallery_dir = gallery_dir
+
+    @abc.abstractmethod
+    def _changes(self, timeout: Optional[float]) -> Set[Change]:
+        """Changes seen within timeout seconds (None: wait for the first change)."""
+
+    def wait(self, debounce: float = DEFAULT_DEBOUNCE) -> Set[Change]:
+        """
+        Block until entries change, then until no further change arrives for debounce seconds.
+
+        Returns:
+            All changes of the burst (e.g. an editor's save, or a tool writing several files)
+        """
+        changes = set()
+        while not changes:
+            changes = self._changes(None)
+        while True:
+            more = self._changes(debounce)
+            if not more:
+                return changes
+            changes |= more
+
+    def close(self) -> None:
+        pass
+
+
+class PollingWatcher(Watcher):
+    """Detect changes by comparing stat snapshots of the watched files every interval."""
+
+    def __init__(self, gallery_dir: Path, interval: float = POLL_INTERVAL):
+        super().__init__(gallery_dir)
+        self.interval = interval
+        self._snapshot = self._take()
+
+    def _take(self) -> Dict[Change, Tuple[int, int, int]]:
+        snapshot = {}
+        try:
+            entry_dirs = [item.name for item in os.scandir(self.gallery_dir) if item.is_dir()]
+        except OSError:
+            return snapshot
+        for name in entry_dirs:
+            snapshot[(name, "")] = (0, 0, 0)
+            entry_dir = self.gallery_dir / name
+            paths = list(WATCHED_FILES)
+            try:
+                paths += [f"{DUCT_DIR}/{item}" for item in os.listdir(entry_dir / DUCT_DIR)]
+            except OSError:
+                pass
+            for relpath in paths:
+                if not is_watched(relpath):
+                    continue
+                try:
+                    st = os.stat(entry_dir / relpath)
+                except OSError:
+                    continue
+                snapshot[(name, relpath)] = (st.st_size, st.st_mtime_ns, st.st_mode)
+        return snapshot
+
+    def _changes(self, timeout: Optional[float]) -> Set[Change]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            delay = self.interval if deadline is None else min(self.interval, deadline - time.monotonic())
+            time.sleep(max(delay, 0))
+            snapshot = self._take()
+            changes = {
+                change for change in snapshot.keys() | self._snapshot.keys()
+                if snapshot.get(change) != self._snapshot.get(change)
+            }
+            self._snapshot = snapshot
+            if changes or (deadline is not None and time.monotonic() >= deadline):
+                return changes
+
+
+class InotifyWatcher(Watcher):
+    """
+    Linux inotify watches on the gallery directory, each entry and each entry's .duct/.
+
+    Raises:
+        OSError: If inotify is unavailable
+    """
+
+    def __init__(self, gallery_dir: Path):
+        super().__init__(gallery_dir)
+        import ctypes
+        import ctypes.util
+
+        self._ctypes = ctypes
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        self._fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        # watch descriptor -> (entry name or None for the gallery directory, True for .duct/)
+        self._watches: Dict[int, Tuple[Optional[str], bool]] = {}
+        self._watch(gallery_dir, None, False, _DIR_EVENTS)
+        for item in os.scandir(gallery_dir):
+            if item.is_dir():
+                self._watch_entry(item.name)
+
+    def _watch(self, path: Path, entry: Optional[str], duct: bool, mask: int) -> None:
+        wd = self._add_watch(self._fd, os.fsencode(path), mask)
+        if wd < 0:
+            logger.debug(f"Cannot watch {path}: {os.strerror(self._ctypes.get_errno())}")
+            return
+        self._watches[wd] = (entry, duct)
+
+    def _watch_entry(self, name: str) -> None:
+        entry_dir = self.gallery_dir / name
+        self._watch(entry_dir, name, False, _FILE_EVENTS)
+        if (entry_dir / DUCT_DIR).is_dir():
+            self._watch(entry_dir / DUCT_DIR, name, True, _FILE_EVENTS)
+
+    def _read(self) -> Set[Change]:
+        changes = set()
+        try:
+            data = os.read(self._fd, 1 << 16)
+        except BlockingIOError:
+            return changes
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+            if mask & _IN_Q_OVERFLOW:
+                # Events were lost: treat every entry as changed
+                changes |= {(item.name, "") for item in os.scandir(self.gallery_dir) if item.is_dir()}
+                continue
+            if mask & _IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            if wd not in self._watches:
+                continue
+            entry, duct = self._watches[wd]
+            if entry is None:
+                if mask & _IN_ISDIR:
+                    if mask & (_IN_CREATE | _IN_MOVED_TO):
+                        self._watch_entry(name)
+                    changes.add((name, ""))
+                continue
+            if duct:
+                changes.add((entry, f"{DUCT_DIR}/{name}"))
+            elif mask & _IN_ISDIR:
+                if name == DUCT_DIR and mask & (_IN_CREATE | _IN_MOVED_TO):
+                    duct_dir = self.gallery_dir / entry / DUCT_DIR
+                    self._watch(duct_dir, entry, True, _FILE_EVENTS)
+                    # Files may have landed before the watch was added
+                    changes |= {(entry, f"{DUCT_DIR}/{item}") for item in os.listdir(duct_dir)}
+            else:
+                changes.add((entry, name))
+        return {change for change in changes if is_watched(change[1])}
+
+    def _changes(self, timeout: Optional[float]) -> Set[Change]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            ready, _, _ = select.select([self._fd], [], [], remaining)
+            if not ready:
+                return set()
+            changes = self._read()
+            if changes:
+                return changes
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def open_watcher(gallery_dir: Path, polling: bool = False) -> Watcher:
+    """
+    Watch a gallery directory with inotify on Linux, falling back to polling.
+
+    Args:
+        gallery_dir: Gallery directory
+        polling: Always poll (e.g. on network filesystems, where inotify
+            does not see changes made on other hosts)
+    """
+    if not polling and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(gallery_dir)
+        except (OSError, AttributeError) as e:
+            logger.warning(f"Warning: inotify unavailable ({e}), polling for changes")
+    return PollingWatcher(gallery_dir)
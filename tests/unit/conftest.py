@@ -0,0 +1,51 @@
+"""Shared fixtures of the unit tests."""
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from src.models.gallery_entry import GalleryEntry
+
+FIXTURE_USAGE = (
+    Path(__file__).parent.parent / "fixtures" / "gallery" / "skip-execution-example" / ".duct" / "runusage.json"
+)
+
+
+@pytest.fixture
+def usage_file(tmp_path):
+    """Copy of the skip-execution fixture's usage file, so usage caches are written under tmp_path."""
+    path = tmp_path / "fixture" / "runusage.json"
+    path.parent.mkdir()
+    shutil.copy(FIXTURE_USAGE, path)
+    return path
+
+
+@pytest.fixture
+def write_usage():
+    """Writes a usage file with one long-lived pid and one pid on odd reports: write_usage(path, num_records)."""
+    def write(path, num_records, rss=1000):
+        with open(path, "w") as f:
+            for i in range(num_records):
+                processes = {"100": {"rss": rss + i, "vsz": 5000, "pcpu": 1.0, "pmem": 0.1, "cmd": "main"}}
+                if i % 2:
+                    processes["200"] = {"rss": 10, "vsz": 20, "pcpu": 50.0, "pmem": 0.0, "cmd": "child"}
+                record = {
+                    "timestamp": f"2025-10-03T12:00:{i:02d}.000000-05:00",
+                    "processes": processes,
+                    "totals": {"rss": rss + i, "vsz": 5000, "pcpu": 1.0 + (i % 2) * 50, "pmem": 0.1},
+                }
+                f.write(json.dumps(record) + "\n")
+    return write
+
+
+@pytest.fixture
+def summary_entry():
+    """Creates an entry under parent whose run has the given execution_summary: summary_entry(parent, name, ...)."""
+    def make(parent, name, **summary):
+        entry_dir = parent / name
+        entry_dir.mkdir(parents=True)
+        entry = GalleryEntry.from_directory(entry_dir)
+        entry.run_info = {"execution_summary": summary}
+        return entry
+    return make
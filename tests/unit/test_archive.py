@@ -0,0 +1,70 @@
+"""Unit tests for archived (skip-execution) run validation."""
+import asyncio
+import json
+
+from src.archive import load_archived_run, validate_run_info
+from src.models.entry_scan import EntryScan
+from src.models.gallery_entry import GalleryEntry
+
+VALID_INFO = {
+    "schema_version": "0.2.2",
+    "execution_summary": {"wall_clock_time": 1.0},
+    "output_paths": {"usage": ".duct/runusage.json"},
+}
+
+
+def test_validate_run_info_accepts_supported_schema():
+    """Test a current duct info.json is accepted."""
+    assert validate_run_info(VALID_INFO) is None
+
+
+def test_validate_run_info_accepts_older_and_newer_schemas():
+    """Test runs from other duct versions render as long as info.json locates the usage file."""
+    for version in ("0.1.0", "0.1.3", "0.3.0", "1.0.0"):
+        assert validate_run_info({**VALID_INFO, "schema_version": version}) is None, version
+    assert validate_run_info({k: v for k, v in VALID_INFO.items() if k != "schema_version"}) is None
+    assert validate_run_info({k: v for k, v in VALID_INFO.items() if k != "execution_summary"}) is None
+
+
+def test_validate_run_info_rejects_unreadable_layouts():
+    """Test runs below the minimum schema, with a malformed version or without a usage path are reported."""
+    assert "older than the minimum supported 0.1.0" in validate_run_info({**VALID_INFO, "schema_version": "0.0.9"})
+    assert "invalid schema_version" in validate_run_info({**VALID_INFO, "schema_version": "latest"})
+    assert validate_run_info({**VALID_INFO, "output_paths": {}}) == "usage path not in info.json"
+
+
+def test_load_archived_run_names_skipped_run(tmp_path, caplog):
+    """Test the warning for a rejected run names the entry and its info.json."""
+    duct = tmp_path / "archived" / ".duct"
+    duct.mkdir(parents=True)
+    (duct / "runinfo.json").write_text(json.dumps({**VALID_INFO, "schema_version": "0.0.1"}))
+    (duct / "runusage.json").write_text("{}\n")
+    entry = GalleryEntry.from_directory(duct.parent, EntryScan.scan(duct.parent))
+
+    assert asyncio.run(load_archived_run(entry)) is False
+    assert "Entry 'archived' skipped" in caplog.text
+    assert str(duct / "runinfo.json") in caplog.text
+
+
+def test_load_archived_run_sets_outputs(tmp_path):
+    """Test a valid archive entry gets its info and usage paths from the snapshot."""
+    duct = tmp_path / "archived" / ".duct"
+    duct.mkdir(parents=True)
+    (duct / "runinfo.json").write_text(json.dumps(VALID_INFO))
+    (duct / "runusage.json").write_text("{}\n")
+    entry = GalleryEntry.from_directory(duct.parent, EntryScan.scan(duct.parent))
+
+    assert asyncio.run(load_archived_run(entry)) is True
+    assert entry.usage_json == duct / "runusage.json"
+    assert entry.run_info == VALID_INFO
+
+
+def test_load_archived_run_missing_usage(tmp_path, caplog):
+    """Test an archive entry whose usage file is gone is skipped with a warning."""
+    duct = tmp_path / "archived" / ".duct"
+    duct.mkdir(parents=True)
+    (duct / "runinfo.json").write_text(json.dumps(VALID_INFO))
+    entry = GalleryEntry.from_directory(duct.parent, EntryScan.scan(duct.parent))
+
+    assert asyncio.run(load_archived_run(entry)) is False
+    assert "usage.json missing" in caplog.text
@@ -0,0 +1,83 @@
+"""Unit tests for repeated-run benchmarking."""
+import asyncio
+
+import pytest
+
+from src.benchmark import MetricStats, aggregate, run_repeats
+from src.models.gallery_entry import GalleryEntry
+
+# Stands in for `duct -p <prefix>`: writes an info and a usage file under the prefix
+FAKE_DUCT = r"""#!/bin/bash
+prefix="{prefix}"
+mkdir -p "$(dirname "${{prefix}}x")"
+echo '{{}}' > "${{prefix}}usage.json"
+printf '{{"execution_summary": {{"wall_clock_time": 1.0}}, "output_paths": {{"usage": "%susage.json"}}}}\n' \
+    "$prefix" > "${{prefix}}info.json"
+"""
+
+
+def test_metric_stats_from_samples():
+    """Test mean, median, stddev and t-based confidence interval."""
+    stats = MetricStats.from_samples([10.0, 12.0, 11.0, 13.0, 9.0])
+
+    assert stats.mean == pytest.approx(11.0)
+    assert stats.median == pytest.approx(11.0)
+    assert stats.stdev == pytest.approx(1.5811, rel=1e-3)
+    # t(0.975, df=4) = 2.776 -> half width 2.776 * 1.5811 / sqrt(5)
+    assert stats.ci_low == pytest.approx(11.0 - 1.963, rel=1e-3)
+    assert stats.ci_high == pytest.approx(11.0 + 1.963, rel=1e-3)
+    assert stats.n == 5
+
+
+def test_metric_stats_single_sample_has_zero_width():
+    """Test a single run yields a degenerate interval instead of an error."""
+    stats = MetricStats.from_samples([4.0])
+
+    assert (stats.stdev, stats.ci_low, stats.ci_high) == (0.0, 4.0, 4.0)
+
+
+def test_aggregate_skips_metrics_missing_from_a_run():
+    """Test metrics absent from any run summary are left out."""
+    infos = [
+        {"execution_summary": {"wall_clock_time": 1.0, "peak_rss": 100}},
+        {"execution_summary": {"wall_clock_time": 3.0}},
+    ]
+
+    stats = aggregate(infos)
+
+    assert list(stats) == ["wall_clock_time"]
+    assert stats["wall_clock_time"].mean == pytest.approx(2.0)
+
+
+def _entry(tmp_path, prefix):
+    (tmp_path / ".duct").mkdir()
+    script = tmp_path / "command.sh"
+    script.write_text(FAKE_DUCT.format(prefix=prefix))
+    script.chmod(0o755)
+    return GalleryEntry.from_directory(tmp_path)
+
+
+def test_run_repeats_gives_each_repeat_its_own_prefix(tmp_path):
+    """Test every repeat writes to its own .duct/repeats/run-<i>/, nothing lands in the shared .duct/."""
+    entry = _entry(tmp_path, "$DUCT_OUTPUT_PREFIX")
+
+    result = asyncio.run(run_repeats(entry, repeat=2, warmup=1, log_dir=tmp_path / "logs", timeout=10))
+
+    repeats = tmp_path / ".duct" / "repeats"
+    assert result.info_paths == [repeats / "run-0" / "info.json", repeats / "run-1" / "info.json"]
+    assert result.usage_files() == [repeats / "run-0" / "usage.json", repeats / "run-1" / "usage.json"]
+    assert result.stats["wall_clock_time"].n == 2
+    assert sorted(p.name for p in repeats.iterdir()) == ["run-0", "run-1"], "warmup outputs are dropped"
+    assert [p.name for p in (tmp_path / ".duct").iterdir()] == ["repeats"]
+
+
+def test_run_repeats_collects_outputs_of_a_fixed_prefix(tmp_path):
+    """Test outputs of a command.sh passing its own -p are moved into the run directories."""
+    entry = _entry(tmp_path, ".duct/run")
+
+    result = asyncio.run(run_repeats(entry, repeat=2, warmup=0, log_dir=tmp_path / "logs", timeout=10))
+
+    repeats = tmp_path / ".duct" / "repeats"
+    assert result.usage_files() == [repeats / "run-0" / "runusage.json", repeats / "run-1" / "runusage.json"]
+    assert all(path.exists() for path in result.usage_files())
+    assert (tmp_path / ".duct" / "runusage.json").exists(), "the last run stays in place"
@@ -0,0 +1,78 @@
+"""Unit tests for the incremental rebuild cache."""
+import json
+
+from src.cache import manifest_path, plot_settings_changed, restore_cached, write_manifest
+from src.models.gallery_entry import GalleryEntry
+from src.plot_generator import PlotSettings
+
+
+def _built_entry(tmp_path):
+    """Create an entry directory that looks like a completed build."""
+    entry_dir = tmp_path / "cached-entry"
+    (entry_dir / ".duct").mkdir(parents=True)
+    (entry_dir / "plots").mkdir()
+    (entry_dir / "setup.sh").write_text("#!/bin/bash\nexit 0\n")
+    (entry_dir / "command.sh").write_text("#!/bin/bash\nduct -p .duct/run -- true\n")
+    info = {"output_paths": {"usage": ".duct/runusage.json"}}
+    (entry_dir / ".duct" / "runinfo.json").write_text(json.dumps(info))
+    (entry_dir / ".duct" / "runusage.json").write_text('{"timestamp": "x"}\n')
+    (entry_dir / "plots" / "usage.png").write_bytes(b"png")
+
+    entry = GalleryEntry.from_directory(entry_dir)
+    entry.info_json = entry_dir / ".duct" / "runinfo.json"
+    entry.usage_json = entry_dir / ".duct" / "runusage.json"
+    entry.plot_path = entry_dir / "plots" / "usage.png"
+    write_manifest(entry, PlotSettings())
+    return entry_dir
+
+
+def test_restore_cached_without_manifest_is_miss(tmp_path):
+    """Test entries that were never built are rebuilt."""
+    entry_dir = tmp_path / "fresh"
+    entry_dir.mkdir()
+
+    assert restore_cached(GalleryEntry.from_directory(entry_dir)) is False
+
+
+def test_restore_cached_unchanged_entry_restores_outputs(tmp_path):
+    """Test an unchanged entry is served from its manifest."""
+    entry_dir = _built_entry(tmp_path)
+    entry = GalleryEntry.from_directory(entry_dir)
+
+    assert manifest_path(entry).exists(), "Manifest should be written next to the plot"
+    assert restore_cached(entry) is True
+    assert entry.usage_json == entry_dir / ".duct" / "runusage.json"
+    assert entry.plot_path == entry_dir / "plots" / "usage.png"
+
+
+def test_restore_cached_detects_changed_input(tmp_path):
+    """Test editing command.sh invalidates the cache."""
+    entry_dir = _built_entry(tmp_path)
+    (entry_dir / "command.sh").write_text("#!/bin/bash\nduct -p .duct/run -- false\n")
+
+    assert restore_cached(GalleryEntry.from_directory(entry_dir)) is False
+
+
+def test_restore_cached_detects_missing_plot(tmp_path):
+    """Test a deleted plot forces a rebuild."""
+    entry_dir = _built_entry(tmp_path)
+    (entry_dir / "plots" / "usage.png").unlink()
+
+    assert restore_cached(GalleryEntry.from_directory(entry_dir)) is False
+
+
+def test_restore_cached_detects_metadata_change(tmp_path):
+    """Test adding or editing metadata.json invalidates the cache."""
+    entry_dir = _built_entry(tmp_path)
+    (entry_dir / "metadata.json").write_text('{"timeout": 10}')
+
+    assert restore_cached(GalleryEntry.from_directory(entry_dir)) is False
+
+
+def test_plot_settings_change_requires_replot(tmp_path):
+    """Test a plot rendered with other settings is not reused."""
+    entry = GalleryEntry.from_directory(_built_entry(tmp_path))
+
+    assert plot_settings_changed(entry, PlotSettings()) is False
+    assert plot_settings_changed(entry, PlotSettings(downsample="lttb")) is True
+    assert plot_settings_changed(entry, PlotSettings(engine="con-duct")) is True
@@ -0,0 +1,79 @@
+"""Unit tests for comparison plots."""
+import json
+import shutil
+
+import pytest
+
+from src.comparisons import load_comparisons, render_comparisons
+from src.models.gallery_entry import GalleryEntry
+
+def _gallery(tmp_path, groups, usage_file):
+    gallery = tmp_path / "gallery"
+    entries = []
+    for name in ("a", "b"):
+        duct = gallery / name / ".duct"
+        duct.mkdir(parents=True)
+        shutil.copy(usage_file, duct / "runusage.json")
+        entry = GalleryEntry.from_directory(duct.parent)
+        entry.usage_json = duct / "runusage.json"
+        entries.append(entry)
+    (gallery / "comparisons.json").write_text(json.dumps(groups))
+    return gallery, entries
+
+
+def test_load_comparisons_resolves_entries_and_paths(tmp_path, usage_file):
+    """Test members may be entry names or usage paths relative to the gallery."""
+    gallery, entries = _gallery(tmp_path, [
+        {"name": "ab", "entries": ["a", {"label": "old b", "path": "b/.duct/runusage.json"}], "time_axis": "relative"},
+    ], usage_file)
+
+    [comparison] = load_comparisons(gallery, entries)
+
+    assert comparison.members == [("a", entries[0].usage_json), ("old b", gallery / "b" / ".duct" / "runusage.json")]
+    assert comparison.time_axis == "relative"
+
+
+def test_load_comparisons_drops_incomplete_groups(tmp_path, usage_file, caplog):
+    """Test groups with unknown members or a bad time axis are skipped with a warning."""
+    gallery, entries = _gallery(tmp_path, [
+        {"name": "missing", "entries": ["a", "zzz"]},
+        {"name": "axis", "entries": ["a", "b"], "time_axis": "wallclock"},
+    ], usage_file)
+
+    assert load_comparisons(gallery, entries) == []
+    assert "member 'zzz' skipped" in caplog.text
+    assert "time_axis must be one of" in caplog.text
+
+
+def test_load_comparisons_without_file(tmp_path):
+    """Test galleries without comparisons.json have no comparisons."""
+    assert load_comparisons(tmp_path, []) == []
+
+
+def test_render_comparisons_writes_png(tmp_path, usage_file):
+    """Test each comparison is rendered to comparisons/<name>.png."""
+    pytest.importorskip("matplotlib")
+    gallery, entries = _gallery(tmp_path, [{"name": "a-vs-b", "entries": ["a", "b"]},
+                                           {"name": "a vs b", "entries": ["b", "a"]}], usage_file)
+
+    first, second = render_comparisons(load_comparisons(gallery, entries), tmp_path / "out")
+
+    assert first.plot_path == tmp_path / "out" / "comparisons" / "a-vs-b.png"
+    assert first.plot_path.read_bytes().startswith(b"\x89PNG")
+    assert second.plot_path.name.startswith("a-vs-b-") and second.plot_path.exists(), "names must not collide"
+
+
+def test_render_comparisons_keeps_unchanged_plots(tmp_path, usage_file, monkeypatch):
+    """Test only comparisons with a changed member are rendered again."""
+    pytest.importorskip("matplotlib")
+    gallery, entries = _gallery(tmp_path, [{"name": "ab", "entries": ["a", "b"]}], usage_file)
+    render_comparisons(load_comparisons(gallery, entries), tmp_path / "out")
+    rendered = []
+    monkeypatch.setattr("src.comparisons.get_engine", lambda: rendered.append(True))
+
+    [comparison] = render_comparisons(load_comparisons(gallery, entries), tmp_path / "out", changed={"c"})
+
+    assert comparison.plot_path == tmp_path / "out" / "comparisons" / "ab.png"
+    assert not rendered
+    render_comparisons(load_comparisons(gallery, entries), tmp_path / "out", changed={"a"})
+    assert rendered
@@ -0,0 +1,67 @@
+"""Unit tests for gallery discovery."""
+from src.discovery import discover_entries
+
+
+def _make_gallery(tmp_path):
+    gallery = tmp_path / "gallery"
+    execute = gallery / "b-execute"
+    (execute / ".duct").mkdir(parents=True)
+    (execute / "setup.sh").write_text("#!/bin/bash\n")
+    (execute / "command.sh").write_text("#!/bin/bash\n")
+    skip = gallery / "a-skip" / ".duct"
+    skip.mkdir(parents=True)
+    (skip / "runinfo.json").write_text("{}")
+    (skip / "runusage.jsonl").write_text("")
+    invalid = gallery / "c-invalid"
+    invalid.mkdir()
+    (invalid / "command.sh").write_text("#!/bin/bash\n")
+    (gallery / "README.md").write_text("not an entry")
+    return gallery
+
+
+def test_discover_entries_sorted_and_validated(tmp_path):
+    """Test entries come back sorted, invalid execute entries are dropped, files ignored."""
+    entries = discover_entries(_make_gallery(tmp_path))
+
+    assert [entry.name for entry in entries] == ["a-skip", "b-execute"]
+    assert entries[0].skip_execution is True
+    assert entries[1].skip_execution is False
+
+
+def test_discover_entries_snapshot_locates_duct_files(tmp_path):
+    """Test the discovery snapshot locates info.json and the matching usage file."""
+    entries = discover_entries(_make_gallery(tmp_path))
+    skip = entries[0]
+
+    assert skip.info_files() == [skip.path / ".duct" / "runinfo.json"]
+    assert skip.scan.usage_candidates() == [skip.path / ".duct" / "runusage.jsonl"]
+
+
+def test_info_files_refresh_sees_new_logs(tmp_path):
+    """Test refreshing the snapshot picks up logs written after discovery."""
+    entries = discover_entries(_make_gallery(tmp_path))
+    execute = entries[1]
+    (execute.path / ".duct" / "runinfo.json").write_text("{}")
+
+    assert execute.info_files() == []
+    assert execute.info_files(refresh=True) == [execute.path / ".duct" / "runinfo.json"]
+
+
+def test_discover_entries_missing_gallery(tmp_path):
+    """Test a missing gallery directory yields no entries."""
+    assert discover_entries(tmp_path / "missing") == []
+
+
+def test_snapshot_stats_files_on_first_use(tmp_path):
+    """Test discovery does not stat files up front; stats are taken (and kept) when first asked for."""
+    entries = discover_entries(_make_gallery(tmp_path))
+    skip = entries[0]
+    usage = skip.path / ".duct" / "runusage.jsonl"
+    usage.write_text("{}\n")
+    (skip.path / ".duct" / "runinfo.json").unlink()
+
+    assert skip.scan.stat(".duct/runusage.jsonl").st_size == 3
+    usage.write_text("{}\n{}\n")
+    assert skip.scan.stat(".duct/runusage.jsonl").st_size == 3, "the first stat is cached"
+    assert skip.scan.stat(".duct/runinfo.json") is None
+    assert skip.scan.stat("setup.sh") is None
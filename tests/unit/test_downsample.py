@@ -0,0 +1,69 @@
+"""Unit tests for usage series downsampling."""
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.downsample import downsample  # noqa: E402
+
+
+def _spiky_series(n=100_000, spike_at=54_321):
+    x = np.arange(n, dtype=float)
+    y = np.sin(x / 1000.0)
+    y[spike_at] = 50.0
+    return x, y
+
+
+@pytest.mark.parametrize("method", ["minmax", "lttb"])
+def test_downsample_bounds_points_and_keeps_endpoints(method):
+    """Test output never exceeds max_points and keeps first and last sample."""
+    x, y = _spiky_series()
+
+    dx, dy = downsample(x, y, 500, method)
+
+    assert len(dx) <= 500
+    assert dx[0] == 0 and dx[-1] == len(x) - 1
+    assert np.all(np.diff(dx) > 0), "Samples should stay in time order"
+
+
+@pytest.mark.parametrize("method", ["minmax", "lttb"])
+def test_downsample_keeps_spike(method):
+    """Test a single-sample spike survives downsampling."""
+    x, y = _spiky_series()
+
+    dx, dy = downsample(x, y, 500, method)
+
+    assert dy.max() == 50.0 and 54_321 in dx
+
+
+def test_downsample_short_series_unchanged():
+    """Test series already under the bound are returned as-is."""
+    dx, dy = downsample([0.0, 1.0, 2.0], [5.0, 6.0, 7.0], 500)
+
+    assert list(dy) == [5.0, 6.0, 7.0]
+
+
+def test_downsample_unknown_method():
+    """Test an unknown method is rejected."""
+    with pytest.raises(ValueError):
+        downsample([0.0], [0.0], 10, "average")
+
+
+@pytest.mark.parametrize("method,smallest", [("minmax", 4), ("lttb", 3)])
+def test_downsample_rejects_unusable_budget(method, smallest):
+    """Test a budget too small to downsample to fails instead of returning every sample."""
+    x, y = _spiky_series(n=100, spike_at=50)
+
+    assert len(downsample(x, y, smallest, method)[0]) <= smallest
+    with pytest.raises(ValueError):
+        downsample(x, y, smallest - 1, method)
+
+
+def test_plot_points_option_rejects_small_budgets():
+    """Test --plot-points below the minimum is a usage error."""
+    import argparse
+
+    from src.cli import plot_points
+
+    assert plot_points("4") == 4
+    with pytest.raises(argparse.ArgumentTypeError):
+        plot_points("3")
@@ -0,0 +1,74 @@
+"""Unit tests for script execution."""
+import asyncio
+import time
+from pathlib import Path
+
+from src.executor import execute_script, execute_script_async
+
+
+def _is_running(pid):
+    """True if pid exists and is not a zombie waiting to be reaped."""
+    try:
+        stat = Path(f"/proc/{pid}/stat").read_text()
+    except FileNotFoundError:
+        return False
+    return stat.rsplit(")", 1)[1].split()[0] != "Z"
+
+
+def _script(path, body):
+    path.write_text(f"#!/bin/bash\n{body}\n")
+    path.chmod(0o755)
+    return path
+
+
+def test_execute_script_streams_output_to_logs(tmp_path):
+    """Test stdout and stderr are written to per-script log files."""
+    script = _script(tmp_path / "command.sh", "echo out; echo err >&2; exit 3")
+
+    result = execute_script(script, tmp_path, tmp_path / "logs")
+
+    assert result.success is False and result.returncode == 3
+    assert result.stdout_path == tmp_path / "logs" / "command.stdout"
+    assert result.stdout_path.read_text() == "out\n"
+    assert result.stderr_path.read_text() == "err\n"
+
+
+def test_execute_script_timeout_kills_process_group(tmp_path):
+    """Test a timeout kills background children too, not only the script."""
+    pid_file = tmp_path / "child.pid"
+    script = _script(tmp_path / "command.sh", f"sleep 60 & echo $! > {pid_file}; wait")
+
+    start = time.monotonic()
+    result = execute_script(script, tmp_path, tmp_path / "logs", timeout=0.5)
+
+    assert result.timed_out is True and result.success is False
+    assert time.monotonic() - start < 10
+    child = int(pid_file.read_text())
+    deadline = time.monotonic() + 2
+    while _is_running(child) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not _is_running(child), "Background child should be killed with its process group"
+
+
+def test_cancelled_script_kills_process_group(tmp_path):
+    """Test cancelling a run (as Ctrl-C does) kills the script's process tree."""
+    pid_file = tmp_path / "child.pid"
+    script = _script(tmp_path / "command.sh", f"sleep 60 & echo $! > {pid_file}; wait")
+
+    async def cancel_when_started():
+        task = asyncio.create_task(execute_script_async(script, tmp_path, tmp_path / "logs", timeout=None))
+        while not pid_file.exists() or not pid_file.read_text().strip():
+            await asyncio.sleep(0.05)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            return True
+        return False
+
+    assert asyncio.run(cancel_when_started()), "Cancellation should propagate"
+    child = int(pid_file.read_text())
+    deadline = time.monotonic() + 2
+    while _is_running(child) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not _is_running(child), "Background child should be killed when the run is cancelled"
@@ -0,0 +1,44 @@
+"""Unit tests for entry footprint estimation."""
+import json
+
+import pytest
+
+from src.footprint import Footprint, estimate_footprint, parse_size
+from src.models.gallery_entry import GalleryEntry
+
+
+def _entry(tmp_path, metadata=None, summary=None):
+    entry_dir = tmp_path / "entry"
+    entry_dir.mkdir()
+    (entry_dir / "command.sh").write_text("#!/bin/bash\n")
+    if metadata is not None:
+        (entry_dir / "metadata.json").write_text(json.dumps(metadata))
+    if summary is not None:
+        (entry_dir / ".duct").mkdir()
+        (entry_dir / ".duct" / "runinfo.json").write_text(json.dumps({"execution_summary": summary}))
+    return GalleryEntry.from_directory(entry_dir)
+
+
+def test_parse_size():
+    """Test byte sizes with binary unit suffixes."""
+    assert parse_size("512") == 512
+    assert parse_size("1.5K") == 1536
+    assert parse_size("16G") == 16 << 30
+    assert parse_size("2MiB") == 2 << 20
+    with pytest.raises(ValueError):
+        parse_size("lots")
+
+
+def test_estimate_footprint_from_previous_run(tmp_path):
+    """Test the previous run's execution_summary is used when nothing is declared."""
+    entry = _entry(tmp_path, summary={"average_pcpu": 150.0, "peak_rss": 4096, "wall_clock_time": 12.5})
+
+    assert estimate_footprint(entry) == Footprint(cpu=150.0, memory=4096, duration=12.5)
+
+
+def test_estimate_footprint_metadata_overrides_history(tmp_path):
+    """Test declared limits win over the run index history."""
+    entry = _entry(tmp_path, metadata={"cpu": 400, "memory": "2G"})
+    history = {"entry": {"average_pcpu": 90.0, "peak_rss": 1024, "wall_clock_time": 3.0}}
+
+    assert estimate_footprint(entry, history) == Footprint(cpu=400, memory=2 << 30, duration=3.0)
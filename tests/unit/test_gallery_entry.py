@@ -1,4 +1,5 @@
 """Unit tests for GalleryEntry model."""
+import json
 from pathlib import Path
 import tempfile
 import pytest
@@ -49,3 +50,31 @@ def test_skip_execution_returns_inverse_of_has_command_script(tmp_path):
     assert entry_without.skip_execution is True, "skip_execution should be True when command.sh missing"
     assert entry_without.skip_execution == (not entry_without.has_command_script), \
         "skip_execution should be inverse of has_command_script"
+
+
+def test_from_directory_loads_metadata(tmp_path):
+    """Test metadata.json in the entry directory populates metadata."""
+    entry_dir = tmp_path / "test-entry"
+    entry_dir.mkdir()
+    (entry_dir / "metadata.json").write_text('{"timeout": 900}')
+
+    entry = GalleryEntry.from_directory(entry_dir)
+
+    assert entry.metadata == {"timeout": 900}, "metadata should be read from metadata.json"
+
+
+@pytest.mark.parametrize("value", ["1; rm -rf ~", None, -5, 0, True, [30], "nan"])
+def test_invalid_metadata_timeout_is_ignored(tmp_path, value):
+    """Test timeouts that are not positive numbers are dropped instead of reaching the executor."""
+    (tmp_path / "metadata.json").write_text(json.dumps({"timeout": value, "cpu": 100}))
+
+    entry = GalleryEntry.from_directory(tmp_path)
+
+    assert entry.metadata == {"cpu": 100}
+
+
+def test_numeric_metadata_timeout_is_coerced(tmp_path):
+    """Test numeric timeouts, including numeric strings, become floats."""
+    (tmp_path / "metadata.json").write_text(json.dumps({"timeout": "90"}))
+
+    assert GalleryEntry.from_directory(tmp_path).metadata["timeout"] == 90.0
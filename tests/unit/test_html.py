@@ -0,0 +1,81 @@
+"""Unit tests for the HTML renderer."""
+import json
+import shutil
+
+from src.models.gallery_entry import GalleryEntry
+from src.path_utils import safe_name
+from src.plot_generator import PlotSettings
+from src.renderers.html import DATA_DIR, series_payload, write_html
+
+def _entry(tmp_path, name, usage_file):
+    duct = tmp_path / "gallery" / name / ".duct"
+    duct.mkdir(parents=True)
+    shutil.copy(usage_file, duct / "runusage.json")
+    entry = GalleryEntry.from_directory(duct.parent)
+    entry.usage_json = duct / "runusage.json"
+    entry.command_text = "echo <hi>"
+    return entry
+
+
+def test_series_payload_respects_point_budget(usage_file):
+    """Test the series holds both metrics within the plot point budget."""
+    payload = series_payload(usage_file, PlotSettings(max_points=4))
+
+    assert set(payload) == {"pcpu", "rss"}
+    for series in payload.values():
+        assert 0 < len(series["t"]) == len(series["v"]) <= 4
+        assert series["t"] == sorted(series["t"])
+
+
+def test_write_html_lazy_loads_series(tmp_path, usage_file):
+    """Test the page references per-entry series scripts instead of embedding data."""
+    entry = _entry(tmp_path, "a b", usage_file)
+    output_dir = tmp_path / "html"
+
+    index = write_html([entry], output_dir)
+
+    page = index.read_text()
+    slug = safe_name("a b", "entry")
+    assert f'data-src="data/{slug}.js"' in page
+    assert "echo &lt;hi&gt;" in page
+    header, script = (output_dir / DATA_DIR / f"{slug}.js").read_text().split("\n", 1)
+    assert header.startswith("// ")
+    prefix = f'gallerySeries("plot-{slug}", '
+    assert script.startswith(prefix)
+    payload = json.loads(script[len(prefix):-len(");\n")])
+    assert set(payload) == {"pcpu", "rss"}
+
+
+def test_write_html_reuses_unchanged_series(tmp_path, usage_file):
+    """Test series scripts are only rewritten when the usage file changes."""
+    entry = _entry(tmp_path, "a", usage_file)
+    output_dir = tmp_path / "html"
+    write_html([entry], output_dir)
+    series = output_dir / DATA_DIR / "a.js"
+    header = series.read_text().split("\n", 1)[0]
+    series.write_text(header + "\nstale")
+
+    write_html([entry], output_dir)
+    assert series.read_text().endswith("\nstale")
+
+    entry.usage_json.touch()
+    write_html([entry], output_dir)
+    assert series.read_text().split("\n")[1].startswith("gallerySeries(")
+
+
+def test_write_html_rewrites_series_when_plot_settings_change(tmp_path, usage_file):
+    """Test series scripts written with another point budget or method are not reused."""
+    entry = _entry(tmp_path, "a", usage_file)
+    output_dir = tmp_path / "html"
+    write_html([entry], output_dir, PlotSettings(max_points=8))
+    series = output_dir / DATA_DIR / "a.js"
+    header = series.read_text().split("\n", 1)[0]
+    series.write_text(header + "\nstale")
+
+    write_html([entry], output_dir, PlotSettings(max_points=8, downsample="lttb"))
+    assert not series.read_text().endswith("\nstale")
+    assert series.read_text().split("\n", 1)[0] != header
+
+    series.write_text(series.read_text().split("\n", 1)[0] + "\nstale")
+    write_html([entry], output_dir, PlotSettings(max_points=16, downsample="lttb"))
+    assert not series.read_text().endswith("\nstale")
@@ -0,0 +1,60 @@
+"""Unit tests for plot image storage."""
+import io
+
+import pytest
+
+from src.images import ensure_thumbnail, optimize_png, store_png, thumbnail_path, write_if_changed
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def _png(color=(255, 0, 0), size=(200, 100)):
+    out = io.BytesIO()
+    Image.new("RGB", size, color).save(out, format="PNG", compress_level=0)
+    return out.getvalue()
+
+
+def test_optimize_png_is_lossless_and_smaller():
+    """Test recompression keeps the pixels and does not grow the file."""
+    data = _png()
+
+    optimized = optimize_png(data)
+
+    assert len(optimized) < len(data)
+    with Image.open(io.BytesIO(data)) as before, Image.open(io.BytesIO(optimized)) as after:
+        assert before.tobytes() == after.tobytes()
+
+
+def test_identical_image_is_not_rewritten(tmp_path):
+    """Test storing the same image twice leaves the file untouched."""
+    plot = tmp_path / "usage.png"
+    assert store_png(plot, _png())
+    mtime = plot.stat().st_mtime_ns
+
+    assert not store_png(plot, _png())
+    assert plot.stat().st_mtime_ns == mtime
+    assert store_png(plot, _png(color=(0, 0, 255)))
+
+
+def test_write_if_changed_detects_same_size_content(tmp_path):
+    """Test content of equal size but different bytes is written."""
+    path = tmp_path / "data"
+    write_if_changed(path, b"aaaa")
+
+    assert write_if_changed(path, b"bbbb")
+    assert path.read_bytes() == b"bbbb"
+
+
+def test_ensure_thumbnail_scales_and_refreshes(tmp_path):
+    """Test thumbnails keep the aspect ratio and follow width changes."""
+    plot = tmp_path / "usage.png"
+    store_png(plot, _png())
+
+    thumb = ensure_thumbnail(plot, 50)
+
+    assert thumb == thumbnail_path(plot) == tmp_path / "usage.thumb.png"
+    with Image.open(thumb) as image:
+        assert image.size == (50, 25)
+    ensure_thumbnail(plot, 100)
+    with Image.open(thumb) as image:
+        assert image.size == (100, 50)
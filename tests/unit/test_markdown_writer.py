@@ -0,0 +1,62 @@
+"""Unit tests for the streaming markdown writer."""
+from src.cache import fragment_key, store_fragment, write_manifest
+from src.models.gallery_entry import GalleryEntry
+from src.renderers.markdown import MarkdownWriter, render_markdown
+
+
+def _entry(tmp_path, name):
+    entry_dir = tmp_path / "gallery" / name
+    entry_dir.mkdir(parents=True)
+    entry = GalleryEntry.from_directory(entry_dir)
+    entry.command_text = f"echo {name}"
+    return entry
+
+
+def test_writer_matches_render_markdown_in_discovery_order(tmp_path):
+    """Test sections finishing out of order are written in discovery order."""
+    entries = [_entry(tmp_path, name) for name in ("a", "b", "c")]
+    output_path = tmp_path / "README.md"
+
+    with MarkdownWriter(output_path, entries) as writer:
+        writer.add(entries[2], True)
+        writer.add(entries[0], True)
+        writer.add(entries[1], False)
+        writer.commit()
+
+    assert writer.written == 2
+    assert output_path.read_text() == render_markdown([entries[0], entries[2]], output_path)
+
+
+def test_writer_without_commit_keeps_previous_output(tmp_path):
+    """Test an interrupted run leaves the old README and no temporary files."""
+    entries = [_entry(tmp_path, "a")]
+    output_path = tmp_path / "README.md"
+    output_path.write_text("previous")
+
+    with MarkdownWriter(output_path, entries) as writer:
+        writer.add(entries[0], True)
+
+    assert output_path.read_text() == "previous"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["README.md", "gallery"]
+
+
+def test_writer_reuses_fragment_of_cached_entry(tmp_path):
+    """Test unchanged entries reuse their cached section instead of re-rendering."""
+    entry = _entry(tmp_path, "a")
+    (entry.path / ".duct").mkdir()
+    (entry.path / "plots").mkdir()
+    for name in ("setup.sh", "command.sh", ".duct/info.json", ".duct/usage.json", "plots/usage.png"):
+        (entry.path / name).write_text(name)
+    entry.info_json = entry.path / ".duct" / "info.json"
+    entry.usage_json = entry.path / ".duct" / "usage.json"
+    entry.plot_path = entry.path / "plots" / "usage.png"
+    write_manifest(entry)
+    output_path = tmp_path / "README.md"
+    store_fragment(entry, fragment_key(entry, output_path), "cached section\n")
+
+    entry.cached = True
+    with MarkdownWriter(output_path, [entry]) as writer:
+        writer.add(entry, True)
+        writer.commit()
+
+    assert output_path.read_text() == "# Gallery\n\ncached section\n"
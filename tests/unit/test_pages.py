@@ -0,0 +1,56 @@
+"""Unit tests for sharded gallery output."""
+from src.models.gallery_entry import GalleryEntry
+from src.renderers.pages import shard_entries, write_pages
+
+
+def _entries(tmp_path, *names):
+    entries = []
+    for name in names:
+        entry_dir = tmp_path / "gallery" / name
+        entry_dir.mkdir(parents=True)
+        entry = GalleryEntry.from_directory(entry_dir)
+        entry.command_text = f"echo {name}"
+        entries.append(entry)
+    return entries
+
+
+def test_shard_entries_by_prefix(tmp_path):
+    """Test entries are grouped by name prefix and split into pages."""
+    entries = _entries(tmp_path, "cpu-a", "io-a", "cpu-b", "cpu-c")
+
+    shards = shard_entries(entries, page_size=2, group_by="prefix")
+
+    assert [(s.filename, [e.name for e in s.entries]) for s in shards] == [
+        ("cpu-1.md", ["cpu-a", "cpu-b"]),
+        ("cpu-2.md", ["cpu-c"]),
+        ("io-1.md", ["io-a"]),
+    ]
+
+
+def test_shard_entries_by_metadata_tag(tmp_path):
+    """Test the metadata "group" key selects the page, untagged entries go to "other"."""
+    entries = _entries(tmp_path, "a", "b", "c")
+    entries[0].metadata = {"group": "gpu-jobs"}
+    entries[1].metadata = {"group": "gpu jobs"}
+
+    shards = shard_entries(entries, page_size=10, group_by="tag")
+
+    filenames = [s.filename for s in shards]
+    assert filenames[0] == "gpu-jobs-1.md"
+    assert filenames[1].startswith("gpu-jobs-") and filenames[1] != filenames[0], "similar groups must not share a page"
+    assert filenames[2] == "other-1.md"
+
+
+def test_write_pages_rewrites_only_changed_pages(tmp_path):
+    """Test unchanged pages are not rewritten and removed pages are deleted."""
+    entries = _entries(tmp_path, "a", "b", "c")
+    index = tmp_path / "README.md"
+
+    assert write_pages(entries, index, page_size=1) == 3
+    entries[1].command_text = "echo changed"
+    assert write_pages(entries, index, page_size=1) == 1
+    write_pages(entries[:2], index, page_size=1)
+
+    assert sorted(p.name for p in (tmp_path / "pages").glob("*.md")) == ["page-1.md", "page-2.md"]
+    assert "pages/page-2.md" in index.read_text()
+    assert "echo changed" in (tmp_path / "pages" / "page-2.md").read_text()
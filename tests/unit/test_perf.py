@@ -0,0 +1,38 @@
+"""Unit tests for the pipeline benchmark suite."""
+from src.perf import StageResult, format_results, measure, results_document, run_suite
+from src.synthetic import generate_gallery
+
+
+def test_measure_times_every_run_and_traces_memory_once():
+    """Test measure runs setup before each timed run and the traced run."""
+    calls = []
+
+    result = measure(lambda: calls.append("run") or 5, repeat=2, setup=lambda: calls.append("setup"))
+
+    assert calls == ["setup", "run"] * 3
+    assert result.items == 5
+    assert len(result.runs) == 2
+    assert result.seconds == min(result.runs)
+    assert result.peak_memory is not None
+    assert measure(lambda: 1, repeat=1, memory=False).peak_memory is None
+
+
+def test_run_suite_measures_pipeline_stages(tmp_path):
+    """Test the suite processes and renders every synthetic entry."""
+    generate_gallery(tmp_path, entries=4, samples=5, processes=2)
+
+    results = run_suite(tmp_path, repeat=1, plot_entries=0, memory=False)
+
+    assert list(results) == ["discover", "process", "render"]
+    assert all(result.items == 4 for result in results.values())
+
+
+def test_format_results_compares_with_previous_run():
+    """Test the change column is the relative wall time against the earlier results."""
+    current = results_document({"render": StageResult(10, [1.5], 2 ** 20)}, {}, {})
+    previous = results_document({"render": StageResult(10, [2.0])}, {}, {})
+
+    table = format_results(current, previous).splitlines()
+
+    assert table[0].split() == ["STAGE", "ITEMS", "SECONDS", "ITEMS/S", "PEAK", "MEM", "CHANGE"]
+    assert table[1].split() == ["render", "10", "1.5000", "6.7", "1.0", "MiB", "-25.0%"]
@@ -0,0 +1,86 @@
+"""Unit tests for dry-run planning."""
+import json
+import subprocess
+import sys
+
+from src.cache import write_manifest
+from src.models.gallery_entry import GalleryEntry
+from src.plot_generator import PlotSettings
+from src.plan import format_plan, plan_entries, plan_entry
+
+
+def _entry(tmp_path, name="entry", command=True):
+    entry_dir = tmp_path / name
+    (entry_dir / ".duct").mkdir(parents=True)
+    (entry_dir / "setup.sh").write_text("#!/bin/bash\nexit 0\n")
+    if command:
+        (entry_dir / "command.sh").write_text("#!/bin/bash\nduct -p .duct/run -- true\n")
+    return entry_dir
+
+
+def _build(entry_dir):
+    """Make entry_dir look like a completed build."""
+    (entry_dir / "plots").mkdir()
+    info = {"output_paths": {"usage": ".duct/runusage.json"}}
+    (entry_dir / ".duct" / "runinfo.json").write_text(json.dumps(info))
+    (entry_dir / ".duct" / "runusage.json").write_text('{"timestamp": "x"}\n')
+    (entry_dir / "plots" / "usage.png").write_bytes(b"png")
+    entry = GalleryEntry.from_directory(entry_dir)
+    entry.info_json = entry_dir / ".duct" / "runinfo.json"
+    entry.usage_json = entry_dir / ".duct" / "runusage.json"
+    entry.plot_path = entry_dir / "plots" / "usage.png"
+    write_manifest(entry, PlotSettings())
+
+
+def test_plan_reports_cache_state(tmp_path):
+    """Test fresh, unchanged and edited entries get the matching action and reason."""
+    entry_dir = _entry(tmp_path)
+    plan = plan_entry(GalleryEntry.from_directory(entry_dir))
+    assert (plan.action, plan.reason) == ("execute", "no previous build")
+
+    _build(entry_dir)
+    assert plan_entry(GalleryEntry.from_directory(entry_dir)).action == "cached"
+    assert plan_entry(GalleryEntry.from_directory(entry_dir), use_cache=False).reason == "--no-cache"
+    assert plan_entry(GalleryEntry.from_directory(entry_dir), benchmarking=True).action == "execute"
+
+    plan = plan_entry(GalleryEntry.from_directory(entry_dir), plot_settings=PlotSettings(max_points=100))
+    assert (plan.action, plan.reason) == ("replot", "plot settings changed")
+    assert plan_entry(GalleryEntry.from_directory(entry_dir), plot_settings=PlotSettings()).action == "cached"
+
+    (entry_dir / "command.sh").write_text("#!/bin/bash\nduct -p .duct/run -- false\n")
+    plan = plan_entry(GalleryEntry.from_directory(entry_dir))
+    assert (plan.action, plan.reason) == ("execute", "command.sh changed")
+
+
+def test_plan_skip_and_drop_entries(tmp_path):
+    """Test entries without command.sh are re-plotted, or dropped without an archived run."""
+    broken = GalleryEntry.from_directory(_entry(tmp_path, "broken", command=False))
+    archived_dir = _entry(tmp_path, "archived", command=False)
+    info = {"schema_version": "0.2.2", "execution_summary": {},
+            "output_paths": {"usage": ".duct/runusage.json"}}
+    (archived_dir / ".duct" / "runinfo.json").write_text(json.dumps(info))
+    archived = GalleryEntry.from_directory(archived_dir)
+
+    plans = plan_entries([archived, broken])
+
+    assert [plan.action for plan in plans] == ["skip", "drop"]
+    assert "info.json missing" in plans[1].reason
+    assert format_plan(plans).splitlines()[-1] == "0 execute, 1 skip, 0 replot, 0 cached, 1 drop"
+
+
+def test_dry_run_does_not_import_the_pipeline(tmp_path):
+    """Test planning never loads the executor, plotting or asyncio."""
+    _entry(tmp_path)
+    code = (
+        "import sys\n"
+        f"sys.argv = ['con-duct-gallery', '--dry-run', '--gallery-dir', {str(tmp_path)!r}]\n"
+        "from src.cli import main\n"
+        "main()\n"
+        "heavy = ['asyncio', 'subprocess', 'multiprocessing', 'matplotlib', 'numpy',\n"
+        "         'src.executor', 'src.gallery_render']\n"
+        "print(','.join(m for m in heavy if m in sys.modules))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+    assert result.stdout.splitlines()[-1] == ""
+    assert "execute" in result.stdout
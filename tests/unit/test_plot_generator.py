@@ -0,0 +1,45 @@
+"""Unit tests for in-process plot generation."""
+import pytest
+
+from src.plot_generator import PlotSettings, generate_plot
+
+pytest.importorskip("matplotlib")
+
+
+def test_generate_plot_in_process(tmp_path, usage_file):
+    """Test the in-process engine writes a PNG without calling con-duct."""
+    plot_path = generate_plot(usage_file, tmp_path / "plots", PlotSettings(engine="inprocess"))
+
+    assert plot_path == tmp_path / "plots" / "usage.png"
+    assert plot_path.read_bytes().startswith(b"\x89PNG"), "Output should be a PNG image"
+
+
+def test_render_batch_reports_failures_per_job(tmp_path, usage_file):
+    """Test a bad usage file fails only its own job in a batch."""
+    from src.plot_generator import get_engine
+
+    broken = tmp_path / "broken.json"
+    broken.write_text("not json\n")
+
+    results = get_engine().render_batch([
+        (usage_file, tmp_path / "a" / "usage.png"),
+        (broken, tmp_path / "b" / "usage.png"),
+    ])
+
+    assert results == [tmp_path / "a" / "usage.png", None]
+
+
+def test_plot_pool_renders_in_worker_process(tmp_path, usage_file):
+    """Test the process pool writes the same PNG as in-process rendering."""
+    import asyncio
+
+    from src.plot_generator import PlotPool
+
+    pool = PlotPool(1)
+    try:
+        plot_path = asyncio.run(pool.generate(usage_file, tmp_path / "plots", PlotSettings()))
+    finally:
+        pool.close()
+
+    assert plot_path == tmp_path / "plots" / "usage.png"
+    assert plot_path.read_bytes().startswith(b"\x89PNG")
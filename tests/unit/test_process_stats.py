@@ -0,0 +1,100 @@
+"""Unit tests for the per-process breakdown."""
+import json
+from dataclasses import replace
+
+import pytest
+
+from src.models.gallery_entry import GalleryEntry
+from src.process_stats import analyze_usage, sparkline
+from src.renderers.markdown import render_entry
+
+pytest.importorskip("numpy")
+
+# Per report, one second apart: pid -> (cmd, pcpu, rss)
+REPORTS = [
+    {"1": ("make", 10.0, 100)},
+    {"1": ("make", 10.0, 100), "2": ("cc x.c", 100.0, 1000), "3": ("cc y.c", 50.0, 3000)},
+    {"1": ("make", 10.0, 100), "4": ("cc x.c", 80.0, 2000)},
+    {"1": ("make", 10.0, 100), "5": ("ld", 100.0, 500)},
+]
+
+
+def _write_usage(path):
+    with open(path, "w") as f:
+        for i, processes in enumerate(REPORTS):
+            record = {
+                "timestamp": f"2025-10-03T12:00:{i:02d}.000000-05:00",
+                "processes": {pid: {"cmd": cmd, "pcpu": pcpu, "rss": rss, "vsz": 0, "pmem": 0.0}
+                              for pid, (cmd, pcpu, rss) in processes.items()},
+                "totals": {"rss": 0, "vsz": 0, "pcpu": 0.0, "pmem": 0.0},
+            }
+            f.write(json.dumps(record) + "\n")
+    return path
+
+
+def test_processes_with_same_command_are_combined(tmp_path):
+    """Test CPU time, peaks and lifetimes are computed per command line."""
+    breakdown = analyze_usage(_write_usage(tmp_path / "usage.json"), limit=5)
+
+    stats = {s.cmd: s for s in breakdown.top}
+    assert [s.cmd for s in breakdown.top] == ["cc x.c", "ld", "cc y.c", "make"]
+    assert stats["cc x.c"].count == 2
+    assert stats["cc x.c"].cpu_seconds == pytest.approx(1.8)
+    assert stats["cc x.c"].peak_pcpu == 100.0
+    assert stats["cc x.c"].peak_rss == 2000
+    assert stats["cc x.c"].rss_seconds == pytest.approx(3000)
+    assert stats["cc x.c"].lifetime == pytest.approx(1.0)
+    assert stats["make"].cpu_seconds == pytest.approx(0.4)
+    assert stats["make"].lifetime == pytest.approx(3.0)
+    assert (breakdown.processes, breakdown.commands) == (5, 4)
+    assert breakdown.peak_concurrency == 3
+    assert breakdown.concurrency == [1, 3, 2, 2]
+
+
+def test_limit_keeps_top_of_each_ranking(tmp_path):
+    """Test the table holds the leader of every ranking, not only of CPU time."""
+    breakdown = analyze_usage(_write_usage(tmp_path / "usage.json"), limit=1)
+
+    # "cc x.c" leads CPU time, peak CPU and RSS over time; "cc y.c" leads peak RSS
+    assert [s.cmd for s in breakdown.top] == ["cc x.c", "cc y.c"]
+
+
+def test_sparkline_scales_to_maximum():
+    """Test the sparkline spans the full range of block characters."""
+    assert sparkline([0, 4, 8]) == "▁▅█"
+    assert sparkline([0, 0]) == "▁▁"
+
+
+def test_entry_renders_process_table(tmp_path):
+    """Test the process table is rendered with pipes in commands escaped."""
+    usage = _write_usage(tmp_path / "usage.json")
+    entry = GalleryEntry.from_directory(tmp_path)
+    breakdown = analyze_usage(usage)
+    entry.processes = replace(breakdown, top=[replace(breakdown.top[0], cmd="sort | uniq")])
+
+    markdown = render_entry(entry, tmp_path / "README.md")
+
+    assert "**Top processes**: 5 processes, 4 commands, up to 3 at once" in markdown
+    assert "| `sort \\| uniq` | 2 | 100.0% | 1.80s |" in markdown
+
+
+def test_stored_breakdown_is_reused_until_usage_or_limit_changes(tmp_path, monkeypatch):
+    """Test cached entries reuse their stored breakdown instead of analyzing the usage again."""
+    from src import process_stats
+
+    entry = GalleryEntry.from_directory(tmp_path)
+    entry.usage_json = _write_usage(tmp_path / "usage.json")
+    first = process_stats.load_breakdown(entry, limit=2)
+    calls = []
+    analyze = process_stats.analyze_usage
+    monkeypatch.setattr(process_stats, "analyze_usage", lambda *args: calls.append(args) or analyze(*args))
+
+    assert process_stats.load_breakdown(entry, limit=2) == first
+    assert calls == []
+    process_stats.load_breakdown(entry, limit=3)
+    assert len(calls) == 1
+    with open(entry.usage_json, "a") as f:
+        f.write(json.dumps({"timestamp": "2025-10-03T12:00:09.000000-05:00", "processes": {},
+                            "totals": {"rss": 0, "vsz": 0, "pcpu": 0.0, "pmem": 0.0}}) + "\n")
+    process_stats.load_breakdown(entry, limit=3)
+    assert len(calls) == 2
@@ -0,0 +1,43 @@
+"""Unit tests for pipeline stage profiling."""
+import json
+
+from src.profiling import disable_profiling, enable_profiling, span
+
+
+def test_span_without_profiler_is_noop():
+    """Test spans record nothing when profiling is off, not even into an earlier profiler."""
+    stale = enable_profiling()
+    disable_profiling()
+    with span("plot", "entry"):
+        pass
+    fresh = enable_profiling()
+    disable_profiling()
+
+    assert stale.stage_totals() == {}
+    assert fresh.stage_totals() == {}
+
+
+def test_profile_written_as_chrome_trace(tmp_path):
+    """Test spans become complete events on one track per entry, with stage totals."""
+    profiler = enable_profiling()
+    try:
+        with span("discovery"):
+            pass
+        for _ in range(2):
+            with span("plot", "entry-a"):
+                pass
+        with span("plot", "entry-b"):
+            pass
+    finally:
+        disable_profiling()
+
+    trace_path = tmp_path / "trace.json"
+    profiler.write(trace_path)
+    trace = json.loads(trace_path.read_text())
+
+    tracks = {e["args"]["name"]: e["tid"] for e in trace["traceEvents"] if e["ph"] == "M"}
+    assert set(tracks) == {"gallery", "entry-a", "entry-b"}
+    spans = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+    assert [(e["name"], e["tid"]) for e in spans].count(("plot", tracks["entry-a"])) == 2
+    assert trace["otherData"]["stages"]["plot"]["count"] == 3
+    assert trace["otherData"]["stages"]["discovery"]["count"] == 1
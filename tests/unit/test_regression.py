@@ -0,0 +1,86 @@
+"""Unit tests for regression detection against a baseline."""
+import pytest
+
+from src.benchmark import BenchmarkResult
+from src.defaults import DEFAULT_THRESHOLDS
+from src.regression import (
+    compare,
+    detect_regressions,
+    entry_metrics,
+    load_baseline,
+    parse_metric_values,
+    save_baseline,
+)
+from src.renderers.markdown import render_markdown
+
+
+def test_compare_flags_increase_beyond_threshold():
+    """Test a large relative and absolute increase is a regression."""
+    regressions = compare({"wall_clock_time": 13.0}, {"wall_clock_time": 10.0})
+
+    assert [r.metric for r in regressions] == ["wall_clock_time"]
+    assert round(regressions[0].change, 2) == 0.30
+
+
+def test_compare_ignores_noise_and_improvements():
+    """Test small absolute changes and decreases are not regressions."""
+    # +50% but only 0.1s: under the default 0.5s noise floor
+    assert compare({"wall_clock_time": 0.3}, {"wall_clock_time": 0.2}) == []
+    # Faster and leaner is never a regression
+    assert compare({"wall_clock_time": 5.0, "peak_rss": 1}, {"wall_clock_time": 10.0, "peak_rss": 2 ** 30}) == []
+
+
+def test_compare_uses_custom_thresholds():
+    """Test thresholds and noise floors can be overridden per metric."""
+    regressions = compare({"peak_rss": 105}, {"peak_rss": 100}, thresholds={"peak_rss": 0.01},
+                          noise_floors={"peak_rss": 0})
+
+    assert [r.metric for r in regressions] == ["peak_rss"]
+
+
+def test_baseline_round_trip_and_markdown(tmp_path, summary_entry):
+    """Test a saved baseline detects a later regression and marks it in markdown."""
+    before = [summary_entry(tmp_path / "before", "job", wall_clock_time=10.0, peak_rss=100, average_pcpu=50.0)]
+    save_baseline(before, tmp_path / "baseline.json")
+
+    after = [
+        summary_entry(tmp_path, "job", wall_clock_time=20.0, peak_rss=100, average_pcpu=50.0),
+        summary_entry(tmp_path, "new-job", wall_clock_time=99.0),
+    ]
+    regressed = detect_regressions(after, load_baseline(tmp_path / "baseline.json"))
+    content = render_markdown(after, tmp_path / "README.md")
+
+    assert regressed == 1
+    assert after[1].regressions == [], "Entries missing from the baseline cannot regress"
+    assert "Performance regression" in content
+    assert "`wall_clock_time`: 10 → 20 (+100%)" in content
+
+
+def test_benchmark_entries_compare_the_median_of_their_repeats(tmp_path, summary_entry):
+    """Test --repeat runs are compared and saved by their median, not by the last (noisy) repeat."""
+    def benchmarked(parent, wall_clock_times):
+        runs = [{"execution_summary": {"wall_clock_time": t, "peak_rss": 100}} for t in wall_clock_times]
+        entry = summary_entry(parent, "job", **runs[-1]["execution_summary"])
+        entry.benchmark = BenchmarkResult({}, [], runs)
+        return entry
+
+    before = benchmarked(tmp_path / "before", [10.0, 11.0, 10.5])
+    assert entry_metrics(before) == {"wall_clock_time": 10.5, "peak_rss": 100}
+    save_baseline([before], tmp_path / "baseline.json")
+
+    after = benchmarked(tmp_path / "after", [10.2, 10.8, 30.0])
+    assert detect_regressions([after], load_baseline(tmp_path / "baseline.json")) == 0
+    slower = benchmarked(tmp_path / "slower", [20.0, 21.0, 10.0])
+    assert detect_regressions([slower], load_baseline(tmp_path / "baseline.json")) == 1
+
+
+def test_parse_metric_values_overrides_known_metrics_only():
+    """Test overrides replace defaults, and unknown metrics or bad values are rejected."""
+    assert parse_metric_values(["peak_rss=0.5"], DEFAULT_THRESHOLDS) == {**DEFAULT_THRESHOLDS, "peak_rss": 0.5}
+
+    with pytest.raises(ValueError, match="unknown metric 'peak_rs'"):
+        parse_metric_values(["peak_rs=0.5"], DEFAULT_THRESHOLDS)
+    with pytest.raises(ValueError, match="invalid value"):
+        parse_metric_values(["peak_rss=lots"], DEFAULT_THRESHOLDS)
+    with pytest.raises(ValueError, match="METRIC=VALUE"):
+        parse_metric_values(["peak_rss"], DEFAULT_THRESHOLDS)
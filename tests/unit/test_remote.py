@@ -0,0 +1,87 @@
+"""Unit tests for running entries on worker hosts."""
+import asyncio
+import shlex
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.models.gallery_entry import GalleryEntry
+from src.remote import RemoteExecutor, Worker
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+WORKER_COMMAND = f"PYTHONPATH={shlex.quote(str(REPO_ROOT))} {shlex.quote(sys.executable)} -m src.remote"
+
+
+def _entry(tmp_path, setup="exit 0"):
+    entry_dir = tmp_path / "gallery" / "remote-entry"
+    entry_dir.mkdir(parents=True)
+    (entry_dir / "setup.sh").write_text(f"#!/bin/bash\n{setup}\n")
+    (entry_dir / "command.sh").write_text(
+        "#!/bin/bash\nmkdir -p .duct && echo '{}' > .duct/runinfo.json && echo ran\n"
+    )
+    for script in ("setup.sh", "command.sh"):
+        (entry_dir / script).chmod(0o755)
+    return GalleryEntry.from_directory(entry_dir)
+
+
+def test_worker_parse():
+    """Test worker specs with and without a slot count."""
+    assert Worker.parse("local") == Worker("local", 1)
+    assert Worker.parse("user@node1*4") == Worker("user@node1", 4)
+    with pytest.raises(ValueError):
+        Worker.parse("node1*0")
+
+
+def test_run_entry_on_local_worker_fetches_outputs(tmp_path):
+    """Test the entry runs in a scratch copy and its .duct/ and logs come back."""
+    entry = _entry(tmp_path)
+    executor = RemoteExecutor([Worker("local")], str(tmp_path / "scratch"), WORKER_COMMAND)
+
+    setup, command = asyncio.run(executor.run_entry(entry, timeout=30))
+
+    assert setup.success and command.success
+    assert (entry.path / ".duct" / "runinfo.json").exists()
+    assert command.stdout_path == entry.path / "logs" / "command.stdout"
+    assert command.stdout_path.read_text() == "ran\n"
+    assert list((tmp_path / "scratch").iterdir()) == [], "Scratch directory should be removed"
+
+
+def test_run_entry_setup_failure_keeps_previous_outputs(tmp_path):
+    """Test a failed setup.sh reports no command result and leaves .duct/ alone."""
+    entry = _entry(tmp_path, setup="exit 3")
+    (entry.path / ".duct").mkdir()
+    (entry.path / ".duct" / "old.json").write_text("{}")
+    executor = RemoteExecutor([Worker("local")], str(tmp_path / "scratch"), WORKER_COMMAND)
+
+    setup, command = asyncio.run(executor.run_entry(entry, timeout=30))
+
+    assert setup.returncode == 3 and command is None
+    assert (entry.path / ".duct" / "old.json").exists()
+    assert (entry.path / "logs" / "setup.stderr").exists()
+
+
+def test_failed_fetch_keeps_previous_outputs(tmp_path):
+    """Test outputs are only replaced once the transfer back succeeded."""
+    entry = _entry(tmp_path)
+    # The run succeeds but leaves no .duct/ to fetch
+    (entry.path / "command.sh").write_text("#!/bin/bash\necho ran\n")
+    for name in (".duct", "logs"):
+        (entry.path / name).mkdir()
+        (entry.path / name / "old").write_text("previous run")
+    executor = RemoteExecutor([Worker("local")], str(tmp_path / "scratch"), WORKER_COMMAND)
+
+    assert asyncio.run(executor.run_entry(entry, timeout=30)) is None
+    assert (entry.path / ".duct" / "old").read_text() == "previous run"
+    assert (entry.path / "logs" / "old").read_text() == "previous run"
+    assert not list(entry.path.glob(".fetch-*")), "Staging directory should be removed"
+
+
+def test_invalid_timeout_never_reaches_the_worker_shell(tmp_path):
+    """Test a timeout that is not a number is rejected instead of being run by the worker's shell."""
+    entry = _entry(tmp_path)
+    marker = tmp_path / "injected"
+    executor = RemoteExecutor([Worker("local")], str(tmp_path / "scratch"), WORKER_COMMAND)
+
+    assert asyncio.run(executor.run_entry(entry, timeout=f"1; touch {marker}")) is None
+    assert not marker.exists()
@@ -0,0 +1,69 @@
+"""Unit tests for the SQLite run index."""
+import pytest
+
+from src.run_index import RunIndex
+
+
+def _info(start_time, wall_clock_time, peak_rss):
+    return {
+        "duct_version": "0.16.0",
+        "schema_version": "0.2.2",
+        "system": {"hostname": "test-host"},
+        "execution_summary": {
+            "exit_code": 0,
+            "start_time": start_time,
+            "end_time": start_time + wall_clock_time,
+            "wall_clock_time": wall_clock_time,
+            "peak_rss": peak_rss,
+        },
+    }
+
+
+@pytest.fixture
+def index(tmp_path):
+    with RunIndex(tmp_path / "index.sqlite") as run_index:
+        yield run_index
+
+
+def test_record_same_run_twice_keeps_one_row(index):
+    """Test re-recording a run (e.g. a cached entry) does not duplicate it."""
+    assert index.record("example-1", _info(100.0, 6.0, 1000)) is True
+    assert index.record("example-1", _info(100.0, 6.0, 1000)) is True
+
+    assert len(index.history("example-1")) == 1
+
+
+def test_record_without_summary_is_ignored(index):
+    """Test info.json without an execution_summary is not indexed."""
+    assert index.record("broken", {"output_paths": {}}) is False
+    assert index.latest_runs() == []
+
+
+def test_top_uses_latest_run_per_entry(index):
+    """Test top ranks entries by the metric of their most recent run."""
+    index.record("small", _info(100.0, 1.0, 10))
+    index.record("big", _info(100.0, 1.0, 5000))
+    index.record("small", _info(200.0, 1.0, 9000))
+
+    rows = index.top("peak_rss", limit=2)
+
+    assert [(row["entry"], row["value"]) for row in rows] == [("small", 9000), ("big", 5000)]
+
+
+def test_regressions_compare_latest_to_previous_run(index):
+    """Test regressions reports entries that got slower beyond the threshold."""
+    index.record("slower", _info(100.0, 10.0, 1))
+    index.record("slower", _info(200.0, 13.0, 1))
+    index.record("noisy", _info(100.0, 10.0, 1))
+    index.record("noisy", _info(200.0, 10.5, 1))
+
+    rows = index.regressions("wall_clock_time", threshold=0.1)
+
+    assert [row["entry"] for row in rows] == ["slower"]
+    assert rows[0]["change"] == pytest.approx(0.3)
+
+
+def test_unknown_metric_rejected(index):
+    """Test metric names are validated before being used in SQL."""
+    with pytest.raises(ValueError):
+        index.top("peak_rss; DROP TABLE runs")
@@ -0,0 +1,98 @@
+"""Unit tests for concurrent entry processing."""
+import asyncio
+import logging
+
+from src.models.gallery_entry import GalleryEntry
+from src.scheduler import run_entries
+
+
+def _make_entries(tmp_path, count):
+    entries = []
+    for i in range(count):
+        entry_dir = tmp_path / f"entry-{i}"
+        entry_dir.mkdir()
+        entries.append(GalleryEntry.from_directory(entry_dir))
+    return entries
+
+
+def test_run_entries_preserves_discovery_order(tmp_path):
+    """Test results come back in input order even when later entries finish first."""
+    entries = _make_entries(tmp_path, 4)
+
+    async def worker(entry):
+        # Earlier entries sleep longer so they complete last
+        await asyncio.sleep(0.05 * (4 - int(entry.name.split("-")[1])))
+        return entry.name != "entry-2"
+
+    results = run_entries(entries, worker, jobs=4)
+
+    assert results == [True, True, False, True], "Results should follow discovery order"
+
+
+def test_run_entries_keeps_entry_logs_contiguous(tmp_path, caplog):
+    """Test log lines of concurrently processed entries are not interleaved."""
+    entries = _make_entries(tmp_path, 3)
+    worker_logger = logging.getLogger("test_worker")
+
+    async def worker(entry):
+        for step in range(3):
+            worker_logger.info(f"{entry.name} step {step}")
+            await asyncio.sleep(0.01)
+        return True
+
+    with caplog.at_level(logging.INFO):
+        run_entries(entries, worker, jobs=3)
+
+    messages = [r.getMessage() for r in caplog.records if r.name == "test_worker"]
+    assert len(messages) == 9, "Every buffered record should be replayed once"
+    for i in range(0, 9, 3):
+        names = {message.split()[0] for message in messages[i:i + 3]}
+        assert len(names) == 1, f"Entry logs interleaved: {messages}"
+
+
+def test_run_entries_packs_within_capacity_longest_first(tmp_path):
+    """Test entries start longest-first and never exceed the memory capacity together."""
+    from src.footprint import Capacity, Footprint
+
+    entries = _make_entries(tmp_path, 4)
+    footprints = [
+        Footprint(cpu=100, memory=60, duration=1),
+        Footprint(cpu=100, memory=60, duration=4),
+        Footprint(cpu=100, memory=30, duration=2),
+        Footprint(cpu=100, memory=30, duration=3),
+    ]
+    started, in_use, peak = [], [0], [0]
+
+    async def worker(entry):
+        index = int(entry.name.split("-")[1])
+        started.append(index)
+        in_use[0] += footprints[index].memory
+        peak[0] = max(peak[0], in_use[0])
+        await asyncio.sleep(0.02)
+        in_use[0] -= footprints[index].memory
+        return True
+
+    results = run_entries(entries, worker, jobs=4, footprints=footprints, capacity=Capacity(400, 100))
+
+    assert results == [True] * 4
+    assert started[0] == 1, "Longest expected entry should start first"
+    assert peak[0] <= 100, "Concurrent entries should fit the memory capacity"
+
+
+def test_run_entries_runs_oversized_entry_alone(tmp_path):
+    """Test an entry larger than the capacity still runs, by itself."""
+    from src.footprint import Capacity, Footprint
+
+    entries = _make_entries(tmp_path, 2)
+    running, overlap = [0], [False]
+
+    async def worker(entry):
+        running[0] += 1
+        overlap[0] |= running[0] > 1
+        await asyncio.sleep(0.01)
+        running[0] -= 1
+        return True
+
+    footprints = [Footprint(memory=500), Footprint(memory=500)]
+    assert run_entries(entries, worker, jobs=2, footprints=footprints, capacity=Capacity(100, 100)) == [True, True]
+    assert not overlap[0]
@@ -0,0 +1,30 @@
+"""Unit tests for entry resource summaries."""
+from src.renderers.markdown import render_markdown
+from src.summary import entry_summary, format_summary_value
+
+
+def test_entry_summary_uses_parsed_run_info(tmp_path, summary_entry):
+    """Test summary metrics come from run_info and non-numeric values are dropped."""
+    entry = summary_entry(tmp_path, "a", wall_clock_time=1.5, peak_rss=2048, num_samples=None, command="x")
+
+    assert entry_summary(entry) == {"wall_clock_time": 1.5, "peak_rss": 2048}
+
+
+def test_format_summary_value_units():
+    """Test metrics are shown with their units."""
+    assert format_summary_value("wall_clock_time", 6.084) == "6.08s"
+    assert format_summary_value("peak_rss", 6189056) == "5.9MB"
+    assert format_summary_value("average_pcpu", 0.0962) == "0.1%"
+    assert format_summary_value("num_samples", 79) == "79"
+    assert format_summary_value("peak_rss", None) == "–"
+
+
+def test_render_markdown_summary_table_sorted(tmp_path, summary_entry):
+    """Test the gallery-wide table links entries and sorts by the chosen metric."""
+    entries = [summary_entry(tmp_path, "small", peak_rss=1024), summary_entry(tmp_path, "big", peak_rss=4096)]
+
+    markdown = render_markdown(entries, tmp_path / "README.md", summary_sort="peak_rss")
+
+    table = markdown.split("## Entry:")[0]
+    assert table.index("[big](#entry-big)") < table.index("[small](#entry-small)")
+    assert "| 4.0KB |" in table
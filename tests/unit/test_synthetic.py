@@ -0,0 +1,39 @@
+"""Unit tests for the synthetic gallery generator."""
+import asyncio
+import json
+
+from src.archive import load_archived_run
+from src.discovery import discover_entries
+from src.synthetic import generate_gallery
+from src.usage_reader import read_usage
+
+
+def test_generated_entries_are_valid_archived_runs(tmp_path):
+    """Test generated entries are discovered and validated as skip-execution entries."""
+    generate_gallery(tmp_path, entries=3, samples=20, processes=3)
+
+    entries = discover_entries(tmp_path)
+
+    assert [entry.name for entry in entries] == ["synthetic-0", "synthetic-1", "synthetic-2"]
+    for entry in entries:
+        assert entry.skip_execution
+        assert asyncio.run(load_archived_run(entry))
+        series = read_usage(entry.usage_json)
+        assert len(series.elapsed) == 20
+        assert len(series.pids) == 3
+        summary = entry.run_info["execution_summary"]
+        assert summary["num_samples"] == 20
+        assert summary["peak_rss"] == max(series.totals["rss"])
+
+
+def test_generation_is_reproducible(tmp_path):
+    """Test the same seed produces identical logs and another seed does not."""
+    first = generate_gallery(tmp_path / "a", entries=2, samples=10, processes=2, seed=7)
+    second = generate_gallery(tmp_path / "b", entries=2, samples=10, processes=2, seed=7)
+    other = generate_gallery(tmp_path / "c", entries=2, samples=10, processes=2, seed=8)
+
+    usage = [(d / ".duct" / "runusage.json").read_text() for d in first + second + other]
+    assert usage[:2] == usage[2:4]
+    assert usage[:2] != usage[4:]
+    info = json.loads((first[0] / ".duct" / "runinfo.json").read_text())
+    assert info["output_paths"]["usage"] == ".duct/runusage.json"
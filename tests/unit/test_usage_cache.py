@@ -0,0 +1,82 @@
+"""Unit tests for the columnar usage cache."""
+import json
+import os
+
+import pytest
+
+from src import usage_cache
+from src.usage_cache import load_usage, usage_cache_dir
+from src.usage_reader import read_usage
+
+
+def _as_lists(series):
+    return {
+        "elapsed": list(series.elapsed),
+        "totals": {metric: list(column) for metric, column in series.totals.items()},
+        "pids": {
+            pid: (s.cmd, list(s.ordinal), list(s.elapsed), {m: list(c) for m, c in s.values.items()})
+            for pid, s in series.pids.items()
+        },
+        "stride": series.stride,
+        "num_records": series.num_records,
+    }
+
+
+@pytest.mark.parametrize("stride,max_points", [(1, None), (3, None), (1, 8), (2, 5)])
+def test_cached_reads_match_read_usage(tmp_path, stride, max_points, write_usage):
+    """Test cold and cached reads keep exactly the reports read_usage keeps."""
+    usage = tmp_path / "usage.json"
+    write_usage(usage, 50)
+    expected = _as_lists(read_usage(usage, stride, max_points))
+
+    assert _as_lists(load_usage(usage, stride, max_points)) == expected
+    assert (usage_cache_dir(usage) / "meta.json").exists()
+    assert _as_lists(load_usage(usage, stride, max_points)) == expected
+
+
+def test_cache_hit_skips_parsing(tmp_path, monkeypatch, write_usage):
+    """Test a second read memory-maps the cache instead of parsing, even after a touch."""
+    usage = tmp_path / "usage.json"
+    write_usage(usage, 10)
+    load_usage(usage)
+    os.utime(usage, ns=(0, 0))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("usage file was parsed")
+
+    monkeypatch.setattr(usage_cache, "read_usage", fail)
+    monkeypatch.setattr(usage_cache, "_build_cache", fail)
+    assert list(load_usage(usage).totals["rss"]) == [1000.0 + i for i in range(10)]
+    meta = json.loads((usage_cache_dir(usage) / "meta.json").read_text())
+    assert meta["source"]["mtime_ns"] == 0
+
+
+def test_changed_usage_invalidates_cache(tmp_path, write_usage):
+    """Test rewriting the usage file replaces the cached columns."""
+    usage = tmp_path / "usage.json"
+    write_usage(usage, 10)
+    load_usage(usage)
+
+    write_usage(usage, 10, rss=5000)
+
+    assert list(load_usage(usage).totals["rss"]) == [5000.0 + i for i in range(10)]
+
+
+def test_unwritable_cache_falls_back_to_parse(tmp_path, write_usage):
+    """Test a cache that cannot be written does not fail the read."""
+    usage = tmp_path / "usage.json"
+    write_usage(usage, 4)
+    (tmp_path / usage_cache.USAGE_CACHE_DIR).write_text("not a directory")
+
+    assert len(load_usage(usage)) == 4
+    assert len(load_usage(usage)) == 4
+
+
+def test_cache_is_built_in_chunks(tmp_path, monkeypatch, write_usage):
+    """Test columns streamed through several chunks match a full parse."""
+    monkeypatch.setattr(usage_cache, "BUILD_CHUNK", 3)
+    usage = tmp_path / "usage.json"
+    write_usage(usage, 20)
+
+    assert _as_lists(load_usage(usage)) == _as_lists(read_usage(usage))
+    assert not list(usage_cache_dir(usage).glob(".build-*")), "Staging files should be removed"
@@ -0,0 +1,50 @@
+"""Unit tests for the streaming usage reader."""
+import pytest
+
+from src.usage_reader import read_usage
+
+
+def test_read_usage_columns(tmp_path, write_usage):
+    """Test totals and per-pid series are read into aligned columns."""
+    usage = tmp_path / "usage.json"
+    write_usage(usage, 6)
+
+    series = read_usage(usage)
+
+    assert list(series.elapsed) == [0.0, 1.0, 2.0, 3.0, 4.0, 5.0]
+    assert list(series.totals["rss"]) == [1000, 1001, 1002, 1003, 1004, 1005]
+    assert series.pids["100"].cmd == "main"
+    assert list(series.pids["200"].elapsed) == [1.0, 3.0, 5.0]
+    assert series.num_records == 6
+
+
+def test_read_usage_stride(tmp_path, write_usage):
+    """Test a stride keeps every n-th report, including per-pid samples."""
+    usage = tmp_path / "usage.json"
+    write_usage(usage, 7)
+
+    series = read_usage(usage, stride=3)
+
+    assert list(series.elapsed) == [0.0, 3.0, 6.0]
+    assert list(series.pids["200"].elapsed) == [3.0]
+
+
+def test_read_usage_max_points_bounds_series(tmp_path, write_usage):
+    """Test max_points keeps the number of reports bounded for long files."""
+    usage = tmp_path / "usage.json"
+    write_usage(usage, 50)
+
+    series = read_usage(usage, max_points=8)
+
+    assert len(series) <= 8
+    assert series.stride == 8
+    assert list(series.elapsed) == [0.0, 8.0, 16.0, 24.0, 32.0, 40.0, 48.0]
+    # Pid 200 only appears on odd reports, so no kept sample remains
+    assert "200" not in series.pids
+    assert list(series.pids["100"].elapsed) == list(series.elapsed)
+
+
+def test_read_usage_rejects_bad_stride(tmp_path):
+    """Test invalid strides are rejected."""
+    with pytest.raises(ValueError):
+        read_usage(tmp_path / "usage.json", stride=0)
@@ -0,0 +1,114 @@
+"""Unit tests for gallery change watching."""
+import sys
+
+import pytest
+
+from src.executor import execute_script
+from src.gallery_render import changed_entries
+from src.watch import InotifyWatcher, PollingWatcher, Watcher, is_watched
+
+
+def _gallery(tmp_path):
+    gallery = tmp_path / "gallery"
+    (gallery / "a" / ".duct").mkdir(parents=True)
+    (gallery / "a" / "command.sh").write_text("echo a\n")
+    return gallery
+
+
+def test_is_watched():
+    """Test only entry inputs count as changes, not our own outputs and caches."""
+    assert is_watched("command.sh")
+    assert is_watched("metadata.json")
+    assert is_watched(".duct/runusage.json")
+    assert is_watched("")
+    assert not is_watched("README.md")
+    assert not is_watched("plots/usage.png")
+    assert not is_watched(".duct/.usage-cache")
+
+
+def test_watcher_subclass_must_provide_changes(tmp_path):
+    """Test a watcher without an event source cannot be created."""
+    class Incomplete(Watcher):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete(tmp_path)
+
+
+def _watchers():
+    watchers = [PollingWatcher]
+    if sys.platform.startswith("linux"):
+        watchers.append(InotifyWatcher)
+    return watchers
+
+
+@pytest.fixture(params=_watchers(), ids=lambda cls: cls.__name__)
+def make_watcher(request):
+    def make(gallery):
+        if request.param is PollingWatcher:
+            return PollingWatcher(gallery, interval=0.02)
+        return request.param(gallery)
+    return make
+
+
+def test_watcher_reports_entry_changes(tmp_path, make_watcher):
+    """Test edits, new .duct files and new entries are reported per entry."""
+    gallery = _gallery(tmp_path)
+    watcher = make_watcher(gallery)
+    try:
+        (gallery / "a" / "command.sh").write_text("echo changed\n")
+        (gallery / "a" / ".duct" / "runinfo.json").write_text("{}")
+        (gallery / "a" / "notes.txt").write_text("ignored")
+        (gallery / "b").mkdir()
+
+        changes = watcher.wait(debounce=0.2)
+    finally:
+        watcher.close()
+
+    assert ("a", "command.sh") in changes
+    assert ("a", ".duct/runinfo.json") in changes
+    assert ("b", "") in changes
+    assert ("a", "notes.txt") not in changes
+
+
+def test_watcher_ignores_hidden_duct_files(tmp_path, make_watcher):
+    """Test caches written into .duct/ do not trigger rebuilds."""
+    gallery = _gallery(tmp_path)
+    watcher = make_watcher(gallery)
+    try:
+        (gallery / "a" / ".duct" / ".usage-cache").mkdir()
+        (gallery / "a" / "setup.sh").write_text("true\n")
+
+        changes = watcher.wait(debounce=0.2)
+    finally:
+        watcher.close()
+
+    assert changes == {("a", "setup.sh")}
+
+
+def test_failing_execute_entry_outputs_do_not_trigger_rebuilds(tmp_path):
+    """Test .duct/ writes of a failed execute-mode run are ignored, while skip-execution logs still count."""
+    gallery = tmp_path / "gallery"
+    failing = gallery / "failing"
+    (failing / ".duct").mkdir(parents=True)
+    (failing / "setup.sh").write_text("#!/bin/bash\nexit 0\n")
+    (failing / "command.sh").write_text("#!/bin/bash\necho '{}' > .duct/runinfo.json\nexit 1\n")
+    for script in ("setup.sh", "command.sh"):
+        (failing / script).chmod(0o755)
+    archived = gallery / "archived" / ".duct"
+    archived.mkdir(parents=True)
+    watcher = PollingWatcher(gallery, interval=0.02)
+    try:
+        assert not execute_script(failing / "command.sh", failing, tmp_path / "logs", timeout=10).success
+        (archived / "runinfo.json").write_text("{}")
+
+        changes = watcher.wait(debounce=0.2)
+    finally:
+        watcher.close()
+
+    assert ("failing", ".duct/runinfo.json") in changes
+    assert set(changed_entries(gallery, changes)) == {"archived"}
+
+    (failing / "command.sh").write_text("#!/bin/bash\nexit 0\n")
+    assert set(changed_entries(gallery, {("failing", "command.sh"), ("failing", ".duct/runinfo.json")})) == {"failing"}
+    assert changed_entries(gallery, {("gone", "")}) == {"gone": None}